@@ -22,6 +22,7 @@ from .attributes.files import (
     FilesGarbageCollector,
     set_files_root_dir,
 )
+from .attributes.indexdetails import Index
 from .attributes.models import (
     ModelAttribute,
     InlineModelAttribute,
@@ -77,6 +78,16 @@ from .models.indexation import (
     IndexedModel,
 )
 from .models.inline import InlineModel
-from .queryset import QuerySet
+from .queryset import (
+    QuerySet,
+    Prefix,
+    Range,
+    Aggregation,
+    Avg,
+    Count,
+    Max,
+    Min,
+    Sum,
+)
 from .transactions import attempt, commit
 from .version import __version__, __version_info__
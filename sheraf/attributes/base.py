@@ -198,6 +198,7 @@ class BaseAttribute(object):
         mapping=None,
         primary=False,
         noneok=False,
+        where=None,
     ):
         """
         Indexing an attribute allows very fast reading with :func:`~sheraf.queryset.QuerySet.filter` calls.
@@ -210,6 +211,7 @@ class BaseAttribute(object):
         :param values: A callable that takes the current attribute value and returns a collection of values to index. Each generated value will be indexed each time this attribute is edited. It may take time if the generated collection is large. By default, the current attribute raw value is used.
         :param primary: If true, this will be the default index for the model. `False` by default.
         :param emtpy: If true, `None` or noneok values can be indexed. `False` by default.
+        :param where: A dict of attribute names and values. If set, the index is partial: only the models having those values are indexed. The index is only used by :func:`~sheraf.queryset.QuerySet.filter` when the filters include those values.
 
         When indexes are used, **lazy** is disabled.
 
@@ -237,6 +239,19 @@ class BaseAttribute(object):
         Traceback (most recent call last):
             ...
         UniqueIndexException
+
+        Partial indexes only index the models matching a condition:
+
+        >>> class Ticket(sheraf.Model):
+        ...     table = "index_tickets"
+        ...     status = sheraf.SimpleAttribute()
+        ...     owner = sheraf.SimpleAttribute().index(where={"status": "open"})
+        ...
+        >>> with sheraf.connection():
+        ...     opened = Ticket.create(owner="George", status="open")
+        ...     closed = Ticket.create(owner="George", status="closed")
+        ...     assert [opened] == Ticket.filter(owner="George", status="open")
+        ...     assert 2 == Ticket.filter(owner="George").count()
         """
         self.indexes[key] = IndexDetails(
             self,
@@ -247,6 +262,7 @@ class BaseAttribute(object):
             mapping or self.default_index_mapping,
             primary,
             noneok,
+            where,
         )
         self.lazy = False
 
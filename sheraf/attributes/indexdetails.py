@@ -1,3 +1,8 @@
+from BTrees.OOBTree import OOBTree
+
+import sheraf
+
+
 class IndexDetails:
     """
     :param attribute: The attribute being indexed
@@ -22,6 +27,9 @@ class IndexDetails:
     :param mapping: The mapping object to be used to store the indexed values. OOBTree by
                     default.
     :param noneok: Allow to index None or noneok values. `False` by default.
+    :param where: A dict of attribute names and values. If set, only the models
+                  having those values are indexed. A value can be a
+                  :class:`~sheraf.queryset.Range`.
     """
 
     unique = False
@@ -32,9 +40,19 @@ class IndexDetails:
     mapping = None
     primary = False
     noneok = False
+    where = None
 
     def __init__(
-        self, attribute, unique, key, values_func, search_func, mapping, primary, noneok
+        self,
+        attribute,
+        unique,
+        key,
+        values_func,
+        search_func,
+        mapping,
+        primary,
+        noneok,
+        where=None,
     ):
         self.attribute = attribute
         self.unique = unique or primary
@@ -44,6 +62,7 @@ class IndexDetails:
         self.mapping = mapping
         self.primary = primary
         self.noneok = noneok
+        self.where = where
 
     def __repr__(self):
         if self.primary:
@@ -52,13 +71,193 @@ class IndexDetails:
             )
         return "<IndexDetails key={} unique={}>".format(self.key, self.unique)
 
-    def get_values(self, model=None, keys=None):
-        if model is None and keys is None:
-            return set()
+    @property
+    def orderable(self):
+        """
+        Whether the index keys are the attribute values themselves. In that
+        case, iterating over the index keys gives the models ordered by the
+        attribute values.
+        """
+        return (
+            self.values_func == self.attribute.values
+            and type(self.attribute).values
+            is sheraf.attributes.base.BaseAttribute.values
+        )
+
+    def accepts(self, model, values=None):
+        """
+        :param model: The model instance to check.
+        :param values: A dict of attributes and values about to be written on
+                       the model. They are used instead of the current model
+                       values.
+        :return: Whether the model matches the :attr:`where` condition of a
+                 partial index.
+        """
+        if not self.where:
+            return True
+
+        for name, expected in self.where.items():
+            attribute = model.attributes[name]
+            if values and attribute in values:
+                value = values[attribute]
+            elif attribute.is_created(model):
+                value = attribute.read(model)
+            else:
+                value = attribute.create(model)
+
+            if isinstance(expected, sheraf.queryset.Range):
+                if value not in expected:
+                    return False
+            elif value != expected:
+                return False
+
+        return True
+
+    def implied_by(self, filters):
+        """
+        :param filters: The filters of a :class:`~sheraf.queryset.QuerySet`.
+        :return: Whether every model matching the filters also matches the
+                 :attr:`where` condition of a partial index. In that case the
+                 index can be used to resolve the filters.
+        """
+        if not self.where:
+            return True
+
+        for name, expected in self.where.items():
+            if name not in filters:
+                return False
 
+            _, value, transformation = filters[name]
+            if transformation:
+                return False
+
+            if value == expected:
+                continue
+
+            if not isinstance(expected, sheraf.queryset.Range) or isinstance(
+                value, sheraf.queryset.Range
+            ):
+                return False
+
+            if value not in expected:
+                return False
+
+        return True
+
+    def get_values(self, model=None, keys=None):
         value = self.attribute.read(model) if model else keys
 
         if self.noneok:
             return self.values_func(value)
 
+        if value is None:
+            return set()
+
         return {v for v in self.values_func(value) if v is not None}
+
+
+class Index(IndexDetails):
+    """
+    A compound index, declared on a model, which keys are the tuples of the
+    values of several attributes. The index is updated each time one of
+    those attributes is edited.
+
+    :param \\*attribute_names: The names of the indexed attributes.
+    :param unique: If two models have the same values for all the attributes,
+                   a :class:`~sheraf.exceptions.UniqueIndexException` is raised
+                   when trying to write the second one.
+    :type unique: bool
+    :param key: The key the index will use. By default, the name of the model
+                attribute the index is assigned to is used.
+    :param mapping: The mapping object to be used to store the indexed values.
+                    OOBTree by default.
+    :param where: A dict of attribute names and values. If set, only the models
+                  having those values are indexed.
+
+    Models which one of the attribute values is `None` are not indexed.
+
+    :func:`~sheraf.queryset.QuerySet.filter` uses a compound index when the
+    filters set the first attributes of the index, or set the first
+    attributes and give a :class:`~sheraf.queryset.Range` for the next one.
+
+    >>> class Ticket(sheraf.Model):
+    ...     table = "compound_tickets"
+    ...     tenant = sheraf.SimpleAttribute()
+    ...     status = sheraf.SimpleAttribute()
+    ...     tenant_status = sheraf.Index("tenant", "status")
+    ...
+    >>> with sheraf.connection():
+    ...     ticket = Ticket.create(tenant="yaal", status="open")
+    ...     assert [ticket] == Ticket.filter(tenant="yaal", status="open")
+    ...     assert [ticket] == Ticket.filter(tenant_status=("yaal", "open"))
+    ...     ticket.status = "closed"
+    ...     Ticket.filter(tenant="yaal", status="open").count()
+    0
+    """
+
+    def __init__(
+        self, *attribute_names, unique=False, key=None, mapping=None, where=None
+    ):
+        if len(attribute_names) < 2:
+            raise ValueError("A compound index needs at least two attributes")
+
+        super().__init__(
+            None,
+            unique,
+            key,
+            self._tuple_values,
+            self._tuple_values,
+            mapping or OOBTree,
+            False,
+            False,
+            where,
+        )
+        self.attribute_names = attribute_names
+
+    def __repr__(self):
+        return "<Index key={} attributes={} unique={}>".format(
+            self.key, self.attribute_names, self.unique
+        )
+
+    @staticmethod
+    def _tuple_values(value):
+        return {tuple(value)}
+
+    @property
+    def orderable(self):
+        return False
+
+    def depends_on(self, model, attribute):
+        """
+        :return: Whether ``attribute`` is one of the indexed attributes of
+                 ``model``.
+        """
+        return any(
+            model.attributes.get(name) is attribute for name in self.attribute_names
+        )
+
+    def read(self, model, values=None):
+        """
+        :param model: The model instance to read.
+        :param values: A dict of attributes and values about to be written on
+                       the model. They are used instead of the current model
+                       values.
+        :return: The tuple of the indexed attribute values of ``model``.
+        """
+        components = []
+        for name in self.attribute_names:
+            attribute = model.attributes[name]
+            if values and attribute in values:
+                components.append(values[attribute])
+            elif attribute.is_created(model):
+                components.append(attribute.read(model))
+            else:
+                components.append(attribute.create(model))
+        return tuple(components)
+
+    def get_values(self, model=None, keys=None):
+        value = self.read(model) if model else keys
+        if value is None:
+            return set()
+
+        return {key for key in self.values_func(value) if None not in key}
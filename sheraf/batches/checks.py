@@ -52,7 +52,8 @@ def check_attributes_index(model_instance):
     """
     For a given model instance compute all the values for all
     the indexes, then checks the index table if the values
-    match the model instance.
+    match the model instance. The partial indexes which condition
+    the model instance does not match are not checked.
     """
     root = sheraf.Database.current_connection().root()
     result = {}
@@ -62,7 +63,7 @@ def check_attributes_index(model_instance):
         return result
 
     for index_name, index in model_instance.indexes().items():
-        if index.details.primary:
+        if index.details.primary or not index.details.accepts(model_instance):
             continue
 
         values = index.details.get_values(model_instance)
@@ -104,6 +105,10 @@ def check_model_index(model):
         return result
 
     for attribute_index_key, attribute_index_table in index_table.items():
+        # The table can also hold other data, like an id sequence.
+        if attribute_index_key not in model.indexes():
+            continue
+
         index = model.indexes()[attribute_index_key]
 
         if index.details.primary:
@@ -1,6 +1,13 @@
 import uuid
 import random
 import sys
+import weakref
+
+import transaction
+import ZODB.POSException
+import ZODB.utils
+
+import sheraf.types
 
 from .attributes import (
     DatedNamedAttributesModel,
@@ -9,6 +16,11 @@ from .attributes import (
 )
 from .indexation import SimpleIndexedModel, IndexedModel
 from sheraf.attributes.simples import IntegerAttribute, StringUUIDAttribute
+from sheraf.transactions import ATTEMPTS
+
+# The ids reserved by IntOrderedNamedAttributesModel and not handed out yet,
+# by ZODB connection and by sequence OID.
+_id_blocks = weakref.WeakKeyDictionary()
 
 
 class UUIDIndexedModel:
@@ -54,9 +66,106 @@ class IntIndexedNamedAttributesModel(
 class IntOrderedNamedAttributesModel(
     NamedAttributesModel, IntIndexedModel, IndexedModel
 ):
-    """The ids are 64bits integers, distributed ascendently starting at 0."""
+    """The ids are 64bits integers, distributed ascendently starting at 0.
+
+    The ids are taken from a :class:`~sheraf.types.sequence.Sequence` stored
+    in the model table, so the ids of deleted models are not handed out
+    again.
+
+    By default, models created in concurrent transactions edit the
+    sequence, so only the first transaction can commit, and the other ones
+    raise a :class:`~ZODB.POSException.ConflictError`. An id is thus never
+    committed twice, but concurrent creations still conflict, and must be
+    retried, for instance with :func:`~sheraf.transactions.attempt`.
+
+    Setting :attr:`id_block_size` is the supported way to avoid those
+    conflicts. Each connection then reserves blocks of ``id_block_size`` ids
+    in a short separate transaction, and hands them out without editing the
+    sequence, so concurrent creations do not conflict. The ids still
+    increase within a connection, but reserved ids that are not used are
+    lost, so ids are not contiguous anymore.
+
+    >>> class Horse(sheraf.IntOrderedNamedAttributesModel):
+    ...     table = "ordered_horses"
+    ...     id_block_size = 100
+    ...
+    >>> with sheraf.connection(commit=True):
+    ...     [Horse.create().id, Horse.create().id]
+    [0, 1]
+    >>> with sheraf.connection(commit=True):
+    ...     Horse.create().id
+    2
+    """
 
-    id = IntegerAttribute(default=lambda m: m.count()).index(primary=True)
+    SEQUENCE_KEY = "__sequence__"
+    id_block_size = None
+
+    id = IntegerAttribute(default=lambda m: m._next_id()).index(primary=True)
+
+    @classmethod
+    def sequence(cls):
+        """
+        :return: The :class:`~sheraf.types.sequence.Sequence` distributing
+                 the ids. If the model table has no sequence yet, it is
+                 created, starting after the greatest id of the table.
+        """
+        root = cls.index_manager().root()
+        try:
+            return root[cls.SEQUENCE_KEY]
+        except KeyError:
+            pass
+
+        tables = cls.indexes()[cls.primary_key()].tables()
+        start = max((table.maxKey() + 1 for table in tables if table), default=0)
+        return root.setdefault(cls.SEQUENCE_KEY, sheraf.types.Sequence(start))
+
+    @classmethod
+    def next_id(cls):
+        """
+        :return: A new id, greater than all the ids previously handed out by
+                 the current connection.
+        """
+        sequence = cls.sequence()
+        sequence._p_activate()
+
+        # Blocks can only be reserved once the sequence has been committed.
+        if not cls.id_block_size or sequence._p_serial == ZODB.utils.z64:
+            return sequence.next()
+
+        blocks = _id_blocks.setdefault(sequence._p_jar, {})
+        start, stop = blocks.get(sequence._p_oid, (0, 0))
+        if start >= stop:
+            start = cls._reserve_ids(sequence)
+            stop = start + cls.id_block_size
+
+        blocks[sequence._p_oid] = (start + 1, stop)
+        return start
+
+    @classmethod
+    def _reserve_ids(cls, sequence):
+        transaction_manager = transaction.TransactionManager()
+        connection = sequence._p_jar.db().open(transaction_manager=transaction_manager)
+        try:
+            for nb_attempt in range(ATTEMPTS):
+                transaction_manager.begin()
+                try:
+                    start = connection.get(sequence._p_oid).reserve(cls.id_block_size)
+                    transaction_manager.commit()
+                    return start
+                except ZODB.POSException.ConflictError:
+                    transaction_manager.abort()
+                    if nb_attempt == ATTEMPTS - 1:
+                        raise
+        finally:
+            connection.close()
+
+    def _next_id(self):
+        # The sequence lives in the model table, so whether this instance is
+        # the first one must be known before the table is created.
+        if self._is_first_instance is None:
+            self._is_first_instance = not self.index_manager().initialized()
+
+        return self.next_id()
 
 
 class UUIDIndexedNamedAttributesModel(
@@ -1,6 +1,8 @@
 import datetime
 import time
 
+import ZODB.utils
+
 import sheraf.attributes.base
 import sheraf.attributes.simples
 from sheraf.models.base import BaseModel
@@ -45,7 +47,10 @@ class DatedNamedAttributesModel(NamedAttributesModel):
         """
         # TODO: The creation datetime should have the transaction commit datetime and not the object creation one
 
-        if not self.mapping._p_oid:
+        # Indexed mappings get an OID before the commit, so only the serial
+        # tells whether the mapping has been committed. The returned date is
+        # still the one stored at the creation.
+        if self.mapping._p_serial == ZODB.utils.z64:
             return None
 
         return self._deserialize_date(self._creation)
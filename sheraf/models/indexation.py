@@ -1,6 +1,11 @@
 import itertools
+import multiprocessing
 import warnings
 
+import ZODB.DemoStorage
+import ZODB.FileStorage
+import ZODB.MappingStorage
+
 import sheraf.exceptions
 from sheraf.models.base import BaseModel, BaseModelMetaclass
 from sheraf.models.indexmanager import SimpleIndexManager, MultipleDatabaseIndexManager
@@ -16,6 +21,7 @@ class BaseIndexedModel(BaseModel, metaclass=BaseModelMetaclass):
     _indexes = None
     _primary_key = None
     _is_first_instance = None
+    _deferred_indexes = None
 
     def __init__(self, *args, **kwargs):
         self._identifier = None
@@ -30,6 +36,12 @@ class BaseIndexedModel(BaseModel, metaclass=BaseModelMetaclass):
                     index.key = index_key or attribute.key(cls)
                     cls._indexes[index.key] = cls.index_manager(index)
 
+            for klass in reversed(cls.__mro__):
+                for name, index in vars(klass).items():
+                    if isinstance(index, sheraf.attributes.indexdetails.Index):
+                        index.key = index.key or name
+                        cls._indexes[index.key] = cls.index_manager(index)
+
         return cls._indexes
 
     @classmethod
@@ -72,6 +84,253 @@ class BaseIndexedModel(BaseModel, metaclass=BaseModelMetaclass):
 
         return super().create(*args, **kwargs)
 
+    @classmethod
+    def bulk_create(cls, values, batch_size=1000, commit=False, savepoint=False):
+        """
+        Create several model instances at once.
+
+        Each item of ``values`` is a dict of keyword arguments, as would be
+        passed to :func:`~sheraf.models.indexation.BaseIndexedModel.create`.
+        The primary index is updated as each instance is created, but the
+        other index entries are collected and written by batches: the
+        instances sharing an index key are stored together, and the unique
+        constraints are checked once for the whole batch, before any of its
+        entries is written. If a check fails, the primary entries of the
+        batch are removed, so its instances are not left half indexed.
+        Batches that were already committed are kept.
+
+        The instances are initialized directly, so an overridden
+        :func:`~sheraf.models.indexation.BaseIndexedModel.create` method is
+        not called.
+
+        :param values: An iterable of dicts describing the instances to create.
+        :param batch_size: The number of instances indexed together.
+        :param commit: If `True`, the transaction is committed after each batch.
+        :param savepoint: If `True`, a savepoint is made after each batch, so
+                          the modified objects can be released from memory
+                          before the transaction is committed.
+        :return: The list of the created instances. If ``commit`` or
+                 ``savepoint`` is set, the instances are not kept and only
+                 their number is returned, so memory does not grow with
+                 the number of created instances.
+
+        >>> class Cowboy(sheraf.Model):
+        ...     table = "bulk_cowboys"
+        ...     name = sheraf.SimpleAttribute().index(unique=True)
+        ...     age = sheraf.SimpleAttribute().index()
+        ...
+        >>> with sheraf.connection():
+        ...     peter, steven = Cowboy.bulk_create(
+        ...         [{"name": "Peter", "age": 30}, {"name": "Steven", "age": 30}]
+        ...     )
+        ...     assert peter == Cowboy.read(name="Peter")
+        ...     assert [peter, steven] == Cowboy.filter(age=30)
+        """
+        if not cls.primary_key():
+            raise sheraf.exceptions.PrimaryKeyException(
+                "{} inherit from IndexedModel but has no primary key. Cannot create.".format(
+                    cls.__name__
+                )
+            )
+
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+
+        transaction_manager = sheraf.Database.current_connection().transaction_manager
+        is_first_instance = not cls.index_manager().initialized()
+        keep_instances = not commit and not savepoint
+        instances = []
+        count = 0
+        batch = []
+
+        for kwargs in values:
+            instance = cls._decorate(cls.default_mapping())
+            instance._deferred_indexes = []
+            batch.append(instance)
+            try:
+                instance.initialize(**kwargs)
+            except Exception:
+                cls._bulk_discard(batch)
+                raise
+
+            if len(batch) >= batch_size:
+                cls._bulk_index(batch, is_first_instance)
+                count += len(batch)
+                if keep_instances:
+                    instances.extend(batch)
+                batch = []
+
+                if commit:
+                    transaction_manager.commit()
+                elif savepoint:
+                    transaction_manager.savepoint(optimistic=True)
+
+        if batch:
+            cls._bulk_index(batch, is_first_instance)
+            count += len(batch)
+            if keep_instances:
+                instances.extend(batch)
+
+        return instances if keep_instances else count
+
+    @classmethod
+    def _bulk_index(cls, instances, is_first_instance):
+        entries = {}
+        compound_indexes = cls._compound_indexes()
+        for instance in instances:
+            for index, value in instance._deferred_indexes:
+                items = entries.setdefault(index.key, [])
+                if index.accepts(instance):
+                    items.append((instance, index.get_values(keys=value)))
+            instance._deferred_indexes = None
+
+            for index in compound_indexes:
+                items = entries.setdefault(index.key, [])
+                keys = instance._index_keys(index)
+                if keys:
+                    items.append((instance, keys))
+
+        index_managers = {}
+        for index_key in entries:
+            index_manager = cls.indexes()[index_key]
+            if not is_first_instance and not index_manager.table_initialized():
+                cls._warn_not_indexable(index_key, stacklevel=4)
+                continue
+
+            index_managers[index_key] = index_manager
+
+        try:
+            for index_key, index_manager in index_managers.items():
+                index_manager.check_items(entries[index_key])
+        except sheraf.exceptions.UniqueIndexException:
+            cls._bulk_discard(instances)
+            raise
+
+        for index_key, index_manager in index_managers.items():
+            index_manager.add_items(entries[index_key])
+
+    @classmethod
+    def _bulk_discard(cls, instances):
+        """
+        Removes the primary index entries of instances that could not be
+        fully indexed. Entries pointing to other mappings are kept.
+        """
+        primary_index = cls.indexes()[cls.primary_key()]
+        for instance in instances:
+            if not primary_index.details.attribute.is_created(instance):
+                continue
+
+            for key in primary_index.details.get_values(instance):
+                if (
+                    primary_index.has_item(key)
+                    and primary_index.get_item(key) is instance.mapping
+                ):
+                    primary_index.delete_item(instance, [key])
+
+    @classmethod
+    def bulk_update(cls, models, values, batch_size=1000, progress=None):
+        """
+        Set the same attribute values on several model instances at once.
+        The index entries are updated by batches: the old and new keys of
+        every instance in a batch are computed first, then the entries are
+        removed and added in one grouped pass per index.
+
+        :param models: An iterable of instances of this model.
+        :param values: A dict of the attribute values to set.
+        :param batch_size: The number of instances updated together.
+        :param progress: An optional callable, called after each batch with
+                         the number of instances updated so far.
+        :return: The number of updated instances.
+
+        >>> class Cowboy(sheraf.Model):
+        ...     table = "bulk_updated_cowboys"
+        ...     status = sheraf.SimpleAttribute().index()
+        ...
+        >>> with sheraf.connection():
+        ...     peter = Cowboy.create(status="alive")
+        ...     steven = Cowboy.create(status="alive")
+        ...     Cowboy.bulk_update([peter, steven], {"status": "dead"})
+        ...     assert [peter, steven] == Cowboy.filter(status="dead")
+        2
+        """
+        for name in values:
+            if name not in cls.attributes:
+                raise TypeError(
+                    "TypeError: update() got an unexpected keyword argument '{}'".format(
+                        name
+                    )
+                )
+
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+
+        count = 0
+        models = iter(models)
+        while True:
+            batch = list(itertools.islice(models, batch_size))
+            if not batch:
+                break
+
+            cls._bulk_reindex(batch, values)
+            for model in batch:
+                for name, value in values.items():
+                    BaseModel.__setattr__(model, name, value)
+
+            count += len(batch)
+            if progress:
+                progress(count)
+
+        return count
+
+    @classmethod
+    def _bulk_reindex(cls, models, values):
+        values = {cls.attributes[name]: value for name, value in values.items()}
+        indexes = {}
+        for attribute in values:
+            for index in attribute.indexes.values():
+                indexes[index.key] = index
+            for index in cls._dependent_indexes(attribute):
+                indexes[index.key] = index
+
+        entries = []
+        for index in indexes.values():
+            index_manager = cls.indexes()[index.key]
+            if not index_manager.table_initialized():
+                cls._warn_not_indexable(index.key, stacklevel=5)
+                continue
+
+            deletions = []
+            additions = []
+            for model in models:
+                old_keys = model._index_keys(index)
+                new_keys = model._index_keys(index, values)
+                if old_keys - new_keys:
+                    deletions.append((model, old_keys - new_keys))
+                if new_keys - old_keys:
+                    additions.append((model, new_keys - old_keys))
+
+            entries.append((index_manager, deletions, additions))
+
+        # The unique indexes are checked before anything is written, so a
+        # rejected update leaves every index untouched.
+        for index_manager, _, additions in entries:
+            index_manager.check_items(additions)
+
+        for index_manager, deletions, additions in entries:
+            index_manager.delete_items(deletions)
+            index_manager.add_items(additions)
+
+    @classmethod
+    def _warn_not_indexable(cls, index_key, stacklevel):
+        warnings.warn(
+            "New index in an already populated table. %(model)s.%(index)s will not be indexed. "
+            'Consider calling %(model)s.index_table_rebuild(["%(index)s"]) or '
+            '%(model)s.index_table_backfill(["%(index)s"]) to initialize the indexation table.'
+            % {"model": cls.__name__, "index": index_key},
+            sheraf.exceptions.IndexationWarning,
+            stacklevel=stacklevel,
+        )
+
     @classmethod
     def _check_args(cls, *args, **kwargs):
         if len(args) + len(kwargs) != 1:
@@ -237,36 +496,377 @@ class BaseIndexedModel(BaseModel, metaclass=BaseModelMetaclass):
             )
 
     @classmethod
-    def index_table_rebuild(cls, index_names=None):
+    def index_table_rebuild(cls, index_names=None, batch_size=None, processes=None):
         """
         Resets a model indexation tables.
 
         This method should be called if an attribute became indexed in an already
         populated database.
 
+        The new index tables are built next to the current ones, that are only
+        replaced at the end. Thus the indexes can still be read during the
+        rebuild. The new tables are marked as being built, and this is
+        committed before the models are read, so the models created, edited
+        or deleted meanwhile by other transactions have their index entries
+        written in both tables. Transactions that were already running when
+        the rebuild started do not see this mark, and the models they write
+        can be missing from the new tables. The indexes which table did not exist are
+        marked as being built too, so they are not used by
+        :class:`~sheraf.queryset.QuerySet` until the rebuild is over.
+
         :param index_names: A list of index names to reset. If `None`, all the
                             indexes will be reseted. The primary index cannot be
                             resetted.
+        :param batch_size: If set, the primary index is walked by ranges of
+                           ``batch_size`` keys, and the transaction is
+                           committed after each range, so the whole table is
+                           never loaded in a single transaction.
+        :param processes: If set, the ranges of ``batch_size`` keys are
+                          dispatched to this number of forked processes, each
+                          with its own connection. The current database must
+                          have been opened with an uri, and its storage must
+                          allow to be opened by several processes at once,
+                          like ZEO or RelStorage. File storages are locked by
+                          the first process, and memory storages are not
+                          shared, so they raise a :class:`ValueError`.
+
+        >>> class Horse(sheraf.IntOrderedNamedAttributesModel):
+        ...     table = "rebuilt_horses"
+        ...     size = sheraf.SimpleAttribute().index()
+        ...
+        >>> with sheraf.connection(commit=True):
+        ...     horses = [Horse.create(size=i % 3) for i in range(5)]
+        ...
+        >>> with sheraf.connection():
+        ...     Horse.index_table_rebuild(["size"], batch_size=2)
+        ...     [horse.id for horse in Horse.filter(size=1)]
+        [1, 4]
         """
-        if not index_names:
-            indexes = cls.indexes().values()
+        if processes and not batch_size:
+            raise ValueError("index_table_rebuild needs a batch_size to use processes")
+
+        indexes = [
+            index
+            for index_name, index in cls.indexes().items()
+            if not index.details.primary
+            and (not index_names or index_name in index_names)
+        ]
+        shadows = [index.shadow() for index in indexes]
+
+        database = sheraf.Database.get(sheraf.Database.current_name())
+        if processes and not database.uri:
+            raise ValueError(
+                "index_table_rebuild needs a database opened with an uri to use processes"
+            )
+
+        if processes and isinstance(database.storage, _PROCESS_LOCAL_STORAGES):
+            raise ValueError(
+                "index_table_rebuild cannot use processes with a {}, that cannot be "
+                "opened by several processes at once".format(
+                    type(database.storage).__name__
+                )
+            )
+
+        # The tables left by an interrupted rebuild are dropped. The new
+        # tables are created beforehand so concurrent ranges do not conflict
+        # on their creation.
+        for index, shadow in zip(indexes, shadows):
+            if not index.table_initialized():
+                index.build()
+            shadow.delete()
+            shadow.build()
+
+        ranges = cls._primary_key_ranges(batch_size)
+        transaction_manager = sheraf.Database.current_connection().transaction_manager
+
+        if batch_size:
+            transaction_manager.commit()
+
+        if processes:
+            context = multiprocessing.get_context("fork")
+            pool = context.Pool(
+                processes,
+                initializer=_index_table_rebuild_init,
+                initargs=(database.uri, database.name, cls, indexes, shadows),
+            )
+            try:
+                pool.map(_index_table_rebuild_range, list(ranges))
+            finally:
+                pool.close()
+                pool.join()
+
+            transaction_manager.begin()
+
+        elif batch_size:
+            for bounds in ranges:
+                sheraf.attempt(
+                    cls._index_table_rebuild_range, args=(indexes, shadows) + bounds
+                )
+
         else:
-            indexes = [
-                index
-                for index_name, index in cls.indexes().items()
-                if index_name in index_names
-            ]
+            cls._index_table_rebuild_range(indexes, shadows, batched=False)
 
+        def swap():
+            for index, shadow in zip(indexes, shadows):
+                index.replace(shadow)
+                shadow.built()
+                index.built()
+
+        if batch_size:
+            sheraf.attempt(swap)
+        else:
+            swap()
+
+    @classmethod
+    def _primary_key_ranges(cls, batch_size=None):
+        # Contiguous ranges of primary keys, the lower bound being excluded.
+        # The bounds are computed lazily, so keys created by the previous
+        # ranges commits are taken into account.
+        if not batch_size:
+            yield None, None
+            return
+
+        primary = cls.indexes()[cls.primary_key()]
+        min = None
+        while True:
+            keys = list(
+                itertools.islice(
+                    primary.iterkeys(min=min, excludemin=min is not None), batch_size
+                )
+            )
+            if not keys:
+                return
+
+            if len(keys) < batch_size:
+                yield min, None
+                return
+
+            yield min, keys[-1]
+            min = keys[-1]
+
+    @classmethod
+    def _index_table_rebuild_range(
+        cls, indexes, shadows, min=None, max=None, batched=True
+    ):
+        primary = cls.indexes()[cls.primary_key()]
+        models = (
+            cls._decorate(mapping)
+            for posting in primary.get_range_postings(min, max, min is not None)
+            for mapping in posting
+        )
+
+        if not batched:
+            # The whole table is read in a single transaction, so the models
+            # are not kept in memory.
+            for model in models:
+                for index, shadow in zip(indexes, shadows):
+                    values = cls._index_table_rebuild_values(index, shadow, model)
+                    if values:
+                        shadow.add_item(model, values)
+            return
+
+        # If a model is edited meanwhile, the range conflicts instead of
+        # indexing outdated values.
+        models = list(models)
+        for model in models:
+            if model.mapping._p_jar is not None:
+                model.mapping._p_jar.readCurrent(model.mapping)
+
+        for index, shadow in zip(indexes, shadows):
+            items = []
+            for model in models:
+                values = cls._index_table_rebuild_values(index, shadow, model)
+                if values:
+                    items.append((model, values))
+
+            shadow.add_items(items)
+
+    @staticmethod
+    def _index_table_rebuild_values(index, shadow, model):
+        """
+        :return: The keys of a model missing from a table being rebuilt. The
+            models edited since the rebuild started are indexed yet.
+        """
+        if not index.details.accepts(model):
+            return set()
+
+        return {
+            value
+            for value in index.details.get_values(model)
+            if not shadow.details.unique
+            or not shadow.has_item(value)
+            or shadow.get_item(value) is not model.mapping
+        }
+
+    @classmethod
+    def index_table_backfill(cls, index_names=None, batch_size=1000):
+        """
+        Fills index tables with the existing models, without preventing the
+        models to be edited meanwhile. This should be called, for instance in
+        a background job, when an attribute became indexed in an already
+        populated database.
+
+        The indexes are first marked as being built, and this is committed.
+        From then on, the models created or edited are indexed, but
+        :class:`~sheraf.queryset.QuerySet` does not use the indexes. Then the
+        existing models are indexed by batches of ``batch_size`` following
+        the primary index, and a transaction is committed after each batch.
+        The position in the primary index is stored with each batch, so an
+        interrupted backfill restarts where it stopped when it is called
+        again. At last the indexes are marked as complete.
+
+        As it commits, this method should be called out of any pending
+        transaction.
+
+        :param index_names: A list of index names to fill. If `None`, the
+                            indexes being built and the indexes which table
+                            is not initialized are filled.
+        :return: The number of models read.
+
+        >>> class Horse(sheraf.IntOrderedNamedAttributesModel):
+        ...     table = "backfilled_horses"
+        ...     size = sheraf.SimpleAttribute()
+        ...
+        >>> with sheraf.connection(commit=True):
+        ...     horses = [Horse.create(size=i % 3) for i in range(5)]
+        ...
+        >>> class Horse(sheraf.IntOrderedNamedAttributesModel):
+        ...     table = "backfilled_horses"
+        ...     size = sheraf.SimpleAttribute().index()
+        ...
+        >>> with sheraf.connection():
+        ...     Horse.index_table_backfill(batch_size=2)
+        ...     [horse.id for horse in Horse.filter(size=1)]
+        5
+        [1, 4]
+        """
+        indexes = [
+            index
+            for index_name, index in cls.indexes().items()
+            if not index.details.primary
+            and (
+                index_name in index_names
+                if index_names
+                else index.building() or not index.table_initialized()
+            )
+        ]
+
+        def start():
+            for index in indexes:
+                if not index.building():
+                    index.build()
+
+        sheraf.attempt(start)
+
+        # The indexes at the same position are filled together, so the
+        # models are read once.
+        groups = {}
         for index in indexes:
-            if index.details.primary:
-                continue
+            groups.setdefault(index.build_cursor(), []).append(index)
+
+        count = 0
+        for group in groups.values():
+            done = False
+            while not done:
+                read, done = sheraf.attempt(
+                    cls._index_table_backfill_batch, args=(group, batch_size)
+                )
+                count += read
 
-            index.delete()
+        return count
 
-        for m in cls.all():
+    @classmethod
+    def _index_table_backfill_batch(cls, indexes, batch_size):
+        primary = cls.indexes()[cls.primary_key()]
+        cursor = indexes[0].build_cursor()
+        keys = list(
+            itertools.islice(
+                primary.iterkeys(min=cursor, excludemin=cursor is not None), batch_size
+            )
+        )
+        if not keys:
             for index in indexes:
-                if not index.details.primary:
-                    index.add_item(m)
+                index.built()
+            return 0, True
+
+        models = [
+            cls._decorate(mapping)
+            for posting in primary.get_range_postings(
+                cursor, keys[-1], cursor is not None
+            )
+            for mapping in posting
+        ]
+
+        # If a model is edited meanwhile, the batch conflicts instead of
+        # indexing outdated values.
+        for model in models:
+            if model.mapping._p_jar is not None:
+                model.mapping._p_jar.readCurrent(model.mapping)
+
+        for index in indexes:
+            items = []
+            for model in models:
+                if not index.details.accepts(model):
+                    continue
+
+                # The models edited since the build started are indexed yet.
+                values = {
+                    value
+                    for value in index.details.get_values(model)
+                    if not index.details.unique
+                    or not index.has_item(value)
+                    or index.get_item(value) is not model.mapping
+                }
+                if values:
+                    items.append((model, values))
+
+            if items:
+                index.add_items(items)
+
+            if len(keys) < batch_size:
+                index.built()
+            else:
+                index.build(keys[-1])
+
+        return len(models), len(keys) < batch_size
+
+    @classmethod
+    def index_table_migrate(cls, index_names=None):
+        """
+        Converts the multiple index entries stored with an older type, like
+        the :class:`~sheraf.types.largelist.LargeList` used by previous
+        versions, to the current one. Unlike
+        :func:`~sheraf.models.indexation.BaseIndexedModel.index_table_rebuild`
+        the models are not read, only the index tables are.
+
+        :param index_names: A list of index names to migrate. If `None`, all
+                            the indexes will be migrated.
+        :return: The number of converted index entries.
+        """
+        return sum(
+            index.migrate()
+            for index_name, index in cls.indexes().items()
+            if not index_names or index_name in index_names
+        )
+
+    @classmethod
+    def index_table_length_rebuild(cls, index_names=None):
+        """
+        Sets the lengths of the index tables from their sizes. The lengths
+        are maintained on every index edition, and make
+        :func:`~sheraf.models.indexation.BaseIndexedModel.count` independent
+        from the table size. Tables written by previous versions have no
+        length until they are edited, or until this method is called.
+
+        :param index_names: A list of index names to rebuild. If `None`, all
+                            the indexes will be rebuilt.
+        :return: A dict of the number of keys of each rebuilt index table.
+        """
+        return {
+            index_name: index.length_rebuild()
+            for index_name, index in cls.indexes().items()
+            if not index_names or index_name in index_names
+        }
 
     @classmethod
     def filter(cls, predicate=None, **kwargs):
@@ -386,27 +986,109 @@ class BaseIndexedModel(BaseModel, metaclass=BaseModelMetaclass):
 
     def update_attribute_indexes(self, attribute, value):
         for index in attribute.indexes.values():
+            if self._deferred_indexes is not None and not index.primary:
+                self._deferred_indexes.append((index, value))
+                continue
+
             if not self._is_indexable(index):
-                warnings.warn(
-                    "New index in an already populated table. %s.%s will not be indexed. "
-                    'Consider calling %s.index_table_rebuild(["%s"]) to initialize the indexation table.'
-                    % (
-                        self.__class__.__name__,
-                        index.key,
-                        self.__class__.__name__,
-                        index.key,
-                    ),
-                    sheraf.exceptions.IndexationWarning,
-                    stacklevel=5,
-                )
+                self._warn_not_indexable(index.key, stacklevel=6)
                 continue
 
             index_manager = self.indexes()[index.key]
-            if attribute.is_created(self):
+            if index.where:
+                self._update_index(index, {attribute: value})
+            elif attribute.is_created(self):
                 index_manager.update_item(self, attribute.read(self), value)
             else:
                 index_manager.add_item(self, index.get_values(keys=value))
 
+        for index in self._dependent_indexes(attribute):
+            if self._deferred_indexes is not None or index.attribute is attribute:
+                continue
+
+            if not self._is_indexable(index):
+                self._warn_not_indexable(index.key, stacklevel=6)
+                continue
+
+            self._update_index(index, {attribute: value})
+
+    @classmethod
+    def _dependent_indexes(cls, attribute):
+        """
+        :return: The partial indexes which condition depends on the attribute,
+                 and the compound indexes including the attribute.
+        """
+        # This is called at each edition, so it is computed once per class.
+        if "_dependent_indexes_by_attribute" not in cls.__dict__:
+            cls._dependent_indexes_by_attribute = {}
+
+        try:
+            return cls._dependent_indexes_by_attribute[attribute]
+        except KeyError:
+            pass
+
+        return cls._dependent_indexes_by_attribute.setdefault(
+            attribute,
+            [
+                index.details
+                for index in cls.indexes().values()
+                if (
+                    index.details.where
+                    and any(
+                        cls.attributes.get(name) is attribute
+                        for name in index.details.where
+                    )
+                )
+                or (
+                    isinstance(index.details, sheraf.attributes.indexdetails.Index)
+                    and index.details.depends_on(cls, attribute)
+                )
+            ],
+        )
+
+    @classmethod
+    def _compound_indexes(cls):
+        return [
+            index.details
+            for index in cls.indexes().values()
+            if isinstance(index.details, sheraf.attributes.indexdetails.Index)
+        ]
+
+    def _index_keys(self, index, values=None):
+        """
+        :param index: The index details.
+        :param values: A dict of attributes and values about to be written.
+        :return: The keys under which the model is indexed in ``index``, or
+                 would be once ``values`` are written.
+        """
+        if not index.accepts(self, values):
+            return set()
+
+        if isinstance(index, sheraf.attributes.indexdetails.Index):
+            return index.get_values(keys=index.read(self, values))
+
+        if values and index.attribute in values:
+            return index.get_values(keys=values[index.attribute])
+
+        if not index.attribute.is_created(self):
+            return set()
+
+        return index.get_values(self)
+
+    def _update_index(self, index, values):
+        old_keys = self._index_keys(index)
+        new_keys = self._index_keys(index, values)
+        index_manager = self.indexes()[index.key]
+        # The table is initialized even if the first model does not match
+        # the condition of a partial index.
+        index_manager.table()
+
+        if old_keys - new_keys:
+            index_manager.delete_item(self, old_keys - new_keys)
+
+        if new_keys - old_keys:
+            index_manager.add_item(self, new_keys - old_keys)
+
     def copy(self, **kwargs):
         r"""
         Copies a model.
@@ -423,7 +1105,7 @@ class BaseIndexedModel(BaseModel, metaclass=BaseModelMetaclass):
         unique_attributes = (
             index.details.attribute
             for index in self.indexes().values()
-            if index.details.unique
+            if index.details.unique and index.details.attribute
         )
 
         for attribute in unique_attributes:
@@ -447,11 +1129,48 @@ class BaseIndexedModel(BaseModel, metaclass=BaseModelMetaclass):
         sheraf.exceptions.ModelObjectNotFoundException: Id '...' not found in MyModel
         """
         for index in self.indexes().values():
-            index.delete_item(self)
+            if index.details.accepts(self):
+                index.delete_item(self)
 
         for attr in self.attributes.values():
             attr.delete(self)
 
+    @classmethod
+    def bulk_delete(cls, models):
+        """
+        Delete several model instances at once. Unlike calling
+        :func:`~sheraf.models.indexation.BaseIndexedModel.delete` on each
+        instance, the index entries are grouped by key, so each index entry
+        is rewritten only once.
+
+        :param models: An iterable of instances of this model.
+        :return: The number of deleted instances.
+
+        >>> class Cowboy(sheraf.Model):
+        ...     table = "bulk_deleted_cowboys"
+        ...     age = sheraf.SimpleAttribute().index()
+        ...
+        >>> with sheraf.connection():
+        ...     peter = Cowboy.create(age=30)
+        ...     steven = Cowboy.create(age=30)
+        ...     george = Cowboy.create(age=50)
+        ...     Cowboy.bulk_delete([peter, steven])
+        ...     assert [george] == Cowboy.all()
+        2
+        """
+        models = list({id(model.mapping): model for model in models}.values())
+
+        for index in cls.indexes().values():
+            index.delete_items(
+                (model, None) for model in models if index.details.accepts(model)
+            )
+
+        for model in models:
+            for attr in cls.attributes.values():
+                attr.delete(model)
+
+        return len(models)
+
     @classmethod
     def count(cls):
         return cls.indexes()[cls.primary_key()].count()
@@ -542,3 +1261,40 @@ class SimpleIndexedModel(BaseIndexedModel):
     @classmethod
     def index_manager(cls, index=None):
         return SimpleIndexManager(index)
+
+
+# The storages that cannot be opened by several processes at once: file
+# storages are locked by the first process, and memory storages are not
+# shared between processes.
+_PROCESS_LOCAL_STORAGES = (
+    ZODB.FileStorage.FileStorage,
+    ZODB.MappingStorage.MappingStorage,
+    ZODB.DemoStorage.DemoStorage,
+)
+
+_index_table_rebuild_job = None
+_index_table_rebuild_error = None
+
+
+def _index_table_rebuild_init(uri, database_name, model, indexes, shadows):
+    global _index_table_rebuild_job, _index_table_rebuild_error
+
+    # A pool restarts the workers which initializer fails, so the error is
+    # raised by the jobs instead, and aborts the rebuild.
+    try:
+        sheraf.Database(uri, db_args={"database_name": database_name})
+    except Exception as exc:
+        _index_table_rebuild_error = exc
+    _index_table_rebuild_job = (database_name, model, indexes, shadows)
+
+
+def _index_table_rebuild_range(bounds):
+    if _index_table_rebuild_error is not None:
+        raise _index_table_rebuild_error
+
+    database_name, model, indexes, shadows = _index_table_rebuild_job
+
+    with sheraf.connection(database_name):
+        sheraf.attempt(
+            model._index_table_rebuild_range, args=(indexes, shadows) + bounds
+        )
@@ -1,11 +1,105 @@
+import copy
 import itertools
+import weakref
+
+import BTrees.Length
+import transaction.interfaces
 
 import sheraf.types
 
 
+class IndexCache:
+    """
+    Keeps the index tables, and the objects stored next to them, that have
+    been looked for through a ZODB connection during the current
+    transaction. Thus model editions in a same transaction find the index
+    tables with dict lookups only.
+
+    The cache joins the transaction as a data manager. It is emptied when
+    the transaction is committed or aborted, and when a savepoint is rolled
+    back.
+    """
+
+    def __init__(self, connection):
+        # Connections are reused with other transaction managers, so the
+        # transaction manager is only looked for when the cache is filled.
+        self.connection = weakref.ref(connection)
+        self.transaction = None
+        self.values = {}
+
+    @property
+    def transaction_manager(self):
+        return self.connection().transaction_manager
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def __setitem__(self, key, value):
+        if self.transaction is None:
+            try:
+                self.transaction = self.transaction_manager.get()
+            except transaction.interfaces.NoTransaction:
+                return
+            self.transaction.join(self)
+
+        self.values[key] = value
+
+    def clear(self):
+        self.values.clear()
+
+    def _reset(self, transaction):
+        self.values.clear()
+        self.transaction = None
+
+    abort = tpc_finish = tpc_abort = _reset
+
+    def tpc_begin(self, transaction):
+        pass
+
+    commit = tpc_vote = tpc_begin
+
+    def sortKey(self):
+        return "sheraf.indexcache.{}".format(id(self))
+
+    def savepoint(self):
+        return IndexCacheSavepoint(self)
+
+
+class IndexCacheSavepoint:
+    def __init__(self, cache):
+        self.cache = cache
+
+    def rollback(self):
+        self.cache.clear()
+
+
+_index_caches = weakref.WeakKeyDictionary()
+
+
+def index_cache(connection):
+    """
+    :return: The :class:`IndexCache` of a ZODB connection.
+    """
+    try:
+        return _index_caches[connection]
+    except KeyError:
+        return _index_caches.setdefault(connection, IndexCache(connection))
+
+
 class IndexManager:
     root_default = sheraf.types.SmallDict
-    index_multiple_default = sheraf.types.LargeList
+    index_multiple_default = sheraf.types.LargeSet
+
+    #: The key of the mapping, stored next to the index tables, holding the
+    #: :class:`BTrees.Length.Length` of each table.
+    LENGTHS_KEY = "__lengths__"
+
+    #: The suffix of the key of the tables built by :meth:`shadow` managers.
+    SHADOW_SUFFIX = "__shadow__"
+
+    #: The key of the mapping, stored next to the index tables, holding the
+    #: cursors of the indexes being built.
+    BUILDING_KEY = "__building__"
 
     def __init__(self, details):
         self.details = details
@@ -19,10 +113,11 @@ class IndexManager:
                      the current values of the index for the current model
                      are set.
         """
-        if not keys:
+        if keys is None:
             keys = self.details.get_values(model)
 
         table = self.table()
+        self._register(model.mapping)
 
         for key in keys:
             if self.details.unique:
@@ -30,6 +125,80 @@ class IndexManager:
             else:
                 self._table_set_multiple(table, key, model.mapping)
 
+        mirror = self.mirror()
+        if mirror:
+            mirror.mirror_add({key: [model.mapping] for key in keys})
+
+    def add_items(self, items):
+        """
+        Sets several model instances at once in the index. The mappings are
+        grouped by key so each index entry is written only once, and the
+        unique constraint is checked for the whole batch before anything is
+        written.
+
+        :param items: An iterable of ``(model, keys)`` tuples. If ``keys`` is
+                      `None`, all the current values of the index for the
+                      model are set.
+        """
+        items = list(items)
+        for model, _ in items:
+            self._register(model.mapping)
+
+        entries = self._entries(items)
+
+        table = self.table()
+        length = self.length(table)
+
+        if self.details.unique:
+            self._check_unique(entries, table)
+            table.update([(key, entries[key][0]) for key in self._sorted(entries)])
+            length.change(len(entries))
+
+        else:
+            for key in self._sorted(entries):
+                index_list = table.get(key)
+                if index_list is None:
+                    index_list = table[key] = self.index_multiple_default()
+                    length.change(1)
+                index_list.extend(entries[key])
+
+        mirror = self.mirror()
+        if mirror:
+            mirror.mirror_add(entries)
+
+    def check_items(self, items):
+        """
+        Checks that several model instances could be set at once in a unique
+        index, without writing anything.
+
+        :param items: An iterable of ``(model, keys)`` tuples, like in
+                      :meth:`add_items`.
+        :raise: :class:`~sheraf.exceptions.UniqueIndexException` if a key is
+                shared by several instances or is already in the index.
+        """
+        if self.details.unique:
+            table = self.table() if self.table_initialized() else {}
+            self._check_unique(self._entries(items), table)
+
+    def _entries(self, items):
+        entries = {}
+        for model, keys in items:
+            if keys is None:
+                keys = self.details.get_values(model)
+
+            for key in keys:
+                entries.setdefault(key, []).append(model.mapping)
+        return entries
+
+    def _check_unique(self, entries, table):
+        for key, mappings in entries.items():
+            if len(mappings) > 1 or key in table:
+                raise sheraf.exceptions.UniqueIndexException(
+                    "The key '{}' is already present in the index '{}'".format(
+                        key, self.details.key
+                    )
+                )
+
     def delete_item(self, model, keys=None):
         """
         Delete model instances from a given index.
@@ -39,7 +208,7 @@ class IndexManager:
                      the current values of the index for the current model
                      are removed.
         """
-        if not keys:
+        if keys is None:
             keys = self.details.get_values(model)
 
         table = self.table()
@@ -53,30 +222,380 @@ class IndexManager:
             else:
                 self._table_del_multiple(table, key, model.mapping)
 
+        mirror = self.mirror()
+        if mirror:
+            mirror.mirror_delete({key: [model.mapping] for key in keys})
+
+    def delete_items(self, items):
+        """
+        Delete several model instances at once from the index. The mappings
+        are grouped by key so each index entry is rewritten only once.
+
+        :param items: An iterable of ``(model, keys)`` tuples. If ``keys`` is
+                      `None`, all the current values of the index for the
+                      model are removed.
+        """
+        entries = {}
+        for model, keys in items:
+            if keys is None:
+                keys = self.details.get_values(model)
+
+            for key in keys:
+                entries.setdefault(key, []).append(model.mapping)
+
+        table = self.table()
+
+        for key in self._sorted(entries):
+            if key not in table:
+                continue
+
+            if self.details.unique:
+                self._table_del_unique(table, key, entries[key][0])
+            else:
+                self._table_del_multiple_items(table, key, entries[key])
+
+        mirror = self.mirror()
+        if mirror:
+            mirror.mirror_delete(entries)
+
+    def migrate(self):
+        """
+        Converts the entries of a multiple index that were stored with
+        another type than :attr:`index_multiple_default`, for instance the
+        :class:`~sheraf.types.largelist.LargeList` used by older versions.
+        The models are not read, only the index table is.
+
+        :return: The number of converted entries.
+        """
+        if self.details.unique:
+            return 0
+
+        count = 0
+        for table in self.tables():
+            for key, index_list in table.items():
+                if isinstance(index_list, self.index_multiple_default):
+                    continue
+
+                table[key] = self.index_multiple_default(index_list)
+                count += 1
+
+        return count
+
+    def length(self, table=None):
+        """
+        :param table: The index table the length is looked for. It is only
+                      used to initialize the length when it is missing.
+        :return: The :class:`BTrees.Length.Length` counting the keys of the
+                 index table where entries are written. If the table has
+                 no length yet, it is created from the table size.
+        """
+        root = self.root()
+        lengths = root.get(self.LENGTHS_KEY)
+        if lengths is None:
+            lengths = root.setdefault(self.LENGTHS_KEY, self.root_default())
+
+        try:
+            return lengths[self.details.key]
+        except KeyError:
+            table = self.table() if table is None else table
+            return lengths.setdefault(
+                self.details.key, BTrees.Length.Length(len(table))
+            )
+
+    def delete(self):
+        root = self.root()
+        try:
+            del root[self.details.key]
+        except KeyError:
+            pass
+
+        try:
+            del root[self.LENGTHS_KEY][self.details.key]
+        except KeyError:
+            pass
+
+        self.clear_cache()
+
+    def shadow(self):
+        """
+        :return: A manager of the same index, that writes in another table
+                 stored next to the index table. The table can be built while
+                 the index is read, and then replace it with :meth:`replace`.
+        """
+        manager = copy.copy(self)
+        manager.details = copy.copy(self.details)
+        manager.details.key = self.details.key + self.SHADOW_SUFFIX
+        return manager
+
+    def mirror(self):
+        """
+        :return: The :meth:`shadow` manager of the index while its table is
+                 rebuilt, so the entries written in the index table are also
+                 written in the new table, or `None`.
+        """
+        if self.details.key.endswith(self.SHADOW_SUFFIX):
+            return None
+
+        building = self.root().get(self.BUILDING_KEY)
+        if not building or self.details.key + self.SHADOW_SUFFIX not in building:
+            return None
+
+        return self.shadow()
+
+    def mirror_add(self, entries):
+        """
+        Writes entries that were written in the index table being rebuilt.
+        The mappings that are already in the table are skipped, as the
+        rebuild may have read them before.
+
+        :param entries: A dict which values are lists of mappings, and keys
+                        the index keys they are stored under.
+        """
+        table = self.table()
+        length = self.length(table)
+        for key in self._sorted(entries):
+            if self.details.unique:
+                if key not in table:
+                    length.change(1)
+                table[key] = entries[key][0]
+            else:
+                for mapping in entries[key]:
+                    self._table_set_multiple(table, key, mapping)
+
+    def mirror_delete(self, entries):
+        """
+        Removes entries that were removed from the index table being rebuilt.
+        The mappings that are not in the table are skipped, as the rebuild
+        may not have read them yet.
+
+        :param entries: A dict which values are lists of mappings, and keys
+                        the index keys they are stored under.
+        """
+        table = self.table()
+        for key in self._sorted(entries):
+            if key not in table:
+                continue
+
+            if self.details.unique:
+                if table[key] is entries[key][0]:
+                    self._table_del_unique(table, key, entries[key][0])
+            else:
+                self._table_del_multiple_items(table, key, entries[key])
+
+    def replace(self, manager):
+        """
+        Replaces the index table and its length by the ones of another
+        manager, for instance a :meth:`shadow` manager. The other manager
+        table is removed.
+        """
+        root = self.root()
+        table = root.get(manager.details.key)
+        if table is None:
+            self.delete()
+            return
+
+        length = manager.length(table)
+        manager.delete()
+        root[self.details.key] = table
+        root[self.LENGTHS_KEY][self.details.key] = length
+        self.clear_cache()
+
+    def building(self):
+        """
+        :return: Whether the index is being built, and thus may miss some
+                 models.
+        """
+        return any(
+            self.details.key in root.get(self.BUILDING_KEY, ()) for root in self.roots()
+        )
+
+    def build_cursor(self):
+        """
+        :return: The last primary key of the models added to the index being
+                 built, or `None` if no model has been added yet. If the
+                 index is not being built, a :class:`KeyError` is raised.
+        """
+        return self.root()[self.BUILDING_KEY][self.details.key]
+
+    def build(self, cursor=None):
+        """
+        Marks the index as being built, and creates its table so the models
+        edited from now on are indexed.
+
+        :param cursor: The last primary key of the models added to the index.
+        """
+        root = self.root()
+        building = root.get(self.BUILDING_KEY)
+        if building is None:
+            building = root.setdefault(self.BUILDING_KEY, self.root_default())
+        building[self.details.key] = cursor
+        self.length(self.table())
+
+    def built(self):
+        """
+        Marks the index as complete.
+        """
+        try:
+            del self.root()[self.BUILDING_KEY][self.details.key]
+        except KeyError:
+            pass
+
+    def length_rebuild(self):
+        """
+        Sets the lengths of the index tables from the tables sizes. This
+        should be called on tables written by previous versions, that did not
+        maintain the lengths.
+
+        :return: The number of keys in the index tables.
+        """
+        count = 0
+        for root in self.roots():
+            try:
+                table = root[self.details.key]
+            except KeyError:
+                continue
+
+            lengths = root.get(self.LENGTHS_KEY)
+            if lengths is None:
+                lengths = root.setdefault(self.LENGTHS_KEY, self.root_default())
+            lengths[self.details.key] = BTrees.Length.Length(len(table))
+            count += len(table)
+
+        self.clear_cache()
+        return count
+
+    def clear_cache(self):
+        """
+        Forgets the index tables looked for during the current transaction.
+        """
+
+    def _root_count(self, root):
+        # Tables written by previous versions have no length, and are counted
+        # the slow way until their length is created.
+        try:
+            return root[self.LENGTHS_KEY][self.details.key]()
+        except KeyError:
+            pass
+
+        try:
+            return len(root[self.details.key])
+        except KeyError:
+            return 0
+
     def update_item(self, item, old_keys, new_keys):
         old_values = self.details.get_values(keys=old_keys)
         new_values = self.details.get_values(keys=new_keys)
 
-        if old_keys and new_keys:
-            del_values = old_values - new_values
-            add_values = new_values - old_values
+        del_values = old_values - new_values
+        add_values = new_values - old_values
+
+        # A collection edited in place has the same old and new values, but
+        # its new items are missing from the index, so it is indexed again.
+        if not del_values and not add_values:
+            del_values = add_values = new_values
 
+        if del_values:
             self.delete_item(item, del_values)
+
+        if add_values:
             self.add_item(item, add_values)
 
-        elif not old_keys:
-            self.add_item(item, new_values)
+    def get_postings(self, keys):
+        """
+        :param keys: The index keys to look for.
+        :return: A list containing, for every key present in the index, the
+                 collection of the mappings indexed under this key.
+        """
+        return [
+            [self.get_item(key)] if self.details.unique else self.get_item(key)
+            for key in keys
+            if self.has_item(key)
+        ]
+
+    def get_range_postings(
+        self, min=None, max=None, excludemin=False, excludemax=False
+    ):
+        """
+        :param min: The lower bound of the index keys. If `None`, there is no
+                    lower bound.
+        :param max: The upper bound of the index keys. If `None`, there is no
+                    upper bound.
+        :param excludemin: Whether the lower bound key should be excluded.
+        :param excludemax: Whether the upper bound key should be excluded.
+        :return: A generator over the collections of the mappings indexed
+                 under the keys within the range.
+        """
+        for table in self.tables():
+            values = self._table_range(table.values, min, max, excludemin, excludemax)
+            for value in values:
+                yield [value] if self.details.unique else value
 
-        elif not new_keys:
-            self.delete_item(item, old_values)
+    def _table_range(self, method, min, max, excludemin, excludemax):
+        """
+        Calls a BTree range method, like ``keys`` or ``values``, between
+        the bounds.
+
+        :raise TypeError: If the bounds cannot be compared with the index keys.
+        """
+        try:
+            return method(min, max, excludemin, excludemax)
+        except TypeError as exc:
+            raise TypeError(
+                "The '{}' index keys cannot be compared with {!r}".format(
+                    self.details.key, min if min is not None else max
+                )
+            ) from exc
+
+    @staticmethod
+    def _sorted(keys):
+        # Writing the keys in order keeps the BTree buckets loads sequential.
+        # Keys that cannot be compared are written as they come.
+        try:
+            return sorted(keys)
+        except TypeError:
+            return list(keys)
 
     def _table_del_unique(self, table, key, value):
+        length = self.length(table)
         del table[key]
+        length.change(-1)
 
     def _table_del_multiple(self, table, key, value):
-        table[key].remove(value)
-        if len(table[key]) == 0:
+        index_list = table[key]
+        try:
+            index_list.remove(value)
+        except ValueError:
+            # An index being built can miss the model.
+            return
+
+        if not index_list:
+            length = self.length(table)
             del table[key]
+            length.change(-1)
+
+    def _table_del_multiple_items(self, table, key, values):
+        index_list = table[key]
+
+        if isinstance(index_list, sheraf.types.LargeList):
+            # Removing from a LargeList shifts the following items, so the
+            # list is rebuilt once. The mappings are compared by identity.
+            deleted = {id(value) for value in values}
+            remaining = [value for value in index_list if id(value) not in deleted]
+            if len(remaining) != len(index_list):
+                index_list = table[key] = self.index_multiple_default(remaining)
+
+        else:
+            for value in values:
+                try:
+                    index_list.remove(value)
+                except ValueError:
+                    # An index being built can miss the model.
+                    pass
+
+        if not index_list:
+            length = self.length(table)
+            del table[key]
+            length.change(-1)
 
     def _table_set_unique(self, table, key, value):
         if key in table:
@@ -85,16 +604,38 @@ class IndexManager:
                     key, self.details.key
                 )
             )
+        length = self.length(table)
         table[key] = value
+        length.change(1)
 
     def _table_set_multiple(self, table, key, value):
-        index_list = table.setdefault(key, self.index_multiple_default())
+        index_list = table.get(key)
+        if index_list is None:
+            length = self.length(table)
+            index_list = table[key] = self.index_multiple_default()
+            length.change(1)
         index_list.append(value)
 
+    def _register(self, mapping):
+        # Multiple index entries are keyed by OID, so new mappings are added
+        # to the connection of the index table as soon as they are indexed.
+        # This way the OIDs follow the creation order.
+        if getattr(mapping, "_p_oid", False) is None:
+            self.connection().add(mapping)
+
 
 class SimpleIndexManager(IndexManager):
     persistent = None
 
+    def connection(self):
+        return self.persistent._p_jar or sheraf.Database.current_connection()
+
+    def root(self):
+        return self.persistent
+
+    def roots(self):
+        return [self.persistent]
+
     def initialized(self):
         return self.persistent is not None
 
@@ -113,16 +654,22 @@ class SimpleIndexManager(IndexManager):
     def has_item(self, key):
         return self.persistent[self.details.key].has_key(key)
 
-    def iterkeys(self, reverse=False):
+    def tables(self):
+        try:
+            return [self.persistent[self.details.key]]
+        except KeyError:
+            return []
+
+    def iterkeys(
+        self, reverse=False, min=None, max=None, excludemin=False, excludemax=False
+    ):
+        keys = self._table_range(self.table().keys, min, max, excludemin, excludemax)
         if reverse:
-            return reversed(list(self.table().iterkeys()))
-        return self.table().iterkeys()
+            return reversed(keys)
+        return iter(keys)
 
     def count(self):
-        try:
-            return len(self.persistent[self.details.key])
-        except KeyError:
-            return 0
+        return self._root_count(self.persistent)
 
 
 def current_database_name():
@@ -138,45 +685,92 @@ class MultipleDatabaseIndexManager(IndexManager):
         self.database_name = database_name
         self.table_name = table
 
-    def database_root(self, database_name=None):
+    def connection(self, database_name=None):
         database_name = database_name or self.database_name or current_database_name()
-        return sheraf.Database.current_connection(database_name).root()
+        return sheraf.Database.current_connection(database_name)
+
+    def database_root(self, database_name=None):
+        return self.connection(database_name).root()
 
     def root(self, database_name=None, setdefault=True):
-        root = self.database_root(database_name)
+        connection = self.connection(database_name)
+        cache = index_cache(connection)
+        cache_key = ("root", self.table_name)
         try:
-            return root[self.table_name]
+            return cache[cache_key]
         except KeyError:
-            if not setdefault:
-                raise
-            return root.setdefault(self.table_name, self.root_default())
+            pass
 
-    def delete(self):
+        database_root = connection.root()
         try:
-            del self.root()[self.details.key]
+            root = database_root[self.table_name]
         except KeyError:
-            pass
+            if not setdefault:
+                raise
+            root = database_root.setdefault(self.table_name, self.root_default())
+
+        cache[cache_key] = root
+        return root
+
+    def roots(self):
+        roots = []
+        for db_name in (self.database_name, current_database_name()):
+            if not db_name:
+                continue
+
+            try:
+                roots.append(self.root(db_name, False))
+            except KeyError:
+                continue
+
+        return roots
 
     def initialized(self, database_name=None):
         for db_name in (database_name, current_database_name()):
             if not db_name:
                 continue
 
-            if self.table_name in self.database_root(db_name):
+            try:
+                self.root(db_name, False)
                 return True
+            except KeyError:
+                pass
 
         return False
 
     def table(self, database_name=None, setdefault=True):
-        root = self.root(database_name, setdefault)
+        cache = index_cache(self.connection(database_name))
+        cache_key = ("table", self.table_name, self.details.key)
+        try:
+            return cache[cache_key]
+        except KeyError:
+            pass
 
+        root = self.root(database_name, setdefault)
         try:
-            return root[self.details.key]
+            table = root[self.details.key]
         except KeyError:
             if not setdefault:
                 raise
+            table = root.setdefault(self.details.key, self.details.mapping())
+
+        cache[cache_key] = table
+        return table
+
+    def length(self, table=None):
+        cache = index_cache(self.connection())
+        cache_key = ("length", self.table_name, self.details.key)
+        try:
+            return cache[cache_key]
+        except KeyError:
+            pass
+
+        length = super().length(table)
+        cache[cache_key] = length
+        return length
 
-        return root.setdefault(self.details.key, self.details.mapping())
+    def clear_cache(self):
+        index_cache(self.connection()).clear()
 
     def tables(self):
         tables = []
@@ -197,11 +791,8 @@ class MultipleDatabaseIndexManager(IndexManager):
                 continue
 
             try:
-                if self.root(db_name, False) and self.details.key in self.root(
-                    db_name, False
-                ):
-
-                    return True
+                self.table(db_name, False)
+                return True
             except KeyError:
                 pass
 
@@ -227,15 +818,21 @@ class MultipleDatabaseIndexManager(IndexManager):
 
         return False
 
-    def iterkeys(self, reverse=False):
+    def iterkeys(
+        self, reverse=False, min=None, max=None, excludemin=False, excludemax=False
+    ):
         if reverse:
             return itertools.chain.from_iterable(
-                reversed(list(table.iterkeys())) for table in self.tables()
+                reversed(
+                    self._table_range(table.keys, min, max, excludemin, excludemax)
+                )
+                for table in self.tables()
             )
 
         return itertools.chain.from_iterable(
-            table.iterkeys() for table in self.tables()
+            self._table_range(table.iterkeys, min, max, excludemin, excludemax)
+            for table in self.tables()
         )
 
     def count(self):
-        return sum(len(table) for table in self.tables())
+        return sum(self._root_count(root) for root in self.roots())
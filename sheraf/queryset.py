@@ -1,8 +1,13 @@
+import array
+import functools
+import heapq
 import itertools
 import operator
+import sys
 from collections import OrderedDict
 
-from BTrees.OOBTree import OOTreeSet, union, intersection, difference
+import BTrees.LOBTree
+import ZODB.utils
 
 import sheraf.constants
 from sheraf.exceptions import InvalidFilterException, InvalidOrderException
@@ -11,6 +16,499 @@ from collections.abc import Iterable, Sized
 from sheraf.tools.more_itertools import unique_everseen
 
 
+def _oid(mapping):
+    return ZODB.utils.u64(mapping._p_oid)
+
+
+def _database_name(obj):
+    return obj._p_jar.db().database_name
+
+
+def _database_oid(mapping):
+    # OIDs are only unique within a database, and the tables of a model can
+    # be spread over several databases.
+    return _database_name(mapping), _oid(mapping)
+
+
+class _OIDSets(object):
+    """
+    The OIDs of mappings, stored in a :class:`BTrees.LOBTree.LOSet` by
+    database name, so they can be combined with BTrees set operations.
+    It contains the keys returned by ``_database_oid``.
+    """
+
+    def __init__(self, sets=None):
+        self.sets = sets or {}
+
+    def __contains__(self, key):
+        database_name, oid = key
+        oids = self.sets.get(database_name)
+        return oids is not None and oid in oids
+
+    def __len__(self):
+        return sum(len(oids) for oids in self.sets.values())
+
+    def __bool__(self):
+        return any(self.sets.values())
+
+    def intersection(self, other):
+        return _OIDSets(
+            {
+                database_name: BTrees.LOBTree.intersection(
+                    oids, other.sets[database_name]
+                )
+                for database_name, oids in self.sets.items()
+                if database_name in other.sets
+            }
+        )
+
+
+def _identity(model):
+    try:
+        return model.__class__, model.identifier
+    except AttributeError:
+        return model
+
+
+def _order_key(attribute, order):
+    """
+    :return: A sort key on an attribute. Like with the index walks, the
+        models which value is `None` come last, whatever the order.
+    """
+    read = operator.attrgetter(attribute)
+    descending = order == sheraf.constants.DESC
+
+    def key(model):
+        value = read(model)
+        return (value is None) != descending, value
+
+    return key
+
+
+def _collect(items, keys, key):
+    for item in items:
+        keys.add(key(item))
+        yield item
+
+
+# The set operations on QuerySets keep the order of the operands. ``keys`` and
+# ``other_keys`` are the sets of the keys of ``items`` and ``other_items``.
+# When they are not given, they are computed as the items are iterated, so
+# only the operands that need it are entirely read before yielding.
+
+
+def _intersection(items, other_items, key, keys=None, other_keys=None):
+    if other_keys is None:
+        other_keys = {key(item) for item in other_items}
+
+    return (item for item in items if key(item) in other_keys)
+
+
+def _union(items, other_items, key, keys=None, other_keys=None):
+    if keys is None:
+        keys = set()
+        items = _collect(items, keys, key)
+
+    yield from items
+    yield from (item for item in other_items if key(item) not in keys)
+
+
+def _symmetric_difference(items, other_items, key, keys=None, other_keys=None):
+    if other_keys is None:
+        other_items = list(other_items)
+        other_keys = {key(item) for item in other_items}
+
+    if keys is None:
+        keys = set()
+        items = _collect(items, keys, key)
+
+    yield from (item for item in items if key(item) not in other_keys)
+    yield from (item for item in other_items if key(item) not in keys)
+
+
+class _Greatest(object):
+    # Greater than any other value. A tuple ending with it is greater than
+    # every tuple sharing its beginning, so it can bound compound index keys.
+
+    def __eq__(self, other):
+        return self is other
+
+    def __lt__(self, other):
+        return False
+
+    def __le__(self, other):
+        return self is other
+
+    def __gt__(self, other):
+        return self is not other
+
+    def __ge__(self, other):
+        return True
+
+    __hash__ = object.__hash__
+
+
+_GREATEST = _Greatest()
+
+
+def _compound_range(prefix, value):
+    """
+    :param prefix: The tuple of the first values of the compound index keys.
+    :param value: A :class:`~sheraf.queryset.Range` of the next value in the
+                  keys, or `None`.
+    :return: The :class:`~sheraf.queryset.Range` of the compound index keys
+             starting with ``prefix``, and which next value is in ``value``.
+    """
+    if value is None:
+        value = Range()
+    lower, upper, excludemin, excludemax = value.bounds()
+
+    if lower is None:
+        min = prefix or None
+    elif excludemin:
+        min = prefix + (lower, _GREATEST)
+    else:
+        min = prefix + (lower,)
+
+    if upper is None:
+        max = prefix + (_GREATEST,) if prefix else None
+    elif excludemax:
+        max = prefix + (upper,)
+    else:
+        max = prefix + (upper, _GREATEST)
+
+    return Range(min, max, excludemax=upper is not None and excludemax)
+
+
+class Range(object):
+    """
+    A :class:`~sheraf.queryset.Range` can be passed as a
+    :func:`~sheraf.queryset.QuerySet.filter` value to select the models which
+    attribute value is between two bounds. When the attribute is indexed,
+    the index keys between the bounds are directly read in the index table.
+
+    :param min: The lower bound. If `None`, the range has no lower bound.
+    :param max: The upper bound. If `None`, the range has no upper bound.
+    :param excludemin: Whether the lower bound should be excluded from the range.
+    :type excludemin: bool
+    :param excludemax: Whether the upper bound should be excluded from the range.
+    :type excludemax: bool
+
+    >>> assert 18 in Range(18, 65)
+    >>> assert 65 not in Range(18, 65, excludemax=True)
+    >>> assert 100 in Range(min=18)
+    """
+
+    def __init__(self, min=None, max=None, excludemin=False, excludemax=False):
+        self.min = min
+        self.max = max
+        self.excludemin = excludemin
+        self.excludemax = excludemax
+
+    def __repr__(self):
+        return "<Range {}{}, {}{}>".format(
+            "]" if self.excludemin else "[",
+            self.min,
+            self.max,
+            "[" if self.excludemax else "]",
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, Range) and self.bounds() == other.bounds()
+
+    def __hash__(self):
+        return hash(self.bounds())
+
+    def __contains__(self, value):
+        if value is None:
+            return False
+
+        if self.min is not None and (
+            value < self.min or (self.excludemin and value == self.min)
+        ):
+            return False
+
+        if self.max is not None and (
+            value > self.max or (self.excludemax and value == self.max)
+        ):
+            return False
+
+        return True
+
+    def bounds(self):
+        """
+        :return: A tuple containing the `min`, `max`, `excludemin` and
+            `excludemax` values, in the order expected by the BTrees
+            `keys` and `values` methods.
+        """
+        return self.min, self.max, self.excludemin, self.excludemax
+
+    def merge(self, other):
+        """
+        :return: A new :class:`~sheraf.queryset.Range` combining the bounds
+            of both ranges, or `None` if both ranges define the same bound.
+        """
+        if (self.min is not None and other.min is not None) or (
+            self.max is not None and other.max is not None
+        ):
+            return None
+
+        lower, upper = (self, other) if self.min is not None else (other, self)
+        return Range(lower.min, upper.max, lower.excludemin, upper.excludemax)
+
+
+class Prefix(Range):
+    """
+    A :class:`~sheraf.queryset.Prefix` can be passed as a
+    :func:`~sheraf.queryset.QuerySet.filter` value to select the models which
+    string attribute value starts with a given prefix. On indexed attributes,
+    this is the range of keys between the prefix and the smallest string
+    greater than every string starting with the prefix.
+
+    With :func:`~sheraf.queryset.QuerySet.search`, the prefix goes through
+    the same transformation than the other searched values.
+
+    :param prefix: The string the values must start with.
+
+    >>> assert "George Abitbol" in Prefix("Geo")
+    >>> assert "Peter" not in Prefix("Geo")
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        successor = self._successor(prefix)
+        # The BTrees exclude the last key if the upper bound is None.
+        super().__init__(prefix, successor, False, successor is not None)
+
+    def __repr__(self):
+        return "<Prefix {!r}>".format(self.prefix)
+
+    def __contains__(self, value):
+        return isinstance(value, str) and value.startswith(self.prefix)
+
+    @staticmethod
+    def _successor(prefix):
+        prefix = prefix.rstrip(chr(sys.maxunicode))
+        if not prefix:
+            return None
+        return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+RANGE_LOOKUPS = {
+    "gt": lambda value: Range(min=value, excludemin=True),
+    "gte": lambda value: Range(min=value),
+    "lt": lambda value: Range(max=value, excludemax=True),
+    "lte": lambda value: Range(max=value),
+    "startswith": Prefix,
+}
+
+
+class Aggregation(object):
+    """
+    An :class:`~sheraf.queryset.Aggregation` computes a value over the
+    models of a :class:`~sheraf.queryset.QuerySet` with
+    :func:`~sheraf.queryset.QuerySet.aggregate`. The values are read one at
+    a time, so custom aggregations can be written by overriding
+    :meth:`start`, :meth:`step` and :meth:`finish`.
+
+    :param attribute: The name of the aggregated attribute. `None` values are
+                      ignored.
+
+    >>> class Product(Aggregation):
+    ...     def start(self):
+    ...         return 1
+    ...
+    ...     def step(self, state, value):
+    ...         return state * value
+    ...
+    >>> with sheraf.connection():
+    ...     george = Cowboy.create(age=2)
+    ...     peter = Cowboy.create(age=3)
+    ...     Cowboy.all().aggregate(product=Product("age"))
+    {'product': 6}
+    """
+
+    def __init__(self, attribute=None):
+        self.attribute = attribute
+
+    def __repr__(self):
+        return "<{} {}>".format(self.__class__.__name__, self.attribute)
+
+    def start(self):
+        """
+        :return: The state of the aggregation before any value is read.
+        """
+        return None
+
+    def step(self, state, value):
+        """
+        :param state: The current state of the aggregation.
+        :param value: A value that is not `None`.
+        :return: The new state of the aggregation.
+        """
+        raise NotImplementedError
+
+    def finish(self, state):
+        """
+        :return: The aggregation result, from its state once all the values
+                 have been read.
+        """
+        return state
+
+
+class Count(Aggregation):
+    """
+    Counts the models. If an attribute is given, only the models for which
+    this attribute is not `None` are counted.
+    """
+
+    def start(self):
+        return 0
+
+    def step(self, state, value):
+        return state + 1
+
+
+class Sum(Aggregation):
+    """The sum of the attribute values."""
+
+    def start(self):
+        return 0
+
+    def step(self, state, value):
+        return state + value
+
+
+class Min(Aggregation):
+    """The smallest attribute value, or `None` if there is no value."""
+
+    def step(self, state, value):
+        return value if state is None or value < state else state
+
+
+class Max(Aggregation):
+    """The greatest attribute value, or `None` if there is no value."""
+
+    def step(self, state, value):
+        return value if state is None or value > state else state
+
+
+class Avg(Aggregation):
+    """The average of the attribute values, or `None` if there is no value."""
+
+    def start(self):
+        return 0, 0
+
+    def step(self, state, value):
+        total, count = state
+        return total + value, count + 1
+
+    def finish(self, state):
+        total, count = state
+        return total / count if count else None
+
+
+def _mapping_reader(model_class, attribute):
+    """
+    :return: A callable reading the value of an attribute in a model mapping,
+             without building a model instance when the attribute is stored
+             under a single key and has no custom reading method. When the
+             attribute does not transform its stored data, the raw mapping
+             value is returned.
+    """
+
+    def read_model(mapping):
+        return attribute.read(model_class._decorate(mapping))
+
+    if type(attribute).read is not sheraf.attributes.base.BaseAttribute.read or (
+        isinstance(attribute._key, (list, tuple))
+    ):
+        return read_model
+
+    key = attribute.key(None)
+
+    if type(attribute).deserialize is sheraf.attributes.base.BaseAttribute.deserialize:
+
+        def read(mapping):
+            try:
+                return mapping[key]
+            except KeyError:
+                return read_model(mapping)
+
+        return read
+
+    deserialize = attribute.deserialize
+
+    def read(mapping):
+        try:
+            return deserialize(mapping[key])
+        except KeyError:
+            return read_model(mapping)
+
+    return read
+
+
+def _filter_check(model_class, filter_name, expected_value, filter_transformation):
+    """
+    :return: A callable checking whether a model of ``model_class`` matches
+             a filter, or ``None`` if the filter does not apply to the model
+             class. Everything that does not depend on the checked model is
+             resolved here once.
+    """
+    index = model_class.indexes().get(filter_name)
+    if index:
+        details = index.details
+        get_values = details.get_values
+
+        if isinstance(expected_value, Prefix) and filter_transformation:
+            prefixes = [
+                Prefix(prefix) for prefix in details.search_func(expected_value.prefix)
+            ]
+            return lambda model: any(
+                value in prefix for value in get_values(model) for prefix in prefixes
+            )
+
+        # Like with the index tables, the bounds of ranges are not transformed.
+        if filter_transformation and not isinstance(expected_value, Range):
+            searched = set(details.search_func(expected_value))
+            return lambda model: not searched.isdisjoint(get_values(model))
+
+        # When the index keys are the attribute values, the value can be
+        # compared directly instead of building the set of index keys.
+        if details.attribute is not None and details.orderable and not details.noneok:
+            read = _mapping_reader(model_class, details.attribute)
+
+            if isinstance(expected_value, Range):
+
+                def check(model):
+                    value = read(model.mapping)
+                    return value is not None and value in expected_value
+
+                return check
+
+            if expected_value is None:
+                return lambda model: False
+
+            return lambda model: read(model.mapping) == expected_value
+
+        if isinstance(expected_value, Range):
+            return lambda model: any(
+                value in expected_value for value in get_values(model)
+            )
+
+        return lambda model: expected_value in get_values(model)
+
+    if filter_name in model_class.attributes:
+        read = _mapping_reader(model_class, model_class.attributes[filter_name])
+
+        if isinstance(expected_value, Range):
+            return lambda model: read(model.mapping) in expected_value
+
+        return lambda model: read(model.mapping) == expected_value
+
+    return None
+
+
 class QuerySet(object):
     """
     A :class:`~sheraf.queryset.QuerySet` is a collection containing
@@ -91,6 +589,9 @@ class QuerySet(object):
         self._predicate = predicate
         self.model = model_class
         self.orders = OrderedDict()
+        self._predicate_filters = None
+        self._compiled_filters = {}
+        self._iterator_accepted = False
 
         if iterable is None and model_class is None:
             self._iterable = []
@@ -109,24 +610,6 @@ class QuerySet(object):
 
         return "<QuerySet>"
 
-    def _model_has_expected_values(self, model):
-        for filter_name, expected_value, filter_transformation in self.filters.values():
-            if filter_name in model.indexes():
-                index = model.indexes()[filter_name]
-                if filter_transformation:
-                    if not set(index.details.search_func(expected_value)) & set(
-                        index.details.get_values(model)
-                    ):
-                        return False
-                else:
-                    if expected_value not in index.details.get_values(model):
-                        return False
-
-            elif filter_name in model.attributes:
-                if getattr(model, filter_name) != expected_value:
-                    return False
-        return True
-
     def __next__(self):
         if not self._iterator:
             self._init_iterator()
@@ -137,11 +620,49 @@ class QuerySet(object):
             except sheraf.exceptions.ModelObjectNotFoundException:
                 continue
 
-            if self._model_has_expected_values(model) and (
-                not self._predicate or self._predicate(model)
-            ):
+            if self._iterator_accepted or self._is_accepted(model):
                 return model
 
+    def _is_accepted(self, model):
+        return self._filters_predicate(model.__class__)(model) and (
+            not self._predicate or self._predicate(model)
+        )
+
+    def _filters_predicate(self, model_class):
+        """
+        :return: A callable checking whether a model of ``model_class``
+            matches the filters that are not handled by the indexes. The
+            filters are compiled once per model class, so checking a model
+            does not resolve the indexes and attributes again.
+        """
+        try:
+            return self._compiled_filters[model_class]
+        except KeyError:
+            pass
+
+        filters = (
+            self.filters.values()
+            if self._predicate_filters is None
+            else self._predicate_filters
+        )
+        checks = [
+            check
+            for check in (
+                _filter_check(model_class, *model_filter) for model_filter in filters
+            )
+            if check is not None
+        ]
+
+        if not checks:
+            predicate = lambda model: True
+        elif len(checks) == 1:
+            predicate = checks[0]
+        else:
+            predicate = lambda model: all(check(model) for check in checks)
+
+        self._compiled_filters[model_class] = predicate
+        return predicate
+
     def __eq__(self, other):
         if isinstance(other, Iterable):
             return all(
@@ -153,13 +674,90 @@ class QuerySet(object):
         return super().__eq__(other)
 
     def __and__(self, other):
-        return QuerySet(intersection(OOTreeSet(self), OOTreeSet(other)))
+        """
+        :return: A :class:`~sheraf.queryset.QuerySet` containing the objects
+            of this :class:`~sheraf.queryset.QuerySet` that are also in
+            ``other``, in the order of this one. Both are consumed.
+
+        >>> with sheraf.connection():
+        ...     peter = Cowboy.create(name="Peter", age=30)
+        ...     steven = Cowboy.create(name="Steven", age=30)
+        ...     george = Cowboy.create(name="George", age=50)
+        ...     thirty = Cowboy.filter(age=30)
+        ...     assert [steven] == thirty & Cowboy.filter(name="Steven")
+        ...     thirty = Cowboy.filter(age=30)
+        ...     assert [peter, steven, george] == thirty | Cowboy.filter(age=50)
+        ...     thirty = Cowboy.filter(age=30)
+        ...     assert [peter] == thirty ^ Cowboy.filter(name="Steven")
+
+        The objects are compared by their identifiers, so models are never
+        compared with each other. When both
+        :class:`~sheraf.queryset.QuerySet` only have indexed filters, the
+        operations are made on the OIDs read in the index tables, qualified by
+        the name of their database, and only the resulting models are decoded.
+        """
+        return self._combine(other, _intersection)
 
     def __or__(self, other):
-        return QuerySet(union(OOTreeSet(self), OOTreeSet(other)))
+        """
+        :return: A :class:`~sheraf.queryset.QuerySet` containing the objects
+            of this :class:`~sheraf.queryset.QuerySet`, followed by the
+            objects of ``other`` that are not in this one.
+        """
+        return self._combine(other, _union)
 
     def __xor__(self, other):
-        return QuerySet(difference(OOTreeSet(self), OOTreeSet(other)))
+        """
+        :return: A :class:`~sheraf.queryset.QuerySet` containing the objects
+            of this :class:`~sheraf.queryset.QuerySet` that are not in
+            ``other``, followed by the objects of ``other`` that are not in this
+            one.
+        """
+        return self._combine(other, _symmetric_difference)
+
+    def _combine(self, other, operation):
+        model_class = (
+            self.model if self.model is getattr(other, "model", None) else None
+        )
+        indexed_filters = self._index_only_filters() if model_class else None
+        other_indexed_filters = other._index_only_filters() if model_class else None
+
+        if indexed_filters and other_indexed_filters:
+            mappings = operation(
+                self._indexed_mappings(indexed_filters),
+                other._indexed_mappings(other_indexed_filters),
+                _database_oid,
+                self._indexed_oids(indexed_filters),
+                other._indexed_oids(other_indexed_filters),
+            )
+            # Like the combinations of models, both operands are consumed.
+            self._iterator = iter([])
+            other._iterator = iter([])
+            return QuerySet(
+                (model_class._decorate(mapping) for mapping in mappings), model_class
+            )
+
+        return QuerySet(operation(self, other, _identity), model_class)
+
+    def _index_only_filters(self):
+        """
+        :return: The indexed filters if the
+            :class:`~sheraf.queryset.QuerySet` can be resolved by reading
+            the index tables only, else `None`.
+        """
+        if (
+            self._iterable is not None
+            or self._iterator
+            or self._predicate
+            or self.orders
+        ):
+            return None
+
+        indexed_filters = self._indexed_filters()
+        if not indexed_filters or self._unindexed_filters(indexed_filters):
+            return None
+
+        return indexed_filters
 
     def count(self):
         """
@@ -171,23 +769,342 @@ class QuerySet(object):
         ...     qs = Cowboy.all()
         ...     assert qs.count() == 1
         ...     assert qs.count() == 0
+
+        When the :class:`~sheraf.queryset.QuerySet` has not been iterated yet,
+        and only has indexed filters, the count is computed from the index
+        tables, without reading any model.
         """
+        if (
+            self.model
+            and self._iterable is None
+            and not self._iterator
+            and not self._predicate
+        ):
+            count = self._index_count()
+            if count is not None:
+                self._iterator = iter([])
+                return count
+
         return sum(1 for _ in self)
 
-    def __getitem__(self, item):
-        self._init_iterator()
+    def exists(self):
+        """
+        :return: Whether the :class:`~sheraf.queryset.QuerySet` contains at
+            least one object. Like :func:`~sheraf.queryset.QuerySet.count`,
+            this consumes it.
+
+        >>> with sheraf.connection():
+        ...     assert not Cowboy.filter(name="Peter").exists()
+        ...     peter = Cowboy.create(name="Peter")
+        ...     assert Cowboy.filter(name="Peter").exists()
+
+        When the :class:`~sheraf.queryset.QuerySet` has not been iterated yet,
+        and only has indexed filters, the index tables are read, and no model
+        is decoded.
+        """
+        if (
+            self.model
+            and self._iterable is None
+            and not self._iterator
+            and not self._predicate
+        ):
+            indexed_filters = self._indexed_filters()
+            if not self._unindexed_filters(indexed_filters):
+                if indexed_filters:
+                    candidates = self._indexed_mappings(indexed_filters)
+                else:
+                    primary_index = self.model.indexes()[self.model.primary_key()]
+                    candidates = primary_index.iterkeys()
+
+                self._iterator = iter([])
+                return any(True for _ in itertools.islice(candidates, 1))
+
+        return self.first() is not None
+
+    def first(self):
+        """
+        :return: The first object of the :class:`~sheraf.queryset.QuerySet`
+            or `None` if it is empty. The returned object is consumed.
+
+        >>> with sheraf.connection():
+        ...     assert Cowboy.all().first() is None
+        ...     peter = Cowboy.create(name="Peter", age=30)
+        ...     george = Cowboy.create(name="George", age=50)
+        ...     assert peter == Cowboy.all().first()
+        ...     assert george == Cowboy.order(age=sheraf.DESC).first()
+
+        Only the first object is decoded, and sorted
+        :class:`~sheraf.queryset.QuerySet` only keep the first object in memory.
+        """
+        if not self._iterator:
+            self._init_iterator(limit=1)
+
+        return next(self, None)
+
+    def after(self, identifier, limit):
+        """
+        Keyset pagination: returns the models following the model with the
+        given identifier, without iterating over the previous models.
+
+        :param identifier: The cursor returned with the previous page, or
+            `None` to get the first page.
+        :param limit: The maximum number of models in the page.
+        :return: A tuple containing a :class:`~sheraf.queryset.CachedQuerySet`
+            of the page models, and the cursor of the next page. The cursor is
+            `None` when there are no more models.
+
+        >>> with sheraf.connection():
+        ...     peter = Cowboy.create(name="Peter")
+        ...     steven = Cowboy.create(name="Steven")
+        ...     george = Cowboy.create(name="George")
+        ...
+        ...     page, cursor = Cowboy.all().after(None, 2)
+        ...     assert [peter, steven] == page
+        ...     page, cursor = Cowboy.all().after(cursor, 2)
+        ...     assert [george] == page
+        ...     assert cursor is None
+
+        Unless the :class:`~sheraf.queryset.QuerySet` is ordered, the pages
+        follow the primary key order, and the primary index keys are read
+        from the cursor. If the :class:`~sheraf.queryset.QuerySet` is only
+        ordered by an indexed attribute, the cursor holds the index key of the
+        last model, so the next page can be read even if this model has been
+        deleted meanwhile. The models which attribute value is `None` come
+        after the indexed models. Else, the whole
+        :class:`~sheraf.queryset.QuerySet` is iterated until the cursor.
+        A model identifier can also be passed instead of a cursor.
+
+        Filters are checked on the models as they are read, so a page of a
+        :class:`~sheraf.queryset.QuerySet` with selective filters may read
+        many models. The :class:`~sheraf.queryset.QuerySet` is not consumed.
+        """
+        return self._page(identifier, limit, backward=False)
+
+    def before(self, identifier, limit):
+        """
+        Like :func:`~sheraf.queryset.QuerySet.after`, but returns the models
+        preceding the model with the given identifier. The page models are in
+        the :class:`~sheraf.queryset.QuerySet` order, and the returned cursor
+        can be passed to :func:`~sheraf.queryset.QuerySet.before` to get the
+        previous page.
+
+        :param identifier: The cursor returned with the next page, or `None`
+            to get the last page.
+        :param limit: The maximum number of models in the page.
+        :return: A tuple containing a :class:`~sheraf.queryset.CachedQuerySet`
+            of the page models, and the cursor of the previous page.
+
+        >>> with sheraf.connection():
+        ...     peter = Cowboy.create(name="Peter")
+        ...     steven = Cowboy.create(name="Steven")
+        ...     george = Cowboy.create(name="George")
+        ...
+        ...     page, cursor = Cowboy.all().before(None, 2)
+        ...     assert [steven, george] == page
+        ...     page, cursor = Cowboy.all().before(cursor, 2)
+        ...     assert [peter] == page
+        ...     assert cursor is None
+        """
+        return self._page(identifier, limit, backward=True)
+
+    def _page(self, identifier, limit, backward):
+        if limit < 1:
+            raise ValueError("limit must be a positive integer")
+
+        # One more model is read to know if there is a next page.
+        models, make_cursor = self.copy()._scan(identifier, backward)
+        models = list(itertools.islice(models, limit + 1))
+        cursor = make_cursor(models[limit - 1]) if len(models) > limit else None
+        models = models[:limit]
+        if backward:
+            models.reverse()
+
+        if self.model:
+            page = CachedQuerySet(
+                model_class=self.model, identifiers=[m.identifier for m in models]
+            )
+        else:
+            page = CachedQuerySet(models=models)
+
+        return page, cursor
+
+    def _scan(self, identifier, backward):
+        """
+        :return: A tuple containing a generator over the models following, or
+            preceding if ``backward`` is `True`, the given cursor, and a
+            function returning the cursor of a model.
+        """
+        if self.model and self._iterable is None:
+            primary_key = self.model.primary_key()
+            if not self.orders or list(self.orders) == [primary_key]:
+                descending = self.orders.get(primary_key) == sheraf.constants.DESC
+                return (
+                    self._primary_scan(identifier, descending != backward),
+                    operator.attrgetter("identifier"),
+                )
+
+            if len(self.orders) == 1:
+                ((attribute, order),) = self.orders.items()
+                index = self._order_index(attribute)
+                if index:
+                    return (
+                        self._index_scan(
+                            index, identifier, order == sheraf.constants.DESC, backward
+                        ),
+                        functools.partial(self._index_cursor, index),
+                    )
+
+        models = iter(self)
+        if backward:
+            models = reversed(list(models))
+
+        if identifier is not None:
+            models = itertools.dropwhile(
+                lambda model: model.identifier != identifier, models
+            )
+            next(models, None)
+
+        return models, operator.attrgetter("identifier")
+
+    def _primary_keys(self, identifier, reverse):
+        index = self.model.indexes()[self.model.primary_key()]
+        if identifier is None:
+            return index.iterkeys(reverse)
+        if reverse:
+            return index.iterkeys(True, max=identifier, excludemax=True)
+        return index.iterkeys(False, min=identifier, excludemin=True)
+
+    def _primary_scan(self, identifier, reverse):
+        models = self.model.read_these(self._primary_keys(identifier, reverse))
+        return (model for model in models if self._is_accepted(model))
+
+    def _index_cursor(self, index, model):
+        """
+        :return: The cursor of a model in a scan over an index. It is a tuple
+            containing the model index key and the OID of its mapping, as the
+            models sharing a same key are in the posting order. The models
+            missing from the index have a `None` key and their identifier.
+        """
+        key = index.details.attribute.read(model)
+        if key is None and not index.details.noneok:
+            return None, model.identifier
+        return key, _oid(model.mapping)
+
+    def _index_scan(self, index, cursor, descending, backward):
+        # Like in _init_index_ordered_iterator, the models sharing a same
+        # index key are in the posting order, whatever the keys order, and
+        # the models missing from the index come last, in the primary order.
+        # The index key is read from the cursor, so the scan can go on even if
+        # the cursor model has been deleted.
+        if cursor is not None and not isinstance(cursor, (tuple, list)):
+            cursor = self._index_cursor(index, self.model.read(cursor))
+
+        reverse = descending != backward
+        unindexed_cursor = (
+            cursor is not None and cursor[0] is None and not index.details.noneok
+        )
+        if cursor is None or unindexed_cursor:
+            keys = index.iterkeys(reverse)
+            first_mappings = []
+        else:
+            key, oid = cursor
+            if reverse:
+                keys = index.iterkeys(True, max=key, excludemax=True)
+            else:
+                keys = index.iterkeys(False, min=key, excludemin=True)
+            first_mappings = itertools.chain.from_iterable(
+                self._posting_mappings(posting, backward, oid)
+                for posting in index.get_postings([key])
+            )
+
+        mappings = itertools.chain(
+            first_mappings,
+            (
+                mapping
+                for key in keys
+                for posting in index.get_postings([key])
+                for mapping in self._posting_mappings(posting, backward)
+            ),
+        )
+        indexed_models = (self.model._decorate(mapping) for mapping in mappings)
+
+        if index.details.noneok:
+            models = indexed_models
+        elif not backward and unindexed_cursor:
+            models = self._unindexed_models(index, cursor[1])
+        elif not backward:
+            models = itertools.chain(indexed_models, self._unindexed_models(index))
+        elif unindexed_cursor:
+            models = itertools.chain(
+                self._unindexed_models(index, cursor[1], reverse=True),
+                indexed_models,
+            )
+        elif cursor is None:
+            models = itertools.chain(
+                self._unindexed_models(index, reverse=True), indexed_models
+            )
+        else:
+            models = indexed_models
+
+        return (model for model in models if self._is_accepted(model))
+
+    @staticmethod
+    def _posting_mappings(posting, backward, oid=None):
+        """
+        :return: The mappings of a posting, in reverse order if ``backward``
+            is `True`. If ``oid`` is set, only the mappings following the
+            mapping with this OID are returned.
+        """
+        if isinstance(posting, sheraf.types.LargeSet):
+            # The BTrees exclude the first or last key if the bound is None.
+            exclude = oid is not None
+            if backward:
+                return reversed(posting.tree.values(max=oid, excludemax=exclude))
+            return iter(posting.tree.values(min=oid, excludemin=exclude))
+
+        mappings = list(posting)
+        if backward:
+            mappings.reverse()
+        if oid is not None:
+            oids = [_oid(mapping) for mapping in mappings]
+            mappings = mappings[oids.index(oid) + 1 :] if oid in oids else []
+        return iter(mappings)
+
+    def _index_count(self):
+        if not self.filters:
+            return self.model.count()
+
+        indexed_filters = self._indexed_filters()
+        if self._unindexed_filters(indexed_filters):
+            return None
+
+        if len(indexed_filters) == 1 and not isinstance(indexed_filters[0][1], Range):
+            filter_name, filter_value, filter_transformation = indexed_filters[0]
+            index = self.model.indexes()[filter_name]
+            keys = (
+                list(index.details.search_func(filter_value))
+                if filter_transformation
+                else [filter_value]
+            )
+            # A model can be indexed under several keys of a same index.
+            if len(keys) == 1:
+                return sum(len(posting) for posting in index.get_postings(keys))
+
+        return self._indexed_count(indexed_filters)
 
+    def __getitem__(self, item):
         if isinstance(item, slice):
             start, stop, step = item.start, item.stop, item.step
         else:
             start, stop, step = item, item + 1, 1
 
-        if self.model:
+        # The QuerySet size is only needed to resolve negative indexes.
+        if (start is None or start >= 0) and (stop is None or stop >= 0):
+            maxid = None
+        elif self.model:
             maxid = self.model.count()
         elif isinstance(self._iterable, Sized):
             maxid = len(self._iterable)
-        elif (start is None or start >= 0) and (stop is None or stop >= 0):
-            maxid = None
         else:
             raise ValueError(
                 "When a QuerySet contains an unknown sized object, slicing values must be > 0"
@@ -205,45 +1122,337 @@ class QuerySet(object):
             else:
                 start, stop, step = item % maxid, (item % maxid) + 1, 1
 
+        # Only the first `stop` models need to be sorted.
+        self._init_iterator(limit=stop)
+
         # TODO: Avoid to recreate a QuerySet and avoid itertools.islice
-        return QuerySet(itertools.islice(self._iterator, start, stop, step))
+        return QuerySet(itertools.islice(self, start, stop, step))
 
-    def _init_indexed_iterator(self, filter_name, filter_value, filter_transformation):
+    def _filter_postings(self, filter_name, filter_value, filter_transformation):
         index = self.model.indexes()[filter_name]
+        if isinstance(filter_value, Prefix) and filter_transformation:
+            return itertools.chain.from_iterable(
+                index.get_range_postings(*Prefix(prefix).bounds())
+                for prefix in index.details.search_func(filter_value.prefix)
+            )
+
+        if isinstance(filter_value, Range):
+            return index.get_range_postings(*filter_value.bounds())
+
         index_values = (
             index.details.search_func(filter_value)
             if filter_transformation
             else [filter_value]
         )
+        return index.get_postings(index_values)
 
-        self._iterator = self.model.read_these_valid(**{filter_name: index_values})
+    def _init_indexed_iterator(self, indexed_filters):
+        self._iterator = (
+            self.model._decorate(mapping)
+            for mapping in self._indexed_mappings(indexed_filters)
+        )
+        self._exclude_predicate_filters(indexed_filters)
 
-        if not index.details.unique:
-            self._iterator = unique_everseen(self._iterator, lambda m: m.identifier)
+    def _indexed_mappings(self, indexed_filters):
+        """
+        Resolves the indexed filters by intersecting their posting lists
+        before any model is decoded.
+
+        The posting lists are ordered by cardinality. For the larger ones,
+        only the OIDs of the mappings are read, and they are intersected with
+        BTrees set operations, so the mappings are neither loaded from the
+        storage nor compared in Python. Only the smallest posting list is
+        iterated lazily, and its mappings are yielded if their OID is in
+        the intersection.
+        """
+        postings = [
+            self._filter_postings(*indexed_filter) for indexed_filter in indexed_filters
+        ]
+        if len(postings) > 1:
+            postings = sorted(
+                (list(filter_postings) for filter_postings in postings),
+                key=lambda filter_postings: sum(
+                    len(posting) for posting in filter_postings
+                ),
+            )
 
-    def _init_default_iterator(self, reverse=False):
-        if not self.model:
-            self._iterator = iter(self._iterable)
-            return
+        expected = None
+        for filter_postings in postings[1:]:
+            oids = self._postings_oids(filter_postings)
+            expected = oids if expected is None else expected.intersection(oids)
+            if not expected:
+                break
+
+        candidates = itertools.chain.from_iterable(postings[0])
+        # A model indexed under several keys appears in several posting lists.
+        if not isinstance(postings[0], list) or len(postings[0]) > 1:
+            candidates = unique_everseen(candidates, _database_oid)
+
+        if expected is not None:
+            candidates = (
+                mapping for mapping in candidates if _database_oid(mapping) in expected
+            )
+
+        return candidates
+
+    def _indexed_count(self, indexed_filters):
+        return len(self._indexed_oids(indexed_filters))
+
+    def _indexed_oids(self, indexed_filters):
+        oids = None
+        for indexed_filter in indexed_filters:
+            filter_oids = self._postings_oids(self._filter_postings(*indexed_filter))
+            oids = filter_oids if oids is None else oids.intersection(filter_oids)
+            if not oids:
+                break
+
+        return oids
+
+    @staticmethod
+    def _postings_oids(filter_postings):
+        """
+        :return: The :class:`_OIDSets` of the mappings of the posting lists.
+            The OIDs of a :class:`~sheraf.types.LargeSet` are the keys of its
+            tree, so its mappings are not loaded.
+        """
+        trees, oids = {}, {}
+        for posting in filter_postings:
+            if not isinstance(posting, sheraf.types.LargeSet):
+                for mapping in posting:
+                    database_name, oid = _database_oid(mapping)
+                    oids.setdefault(database_name, []).append(oid)
+
+            elif posting:
+                # A posting created in the current transaction is not bound
+                # to a connection yet, but its mappings are.
+                owner = posting if posting._p_jar else next(iter(posting))
+                trees.setdefault(_database_name(owner), []).append(posting.tree)
+
+        for database_name, database_oids in oids.items():
+            trees.setdefault(database_name, []).append(
+                BTrees.LOBTree.LOSet(database_oids)
+            )
+
+        return _OIDSets(
+            {
+                database_name: BTrees.LOBTree.multiunion(database_trees)
+                for database_name, database_trees in trees.items()
+            }
+        )
 
-        indexed_filters = (
+    def _exclude_predicate_filters(self, indexed_filters):
+        self._predicate_filters = self._unindexed_filters(indexed_filters)
+        self._compiled_filters = {}
+
+    def _unindexed_filters(self, indexed_filters):
+        compound_filter, compound_filtered = self._compound_filter()
+        if compound_filter not in indexed_filters:
+            compound_filtered = []
+
+        return [
+            _filter
+            for _filter in self.filters.values()
+            if _filter not in indexed_filters and _filter not in compound_filtered
+        ]
+
+    def _indexed_filters(self):
+        indexes = self.model.indexes()
+        compound_filter, compound_filtered = self._compound_filter()
+        indexed_filters = [
             (name, value, transformation)
             for (name, value, transformation) in self.filters.values()
-            if name in self.model.indexes()
-        )
+            if name in indexes
+            and (name, value, transformation) not in compound_filtered
+            and indexes[name].details.implied_by(self.filters)
+            and not indexes[name].building()
+        ]
+        if compound_filter:
+            indexed_filters.append(compound_filter)
+        return indexed_filters
+
+    def _compound_filter(self):
+        """
+        Looks for the compound index resolving the most attribute filters.
+        Those are equality filters on the first attributes of the index, that
+        may be followed by a :class:`~sheraf.queryset.Range` filter on the
+        next attribute.
+
+        :return: A filter on the compound index keys, and the list of the
+                 attribute filters it resolves. The filter is `None` if no
+                 compound index is worth using.
+        """
+        indexes = self.model.indexes()
+        best_filter, best_filtered = None, []
+        for index in indexes.values():
+            if not isinstance(
+                index.details, sheraf.attributes.indexdetails.Index
+            ) or not index.details.implied_by(self.filters):
+                continue
+
+            prefix, value, filtered = (), None, []
+            for name in index.details.attribute_names:
+                _filter = self.filters.get(name)
+                if not _filter or _filter[1] is None or _filter[2]:
+                    break
+
+                filtered.append(_filter)
+                if isinstance(_filter[1], Range):
+                    value = _filter[1]
+                    break
+                prefix += (_filter[1],)
+
+            if len(filtered) <= len(best_filtered) or index.building():
+                continue
+
+            # A single attribute filter is better resolved by the attribute
+            # own index, if there is one.
+            if len(filtered) == 1 and filtered[0][0] in indexes:
+                continue
+
+            if value is None and len(prefix) == len(index.details.attribute_names):
+                best_filter = (index.details.key, prefix, False)
+            else:
+                best_filter = (index.details.key, _compound_range(prefix, value), False)
+            best_filtered = filtered
+
+        return best_filter, best_filtered
+
+    def _order_index(self, attribute_name):
+        attribute = self.model.attributes[attribute_name]
+        for index in self.model.indexes().values():
+            if (
+                index.details.attribute is attribute
+                and index.details.orderable
+                and index.details.implied_by(self.filters)
+                and index.table_initialized()
+                and not index.building()
+            ):
+                return index
+        return None
+
+    def _init_default_iterator(self, reverse=False):
+        if not self.model or self._iterable is not None:
+            self._iterator = iter(self._iterable)
+            return
 
-        for name, value, transformation in indexed_filters:
-            self._init_indexed_iterator(name, value, transformation)
+        indexed_filters = self._indexed_filters()
+        if indexed_filters:
+            self._init_indexed_iterator(indexed_filters)
 
             if self._iterator:
                 return
 
-        if not self._iterator:
-            identifier_index = self.model.indexes()[self.model.primary_key()]
-            keys = identifier_index.iterkeys(reverse)
-            self._iterator = self.model.read_these(keys)
+        identifier_index = self.model.indexes()[self.model.primary_key()]
+        keys = identifier_index.iterkeys(reverse)
+        self._iterator = self.model.read_these(keys)
+
+    def _init_index_ordered_iterator(self, index, keys_range=None):
+        """
+        Walks the keys of the index of the most important order attribute,
+        so models are decoded lazily, in the right order. The models sharing
+        the same index key are in the posting order, that is their creation
+        order. The less important orders are only applied on those models.
+        If `keys_range` is set, only the keys in this range are walked.
+        Else the models that are missing from the index because their
+        attribute value is `None` come after the indexed models.
+        """
+        (_, order), *other_orders = self.orders.items()
+        bounds = keys_range.bounds() if keys_range else ()
+        keys = index.iterkeys(order == sheraf.constants.DESC, *bounds)
+
+        if other_orders:
+            models = itertools.chain.from_iterable(
+                self._sorted(
+                    [
+                        self.model._decorate(mapping)
+                        for posting in index.get_postings([key])
+                        for mapping in posting
+                    ],
+                    other_orders,
+                )
+                for key in keys
+            )
+        else:
+            models = (
+                self.model._decorate(mapping)
+                for key in keys
+                for posting in index.get_postings([key])
+                for mapping in posting
+            )
+
+        if keys_range is None and not index.details.noneok:
+            models = itertools.chain(models, self._unindexed_models(index))
+
+        self._iterator = models
+
+    def _unindexed_models(self, index, identifier=None, reverse=False):
+        """
+        :return: A generator over the models which attribute value is `None`,
+            and that are thus missing from an index on this attribute. The
+            models are in the primary order, or in the reverse order if
+            ``reverse`` is `True`, and follow the model with the given
+            identifier. The primary table is only read when the index cannot
+            tell that every model is indexed.
+        """
+        if index.details.unique and index.count() == self.model.count():
+            return
+
+        read = _mapping_reader(self.model, index.details.attribute)
+        primary_index = self.model.indexes()[self.model.primary_key()]
+        for key in self._primary_keys(identifier, reverse):
+            for posting in primary_index.get_postings([key]):
+                for mapping in posting:
+                    if read(mapping) is None:
+                        yield self.model._decorate(mapping)
+
+    @staticmethod
+    def _sorted(models, orders):
+        # We successively sort the list from the less important
+        # order to the most important order.
+        for attribute, order in reversed(orders):
+            models = sorted(
+                models,
+                key=_order_key(attribute, order),
+                reverse=(order == sheraf.constants.DESC),
+            )
+        return models
+
+    @staticmethod
+    def _smallest(limit, models, orders):
+        """
+        Returns the `limit` first models of the sorted collection, keeping only
+        `limit` models in memory. Like :func:`sorted`, :func:`heapq.nsmallest`
+        and :func:`heapq.nlargest` are stable.
+        """
+        if len(orders) == 1:
+            attribute, order = orders[0]
+            select = (
+                heapq.nlargest if order == sheraf.constants.DESC else heapq.nsmallest
+            )
+            return select(limit, models, key=_order_key(attribute, order))
+
+        descending = [order == sheraf.constants.DESC for _, order in orders]
+
+        def compare(values, other_values):
+            for value, other_value, reverse in zip(values, other_values, descending):
+                if value == other_value:
+                    continue
+                # None values come last, whatever the order.
+                if value is None or other_value is None:
+                    return 1 if value is None else -1
+                return (-1 if value < other_value else 1) * (-1 if reverse else 1)
+            return 0
+
+        values_key = functools.cmp_to_key(compare)
+        return heapq.nsmallest(
+            limit,
+            models,
+            key=lambda model: values_key(
+                tuple(getattr(model, attribute) for attribute, _ in orders)
+            ),
+        )
 
-    def _init_iterator(self):
+    def _init_iterator(self, limit=None):
         # The default sort order is by ascending identifier
         if not self.orders:
             self._init_default_iterator()
@@ -253,6 +1462,7 @@ class QuerySet(object):
         # we can use iterators instead of sorting the whole collection.
         if (
             self.model
+            and self._iterable is None
             and len(self.orders) == 1
             and self.model.primary_key() in self.orders
         ):
@@ -261,21 +1471,45 @@ class QuerySet(object):
             )
             return
 
+        # If the most important order is over an indexed attribute, and the
+        # only indexed filter is a range over this same index, or there is
+        # no indexed filter at all, we can iterate over the index.
+        if self.model and self._iterable is None:
+            order_index = self._order_index(next(iter(self.orders)))
+            indexed_filters = self._indexed_filters()
+            if order_index and not indexed_filters:
+                self._init_index_ordered_iterator(order_index)
+                return
+
+            if (
+                order_index
+                and len(indexed_filters) == 1
+                and indexed_filters[0][0] == order_index.details.key
+                and isinstance(indexed_filters[0][1], Range)
+                and not (
+                    isinstance(indexed_filters[0][1], Prefix) and indexed_filters[0][2]
+                )
+            ):
+                self._init_index_ordered_iterator(order_index, indexed_filters[0][1])
+                self._exclude_predicate_filters(indexed_filters)
+                return
+
         # Else we need to sort the collection.
-        # So we successively sort the list from the less important
-        # order to the most important order.
         if self._iterable is None:
-            keys = self.model.indexes()[self.model.primary_key()].iterkeys()
-            self._iterable = self.model.read_these(keys)
+            self._init_default_iterator()
+            models = self._iterator
+        else:
+            models = self._iterable
 
-        for attribute, order in reversed(self.orders.items()):
-            self._iterable = sorted(
-                self._iterable,
-                key=operator.attrgetter(attribute),
-                reverse=(order == sheraf.constants.DESC),
-            )
+        if limit is None:
+            self._iterator = iter(self._sorted(models, list(self.orders.items())))
+            return
 
-        self._iterator = iter(self._iterable)
+        # When only the first models are needed, the filters are applied before
+        # the models are sorted, so only `limit` models are kept in memory.
+        models = (model for model in models if self._is_accepted(model))
+        self._iterator = iter(self._smallest(limit, models, list(self.orders.items())))
+        self._iterator_accepted = True
 
     def copy(self):
         """Copies the :class:`~sheraf.queryset.QuerySet` without consuming it.
@@ -300,14 +1534,299 @@ class QuerySet(object):
         qs._predicate = self._predicate
         return qs
 
+    def cache(self):
+        """Resolves the :class:`~sheraf.queryset.QuerySet` once, and returns
+        a :class:`~sheraf.queryset.CachedQuerySet` that can be iterated,
+        counted and sliced several times. This consumes the current
+        :class:`~sheraf.queryset.QuerySet`.
+
+        >>> with sheraf.connection():
+        ...     peter = Cowboy.create(name="Peter")
+        ...     steven = Cowboy.create(name="Steven")
+        ...     george = Cowboy.create(name="George")
+        ...     qs = Cowboy.all().cache()
+        ...
+        ...     assert 3 == qs.count() == len(qs)
+        ...     assert [peter, steven, george] == qs
+        ...     assert [peter, steven, george] == qs
+        ...     assert [steven] == qs[1]
+        """
+        if self.model:
+            return CachedQuerySet(
+                model_class=self.model, identifiers=[m.identifier for m in self]
+            )
+
+        return CachedQuerySet(models=list(self))
+
+    def aggregate(self, **aggregations):
+        """
+        Computes :class:`~sheraf.queryset.Aggregation` over the models of the
+        :class:`~sheraf.queryset.QuerySet`, and consumes it.
+
+        :param aggregations: The aggregations to compute, by name.
+        :return: A dict of the aggregation results by name.
+
+        >>> with sheraf.connection():
+        ...     peter = Cowboy.create(name="Peter", age=30)
+        ...     steven = Cowboy.create(name="Steven", age=40)
+        ...     george = Cowboy.create(name="George", age=50)
+        ...     Cowboy.all().aggregate(
+        ...         total=sheraf.Sum("age"),
+        ...         oldest=sheraf.Max("age"),
+        ...         average=sheraf.Avg("age"),
+        ...         count=sheraf.Count(),
+        ...     )
+        {'total': 120, 'oldest': 50, 'average': 40.0, 'count': 3}
+
+        The attribute values are read in the model mappings, and no model
+        instance is built when the filters are all indexed.
+        """
+        results = self._aggregate(aggregations)
+        if None in results:
+            return results[None]
+
+        return {
+            name: aggregation.finish(aggregation.start())
+            for name, aggregation in aggregations.items()
+        }
+
+    def group_by(self, attribute):
+        """
+        Groups the models of the :class:`~sheraf.queryset.QuerySet` by the
+        values of an attribute.
+
+        :param attribute: The name of the attribute.
+        :return: A :class:`~sheraf.queryset.GroupBy` object.
+
+        >>> with sheraf.connection():
+        ...     peter = Cowboy.create(name="Peter", age=30)
+        ...     steven = Cowboy.create(name="Steven", age=30)
+        ...     george = Cowboy.create(name="George", age=50)
+        ...     Cowboy.all().group_by("age").count()
+        {30: 2, 50: 1}
+        """
+        if self.model and attribute not in self.model.attributes:
+            raise InvalidFilterException(
+                "{} has no attribute {}".format(self.model.__name__, attribute)
+            )
+        return GroupBy(self, attribute)
+
+    def _aggregate(self, aggregations, group_attribute=None):
+        """
+        :param aggregations: A dict of aggregations by name.
+        :param group_attribute: The name of the attribute grouping the models.
+        :return: A dict of the aggregation results by name, for each value of
+            ``group_attribute``. Without ``group_attribute``, the only group
+            key is `None`.
+        """
+        attributes = [
+            aggregation.attribute
+            for aggregation in aggregations.values()
+            if aggregation.attribute
+        ]
+        if group_attribute:
+            attributes.append(group_attribute)
+
+        rows, readers = self._rows(list(dict.fromkeys(attributes)))
+        readers = dict(readers)
+        read_key = readers[group_attribute] if group_attribute else lambda row: None
+        steps = [
+            (name, aggregation, readers.get(aggregation.attribute))
+            for name, aggregation in aggregations.items()
+        ]
+
+        groups = {}
+        for row in rows:
+            key = read_key(row)
+            try:
+                states = groups[key]
+            except KeyError:
+                states = groups[key] = {
+                    name: aggregation.start() for name, aggregation, _ in steps
+                }
+
+            for name, aggregation, read in steps:
+                value = read(row) if read else row
+                if value is not None:
+                    states[name] = aggregation.step(states[name], value)
+
+        return {
+            key: {
+                name: aggregation.finish(states[name]) for name, aggregation, _ in steps
+            }
+            for key, states in groups.items()
+        }
+
+    def values(self, *attributes):
+        """
+        Reads attribute values without building model instances, and
+        consumes the :class:`~sheraf.queryset.QuerySet`.
+
+        :param attributes: The names of the attributes to read. By default,
+            every model attribute is read.
+        :return: A generator over a dict of the attribute values for each
+            model.
+
+        >>> with sheraf.connection():
+        ...     peter = Cowboy.create(name="Peter", age=30)
+        ...     george = Cowboy.create(name="George", age=50)
+        ...     list(Cowboy.all().values("name", "age"))
+        [{'name': 'Peter', 'age': 30}, {'name': 'George', 'age': 50}]
+
+        The values are read in the model mappings, with the
+        :func:`~sheraf.attributes.base.BaseAttribute.deserialize` method of
+        each attribute.
+        """
+        rows, readers = self._rows(attributes or self._attribute_names())
+        return ({name: read(row) for name, read in readers} for row in rows)
+
+    def values_list(self, *attributes, flat=False):
+        """
+        Like :func:`~sheraf.queryset.QuerySet.values`, but yields tuples.
+
+        :param attributes: The names of the attributes to read.
+        :param flat: If `True`, only one attribute can be given, and its
+            values are yielded instead of tuples.
+        :return: A generator over a tuple of the attribute values for each
+            model.
+
+        >>> with sheraf.connection():
+        ...     peter = Cowboy.create(name="Peter", age=30)
+        ...     george = Cowboy.create(name="George", age=50)
+        ...     assert [("Peter", 30), ("George", 50)] == list(
+        ...         Cowboy.all().values_list("name", "age")
+        ...     )
+        ...     assert ["Peter", "George"] == list(
+        ...         Cowboy.all().values_list("name", flat=True)
+        ...     )
+        """
+        if flat and len(attributes) != 1:
+            raise TypeError("values_list() with flat=True takes only one attribute")
+
+        rows, readers = self._rows(attributes or self._attribute_names())
+        if flat:
+            ((_, read),) = readers
+            return (read(row) for row in rows)
+
+        readers = [read for _, read in readers]
+        return (tuple(read(row) for read in readers) for row in rows)
+
+    def _attribute_names(self):
+        return list(self.model.attributes) if self.model else []
+
+    def _rows(self, attributes):
+        """
+        :param attributes: The names of the attributes to read.
+        :return: An iterable over the model mappings, or over the models if
+            the :class:`~sheraf.queryset.QuerySet` has no model class, and a
+            list of the attribute names and readers for those items.
+        """
+        if not self.model:
+            return self, [(name, operator.attrgetter(name)) for name in attributes]
+
+        for name in attributes:
+            if name not in self.model.attributes:
+                raise InvalidFilterException(
+                    "{} has no attribute {}".format(self.model.__name__, name)
+                )
+
+        readers = [
+            (name, _mapping_reader(self.model, self.model.attributes[name]))
+            for name in attributes
+        ]
+        return self._mappings(), readers
+
+    def _mappings(self):
+        """
+        :return: An iterable over the mappings of the models, in the
+            :class:`~sheraf.queryset.QuerySet` order. When there is no filter
+            or only indexed filters, no model instance is built.
+        """
+        if (
+            self._iterable is None
+            and not self._iterator
+            and not self._predicate
+            and not self.orders
+        ):
+            if not self.filters:
+                primary_index = self.model.indexes()[self.model.primary_key()]
+                self._iterator = iter([])
+                return itertools.chain.from_iterable(primary_index.get_range_postings())
+
+            indexed_filters = self._index_only_filters()
+            if indexed_filters:
+                self._iterator = iter([])
+                return self._indexed_mappings(indexed_filters)
+
+        return (model.mapping for model in self)
+
     def delete(self):
         """Delete the objects contained in the queryset.
 
-        Avoids problems when itering on deleted objects.
+        Avoids problems when itering on deleted objects. The models are
+        deleted with :func:`~sheraf.models.indexation.BaseIndexedModel.bulk_delete`,
+        unless their model class overrides
+        :func:`~sheraf.models.indexation.BaseIndexedModel.delete`.
+
+        :return: The number of deleted models.
+
+        >>> with sheraf.connection():
+        ...     peter = Cowboy.create(name="Peter", age=30)
+        ...     steven = Cowboy.create(name="Steven", age=30)
+        ...     george = Cowboy.create(name="George", age=50)
+        ...     Cowboy.filter(age=30).delete()
+        ...     assert [george] == Cowboy.all()
+        2
+        """
+        models = {}
+        for model in self:
+            models.setdefault(model.__class__, []).append(model)
+
+        count = 0
+        for klass, instances in models.items():
+            if klass.delete is not sheraf.models.indexation.BaseIndexedModel.delete:
+                for instance in instances:
+                    instance.delete()
+                count += len(instances)
+            else:
+                count += klass.bulk_delete(instances)
+
+        return count
+
+    def update(self, batch_size=1000, progress=None, **kwargs):
+        """Set the same attribute values on every model of the queryset.
+
+        The models are collected before anything is modified, then updated
+        with :func:`~sheraf.models.indexation.BaseIndexedModel.bulk_update`.
+
+        :param batch_size: The number of models updated together.
+        :param progress: An optional callable, called after each batch with
+                         the number of models updated so far.
+        :param kwargs: The attribute values to set.
+        :return: The number of updated models.
+
+        >>> with sheraf.connection():
+        ...     peter = Cowboy.create(name="Peter", age=30)
+        ...     steven = Cowboy.create(name="Steven", age=30)
+        ...     Cowboy.filter(age=30).update(age=31)
+        ...     assert [peter, steven] == Cowboy.filter(age=31)
+        2
         """
-        identifiers = [(m.__class__, m.identifier) for m in self]
-        for klass, identifier in identifiers:
-            klass.read(identifier).delete()
+        models = {}
+        for model in self:
+            models.setdefault(model.__class__, []).append(model)
+
+        count = 0
+        for klass, instances in models.items():
+            count += klass.bulk_update(
+                instances,
+                kwargs,
+                batch_size=batch_size,
+                progress=progress
+                and (lambda updated, done=count: progress(done + updated)),
+            )
+
+        return count
 
     def filter(self, predicate=None, **kwargs):
         """Refine a copy of the current :class:`~sheraf.queryset.QuerySet` with
@@ -336,6 +1855,20 @@ class QuerySet(object):
         ...    assert Cowboy.filter(lambda person: "Abitbol" in person.name, age=50) == \\
         ...           Cowboy.filter(lambda person: "Abitbol" in person.name).filter(age=50)
 
+        Attributes can be filtered on ranges of values, either by passing a
+        :class:`~sheraf.queryset.Range` or by suffixing the attribute name with
+        ``__gt``, ``__gte``, ``__lt`` or ``__lte``. On indexed attributes,
+        only the index keys within the range are read.
+
+        >>> with sheraf.connection():
+        ...    peter = Cowboy.create(name="Peter", age=30)
+        ...    steven = Cowboy.create(name="Steven", age=30)
+        ...    george = Cowboy.create(name="George Abitbol", age=50)
+        ...
+        ...    assert [peter, steven] == Cowboy.filter(age__gte=18, age__lt=50)
+        ...    assert [peter, steven] == Cowboy.filter(age__gte=18).filter(age__lt=50)
+        ...    assert [george] == Cowboy.filter(age=Range(40, 60))
+
         An attribute cannot be filtered twice:
 
         >>> with sheraf.connection():
@@ -376,35 +1909,65 @@ class QuerySet(object):
         ...
         ...     assert [m] == MyCustomModel.search(my_attribute="FOO")
         ...     assert [] == MyCustomModel.filter(my_attribute="FOO")
+
+        Prefixes passed with the ``__startswith`` suffix go through the same
+        transformation, so it can be used for autocompletion. The index keys
+        are lazily read, so slicing the result stops the index scan early.
+
+        >>> with sheraf.connection():
+        ...     assert [m] == MyCustomModel.search(my_attribute__startswith="FO")[:10]
+        ...     assert [] == MyCustomModel.filter(my_attribute__startswith="FO")
         """
 
         return self._filter(True, **kwargs)
 
     def _filter(self, transformation, predicate=None, **kwargs):
         qs = self.copy()
-        if self.model:
-            for filter_name in kwargs.keys():
-                if (
-                    filter_name not in self.model.attributes
-                    and filter_name not in self.model.indexes()
-                ):
-                    raise sheraf.exceptions.InvalidFilterException(
-                        "{} has no attribute {}".format(
-                            self.model.__name__, filter_name
-                        )
+        kwargs_values = OrderedDict()
+        for filter_key, filter_value in kwargs.items():
+            filter_name, lookup = self._parse_lookup(filter_key)
+            if (
+                self.model
+                and filter_name not in self.model.attributes
+                and filter_name not in self.model.indexes()
+            ):
+                raise sheraf.exceptions.InvalidFilterException(
+                    "{} has no attribute {}".format(self.model.__name__, filter_name)
+                )
+
+            if lookup == "startswith" and not isinstance(filter_value, str):
+                raise TypeError(
+                    "{}__startswith expects a string, got {!r}".format(
+                        filter_name, filter_value
                     )
-        kwargs_values = OrderedDict(
-            {
-                filter_name: (filter_name, filter_value, transformation)
-                for filter_name, filter_value in kwargs.items()
-            }
-        )
-        common_attributes = set(qs.filters) & set(kwargs_values)
-        invalid_common_attributes = any(
-            key for key in common_attributes if qs.filters[key] != kwargs_values[key]
-        )
-        if invalid_common_attributes:
-            raise InvalidFilterException("Some filter parameters appeared twice")
+                )
+
+            if lookup:
+                filter_value = RANGE_LOOKUPS[lookup](filter_value)
+
+            if filter_name in kwargs_values:
+                filter_value = self._merge_filter_values(
+                    kwargs_values[filter_name][1], filter_value
+                )
+
+            kwargs_values[filter_name] = (filter_name, filter_value, transformation)
+
+        for filter_name, (_, filter_value, _) in kwargs_values.items():
+            if filter_name not in qs.filters or qs.filters[filter_name] == (
+                filter_name,
+                filter_value,
+                transformation,
+            ):
+                continue
+
+            if qs.filters[filter_name][2] != transformation:
+                raise InvalidFilterException("Some filter parameters appeared twice")
+
+            kwargs_values[filter_name] = (
+                filter_name,
+                self._merge_filter_values(qs.filters[filter_name][1], filter_value),
+                transformation,
+            )
 
         qs.filters.update(kwargs_values)
 
@@ -417,6 +1980,29 @@ class QuerySet(object):
 
         return qs
 
+    def _parse_lookup(self, filter_key):
+        if self.model and (
+            filter_key in self.model.attributes or filter_key in self.model.indexes()
+        ):
+            return filter_key, None
+
+        filter_name, _, lookup = filter_key.rpartition("__")
+        if filter_name and lookup in RANGE_LOOKUPS:
+            return filter_name, lookup
+
+        return filter_key, None
+
+    @staticmethod
+    def _merge_filter_values(value, other):
+        merged = (
+            value.merge(other)
+            if isinstance(value, Range) and isinstance(other, Range)
+            else None
+        )
+        if merged is None:
+            raise InvalidFilterException("Some filter parameters appeared twice")
+        return merged
+
     def order(self, *args, **kwargs):
         """Copies the current :class:`~sheraf.queryset.QuerySet` and adds more
         order to it.
@@ -470,6 +2056,14 @@ class QuerySet(object):
             :func:`~sheraf.attributes.base.BaseAttribute.index`.
             The less :func:`~sheraf.queryset.QuerySet.order` parameters are
             passed, the better performances will be.
+            When the most important order is over an attribute indexed on
+            its raw values, the models are lazily read by walking the index
+            keys. The models sharing a same value come in the order of
+            their index entries, that is their creation order, instead of
+            the primary key order. The models which attribute value is
+            `None`, and that are thus missing from the index, come after the
+            ordered models, in the primary key order. When the models are
+            sorted instead, the `None` values come last as well.
         """
         if not self.model and (args or not kwargs):
             raise InvalidOrderException(
@@ -559,3 +2153,186 @@ class QuerySet(object):
             raise sheraf.exceptions.QuerySetUnpackException(
                 "Trying to unpack more than 1 value from a QuerySet"
             )
+
+
+class CachedQuerySet(QuerySet):
+    """
+    A :class:`~sheraf.queryset.CachedQuerySet` is a resolved
+    :class:`~sheraf.queryset.QuerySet`, as returned by
+    :func:`~sheraf.queryset.QuerySet.cache`. It only stores the identifiers
+    of the models it contains, in a compact array when they are integers,
+    and decodes the models each time it is iterated.
+
+    Unlike :class:`~sheraf.queryset.QuerySet`, it can be iterated several
+    times, and :func:`~sheraf.queryset.CachedQuerySet.count`, :func:`len`,
+    :func:`bool` and slicing do not read any model.
+
+    Models deleted after the :class:`~sheraf.queryset.CachedQuerySet`
+    creation are skipped during the iteration.
+
+    :param model_class: The model class of the identifiers.
+    :param identifiers: The identifiers of the models.
+    :param models: If `model_class` is `None`, the model instances.
+    """
+
+    def __init__(self, model_class=None, identifiers=None, models=None):
+        self._identifiers = (
+            self._compact(identifiers or []) if model_class else tuple(models or [])
+        )
+        super().__init__(iterable=self._identifiers, model_class=model_class)
+
+    @staticmethod
+    def _compact(identifiers):
+        try:
+            return array.array("q", identifiers)
+        except (TypeError, OverflowError):
+            return tuple(identifiers)
+
+    def __iter__(self):
+        return self._read()
+
+    def __repr__(self):
+        if self.model:
+            return "<CachedQuerySet model={} count={}>".format(
+                self.model.__name__, len(self)
+            )
+        return "<CachedQuerySet count={}>".format(len(self))
+
+    def __len__(self):
+        return len(self._identifiers)
+
+    def __bool__(self):
+        return bool(self._identifiers)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            identifiers = self._identifiers[item]
+        else:
+            identifiers = self._identifiers[item : (item + 1) or None]
+
+        if self.model:
+            return CachedQuerySet(model_class=self.model, identifiers=identifiers)
+        return CachedQuerySet(models=identifiers)
+
+    def _read(self):
+        if not self.model:
+            return iter(self._identifiers)
+        return self.model.read_these_valid(self._identifiers)
+
+    def _init_iterator(self, limit=None):
+        self._iterator = self._read()
+
+    def count(self):
+        """
+        :return: The number of identifiers in the
+            :class:`~sheraf.queryset.CachedQuerySet`. Unlike
+            :func:`~sheraf.queryset.QuerySet.count` this does not consume it.
+        """
+        return len(self)
+
+    def exists(self):
+        return bool(self)
+
+    def cache(self):
+        return self
+
+    def copy(self):
+        """
+        :return: A :class:`~sheraf.queryset.QuerySet` over the models of the
+            :class:`~sheraf.queryset.CachedQuerySet`, that can be refined with
+            further filters and orders.
+        """
+        return QuerySet(self._read(), self.model)
+
+
+class GroupBy(object):
+    """
+    The models of a :class:`~sheraf.queryset.QuerySet` grouped by the values
+    of an attribute, as returned by
+    :func:`~sheraf.queryset.QuerySet.group_by`. The results are dicts
+    which keys are the attribute values.
+
+    >>> with sheraf.connection():
+    ...     peter = Cowboy.create(name="Peter", age=30)
+    ...     steven = Cowboy.create(name="Steven", age=30)
+    ...     george = Cowboy.create(name="George", age=50)
+    ...     Cowboy.all().group_by("age").aggregate(names=sheraf.Count("name"))
+    {30: {'names': 2}, 50: {'names': 1}}
+    """
+
+    def __init__(self, queryset, attribute):
+        self.queryset = queryset
+        self.attribute = attribute
+
+    def __repr__(self):
+        return "<GroupBy {}>".format(self.attribute)
+
+    def count(self):
+        """
+        :return: The number of models by attribute value. If the attribute is
+            indexed and the :class:`~sheraf.queryset.QuerySet` filters are
+            all indexed, the counts are the lengths of the index posting
+            lists, and no model is read. The models which attribute value is
+            `None` are counted under the `None` key.
+        """
+        counts = self._index_counts()
+        if counts is not None:
+            return counts
+
+        return {
+            key: aggregates["count"]
+            for key, aggregates in self.aggregate(count=Count()).items()
+        }
+
+    def aggregate(self, **aggregations):
+        """
+        Computes :class:`~sheraf.queryset.Aggregation` for each group of
+        models.
+
+        :param aggregations: The aggregations to compute, by name.
+        :return: A dict of the aggregation results by name, for each group.
+        """
+        return self.queryset._aggregate(aggregations, self.attribute)
+
+    def _index_counts(self):
+        queryset = self.queryset
+        if not queryset.model or queryset._iterable is not None or queryset._iterator:
+            return None
+
+        index = queryset._order_index(self.attribute)
+        if not index or queryset._predicate:
+            return None
+
+        if not queryset.filters:
+            queryset._iterator = iter([])
+            counts = {
+                key: sum(len(posting) for posting in index.get_postings([key]))
+                for key in index.iterkeys()
+            }
+            total = queryset.model.count()
+
+        else:
+            indexed_filters = queryset._index_only_filters()
+            if not indexed_filters:
+                return None
+
+            queryset._iterator = iter([])
+            oids = queryset._indexed_oids(indexed_filters)
+            counts = {}
+            for key in index.iterkeys():
+                count = len(
+                    oids.intersection(
+                        queryset._postings_oids(index.get_postings([key]))
+                    )
+                )
+                if count:
+                    counts[key] = count
+            total = len(oids)
+
+        # The models which value is None are missing from the index, but
+        # every other model is indexed under its value.
+        if not index.details.noneok:
+            none_count = total - sum(counts.values())
+            if none_count > 0:
+                counts[None] = none_count
+        return counts
@@ -14,9 +14,13 @@ import sheraf.tools.dicttools
 
 from .largedict import LargeDict
 from .largelist import LargeList
+from .largeset import LargeSet
+from .sequence import Sequence
 
 assert LargeDict
 assert LargeList
+assert LargeSet
+assert Sequence
 
 
 SmallList = persistent.list.PersistentList
@@ -24,12 +24,20 @@ class LargeList(IOBTree):
     def __len__(self):
         return IOBTree.get(self, self.LENGTH_KEY, self.LENGTH_KEY + 1)
 
+    def __bool__(self):
+        return len(self) > 0
+
     def _set_length(self, length):
         IOBTree.__setitem__(self, self.LENGTH_KEY, length)
 
     def extend(self, items):
-        for _item in items:
-            self.append(_item)
+        length = len(self)
+        items = list(enumerate(items, length))
+        if not items:
+            return
+
+        self._set_length(length + len(items))
+        IOBTree.update(self, items)
 
     def insert(self, indice, element):
         self._set_length(len(self) + 1)
@@ -0,0 +1,106 @@
+import BTrees.Length
+import persistent
+import ZODB.utils
+from BTrees.LOBTree import LOBTree
+
+import sheraf
+
+
+class LargeSet(persistent.Persistent):
+    """A set of persistent objects, stored in a BTree keyed by the object
+    OIDs.
+
+    Adding or removing an object only modifies the bucket where its OID
+    lies, whatever the size of the set, so concurrent edits on different
+    objects do not conflict. The size of the set is kept in a
+    :class:`BTrees.Length.Length` so it can be read without loading the
+    buckets.
+
+    The objects are iterated in the order of their OIDs, that generally is
+    their creation order. Objects without OID are added to the connection
+    of the set, or to the current connection.
+
+    >>> class Cowboy(sheraf.Model):
+    ...     table = "largeset_cowboys"
+    ...
+    >>> with sheraf.connection():
+    ...     george = Cowboy.create()
+    ...     peter = Cowboy.create()
+    ...     cowboys = sheraf.types.LargeSet([george.mapping])
+    ...     cowboys.add(peter.mapping)
+    ...     assert george.mapping in cowboys
+    ...     cowboys.remove(george.mapping)
+    ...     assert [peter.mapping] == list(cowboys)
+    ...     len(cowboys)
+    1
+    """
+
+    def __init__(self, items=None):
+        self.tree = LOBTree()
+        self.length = BTrees.Length.Length()
+        if items is not None:
+            self.update(items)
+
+    def key(self, item):
+        """
+        :return: The OID of ``item`` as an integer, that is the key of
+                 ``item`` in :attr:`tree`.
+        """
+        if item._p_oid is None:
+            connection = self._p_jar or sheraf.Database.current_connection()
+            connection.add(item)
+
+        return ZODB.utils.u64(item._p_oid)
+
+    def add(self, item):
+        if self.tree.insert(self.key(item), item):
+            self.length.change(1)
+
+    def update(self, items):
+        """Adds several objects with a single BTree update and a single
+        length change."""
+        items = {self.key(item): item for item in items}
+        items = {key: item for key, item in items.items() if not self.tree.has_key(key)}
+        if items:
+            self.tree.update(items)
+            self.length.change(len(items))
+
+    def remove(self, item):
+        try:
+            del self.tree[self.key(item)]
+        except KeyError:
+            raise ValueError("{} not in {}".format(item, self))
+        self.length.change(-1)
+
+    def discard(self, item):
+        try:
+            self.remove(item)
+        except ValueError:
+            pass
+
+    # Aliases so a LargeSet can be used where a LargeList was expected.
+    append = add
+    extend = update
+
+    def keys(self, *args, **kwargs):
+        return self.tree.keys(*args, **kwargs)
+
+    def __iter__(self):
+        return iter(self.tree.values())
+
+    def __len__(self):
+        return self.length()
+
+    def __bool__(self):
+        return bool(self.tree)
+
+    def __contains__(self, item):
+        return item._p_oid is not None and self.tree.has_key(
+            ZODB.utils.u64(item._p_oid)
+        )
+
+    def __eq__(self, other):
+        if len(self) != len(other):
+            return False
+
+        return all(mine == their for mine, their in zip(self, other))
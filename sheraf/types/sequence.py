@@ -0,0 +1,49 @@
+import persistent
+
+
+class Sequence(persistent.Persistent):
+    """Sequence is a persistent generator of increasing integers.
+
+    Unlike :class:`~sheraf.types.counter.Counter` increments, values taken
+    in concurrent transactions are never merged: the last transaction to
+    commit raises a :class:`~ZODB.POSException.ConflictError`, so that a
+    value that has been committed is never handed out twice.
+
+    Transactions taking many values can :meth:`reserve` blocks of values in
+    short separate transactions, so that they hardly conflict.
+
+    >>> sequence = sheraf.types.Sequence()
+    >>> sequence.next()
+    0
+    >>> sequence.next()
+    1
+    >>> sequence.reserve(10)
+    2
+    >>> sequence.next()
+    12
+    """
+
+    value = 0
+
+    def __init__(self, value=0):
+        self.value = value
+
+    def next(self, count=1):
+        """
+        :param count: The number of values to take.
+        :return: The first of the ``count`` consecutive values taken.
+        """
+        value = self.value
+        self.value += count
+        return value
+
+    def reserve(self, count):
+        """Takes a block of ``count`` consecutive values that cannot be
+        handed out by any concurrent transaction.
+
+        :return: The first value of the block.
+        """
+        return self.next(count)
+
+    def __repr__(self):
+        return "<Sequence value=%s>" % self.value
@@ -172,6 +172,28 @@ def test_datetime_lastupdate_datetime_setattr(sheraf_database):
         assert datetime.datetime(2014, 8, 4, 6) == m.last_update_datetime()
 
 
+def test_datetime_creation_datetime_is_kept_after_updates(sheraf_database):
+    sheraf_database.reset()
+
+    class ModelForTest(tests.UUIDAutoModel):
+        attr = sheraf.SimpleAttribute().index()
+
+    with libfaketime.fake_time("2014-08-04 02:00:00"):
+        with sheraf.connection(commit=True):
+            m = ModelForTest.create(attr="foo")
+            assert m.mapping._p_oid
+            assert m.creation_datetime() is None
+
+    with libfaketime.fake_time("2014-08-04 06:00:00"):
+        with sheraf.connection(commit=True):
+            m = ModelForTest.read(m.id)
+            m.attr = "bar"
+
+    with sheraf.connection():
+        m = ModelForTest.read(m.id)
+        assert datetime.datetime(2014, 8, 4, 2) == m.creation_datetime()
+
+
 @libfaketime.fake_time("2014-08-04 01:01:01")
 def test_datetime_default_meta_datetimes(sheraf_database):
     sheraf_database.reset()
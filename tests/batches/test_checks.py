@@ -3,7 +3,8 @@ import re
 import mock
 
 import sheraf
-from sheraf.batches.checks import check_health, print_health
+import tests
+from sheraf.batches.checks import check_attributes_index, check_health, print_health
 
 from . import fixture1
 
@@ -42,6 +43,22 @@ def test_healthcheck_attributes_index(sheraf_database, capsys):
         assert re.search(r"tests.batches.fixture1.Model2[^\n]*1[^\n]*1", stdout)
 
 
+def test_check_attributes_index_partial_index(sheraf_database):
+    class PartialModel(tests.UUIDAutoModel):
+        status = sheraf.SimpleAttribute()
+        email = sheraf.SimpleAttribute().index(where={"status": "active"})
+
+    with sheraf.connection(commit=True) as conn:
+        active = PartialModel.create(status="active", email="a@example.org")
+        inactive = PartialModel.create(status="inactive", email="b@example.org")
+
+        assert {"email": True} == check_attributes_index(active)
+        assert {} == check_attributes_index(inactive)
+
+        del conn.root()[PartialModel.table]["email"]["a@example.org"]
+        assert {"email": False} == check_attributes_index(active)
+
+
 def test_healthcheck_attributes_index_when_instance_deleted(sheraf_database, capsys):
     from .fixture1 import Model2unique
 
@@ -0,0 +1,198 @@
+import pytest
+
+import sheraf
+import sheraf.exceptions
+import tests
+
+
+class Ticket(tests.IntAutoModel):
+    tenant = sheraf.SimpleAttribute()
+    status = sheraf.SimpleAttribute()
+    priority = sheraf.IntegerAttribute()
+    owner = sheraf.SimpleAttribute().index()
+
+    tenant_status = sheraf.Index("tenant", "status")
+    tenant_status_priority = sheraf.Index("tenant", "status", "priority")
+
+
+def test_compound_index_keys(sheraf_connection):
+    Ticket.create(tenant="yaal", status="open", priority=1)
+    Ticket.create(tenant="yaal", status="closed", priority=2)
+    Ticket.create(tenant="yaal", status="open", priority=3)
+
+    table = sheraf_connection.root()[Ticket.table]
+    assert [("yaal", "closed"), ("yaal", "open")] == list(table["tenant_status"])
+    assert 2 == len(table["tenant_status"][("yaal", "open")])
+    assert [
+        ("yaal", "closed", 2),
+        ("yaal", "open", 1),
+        ("yaal", "open", 3),
+    ] == list(table["tenant_status_priority"])
+
+
+def test_compound_index_equality(sheraf_connection):
+    t0 = Ticket.create(tenant="yaal", status="open")
+    Ticket.create(tenant="yaal", status="closed")
+    Ticket.create(tenant="other", status="open")
+    t3 = Ticket.create(tenant="yaal", status="open")
+
+    qs = Ticket.filter(tenant="yaal", status="open")
+    assert [("tenant_status", ("yaal", "open"), False)] == qs._indexed_filters()
+    assert [t0, t3] == qs
+    assert [t0, t3] == Ticket.filter(status="open", tenant="yaal")
+    assert [t0, t3] == Ticket.filter(tenant_status=("yaal", "open"))
+    assert [] == Ticket.filter(tenant="unknown", status="open")
+
+
+def test_compound_index_prefix(sheraf_connection):
+    t0 = Ticket.create(tenant="yaal", status="open", priority=1)
+    t1 = Ticket.create(tenant="yaal", status="closed", priority=2)
+    Ticket.create(tenant="other", status="open", priority=3)
+
+    qs = Ticket.filter(tenant="yaal")
+    assert "tenant_status" == qs._indexed_filters()[0][0]
+    assert {t0, t1} == set(qs)
+    assert 2 == Ticket.filter(tenant="yaal").count()
+
+
+def test_compound_index_range(sheraf_connection):
+    t0 = Ticket.create(tenant="yaal", status="open", priority=1)
+    t1 = Ticket.create(tenant="yaal", status="open", priority=2)
+    t2 = Ticket.create(tenant="yaal", status="open", priority=3)
+    t3 = Ticket.create(tenant="yaal", status="closed", priority=2)
+    Ticket.create(tenant="other", status="open", priority=2)
+
+    qs = Ticket.filter(tenant="yaal", status="open", priority__gte=2)
+    assert "tenant_status_priority" == qs._indexed_filters()[0][0]
+    assert [t1, t2] == qs
+    assert [t2] == Ticket.filter(tenant="yaal", status="open", priority__gt=2)
+    assert [t0] == Ticket.filter(tenant="yaal", status="open", priority__lt=2)
+    assert [t0, t1] == Ticket.filter(tenant="yaal", status="open", priority__lte=2)
+    assert [t3, t0, t1, t2] == Ticket.filter(tenant="yaal", status__gte="closed")
+    assert [t3] == Ticket.filter(tenant="yaal", status=sheraf.Prefix("clo"))
+    assert 3 == Ticket.filter(tenant="yaal", status="open", priority__gte=0).count()
+
+
+def test_compound_index_with_other_filters(sheraf_connection):
+    t0 = Ticket.create(tenant="yaal", status="open", owner="george")
+    Ticket.create(tenant="yaal", status="open", owner="peter")
+    Ticket.create(tenant="yaal", status="closed", owner="george")
+
+    qs = Ticket.filter(tenant="yaal", status="open", owner="george")
+    assert 2 == len(qs._indexed_filters())
+    assert [t0] == qs
+    assert 1 == Ticket.filter(tenant="yaal", status="open", owner="george").count()
+
+    # The status filter is not resolved by the compound index.
+    qs = Ticket.filter(status="open", owner="george")
+    assert [("owner", "george", False)] == qs._indexed_filters()
+    assert [t0] == qs
+
+
+def test_compound_index_update(sheraf_connection):
+    t0 = Ticket.create(tenant="yaal", status="open", priority=1)
+
+    t0.status = "closed"
+    assert [] == Ticket.filter(tenant="yaal", status="open")
+    assert [t0] == Ticket.filter(tenant="yaal", status="closed")
+
+    t0.tenant = "other"
+    assert [] == Ticket.filter(tenant="yaal", status="closed")
+    assert [t0] == Ticket.filter(tenant="other", status="closed")
+    assert [t0] == Ticket.filter(tenant="other", status="closed", priority=1)
+
+    t0.delete()
+    assert [] == Ticket.filter(tenant="other", status="closed")
+    assert not sheraf_connection.root()[Ticket.table]["tenant_status"]
+
+
+def test_compound_index_none_values(sheraf_connection):
+    t0 = Ticket.create(tenant="yaal")
+    assert not sheraf_connection.root()[Ticket.table]["tenant_status"]
+    assert [] == Ticket.filter(tenant="yaal", status=None)
+
+    t0.status = "open"
+    assert [t0] == Ticket.filter(tenant="yaal", status="open")
+
+
+def test_compound_index_bulk(sheraf_connection):
+    t0, t1, t2 = Ticket.bulk_create(
+        [
+            {"tenant": "yaal", "status": "open"},
+            {"tenant": "yaal", "status": "closed"},
+            {"tenant": "yaal", "status": "open"},
+        ]
+    )
+    assert [t0, t2] == Ticket.filter(tenant="yaal", status="open")
+
+    Ticket.bulk_update([t0, t1], {"status": "archived"})
+    assert [t2] == Ticket.filter(tenant="yaal", status="open")
+    assert [t0, t1] == Ticket.filter(tenant="yaal", status="archived")
+
+    Ticket.bulk_delete([t0])
+    assert [t1] == Ticket.filter(tenant="yaal", status="archived")
+
+
+def test_unique_compound_index(sheraf_connection):
+    class Model(tests.IntAutoModel):
+        tenant = sheraf.SimpleAttribute()
+        reference = sheraf.SimpleAttribute()
+        tenant_reference = sheraf.Index("tenant", "reference", unique=True)
+
+    m = Model.create(tenant="yaal", reference="a")
+    Model.create(tenant="other", reference="a")
+
+    assert m == Model.read(tenant_reference=("yaal", "a"))
+    assert [m] == Model.filter(tenant="yaal", reference="a")
+
+    with pytest.raises(sheraf.exceptions.UniqueIndexException):
+        Model.create(tenant="yaal", reference="a")
+
+
+def test_partial_compound_index(sheraf_connection):
+    class Model(tests.IntAutoModel):
+        tenant = sheraf.SimpleAttribute()
+        status = sheraf.SimpleAttribute()
+        owner = sheraf.SimpleAttribute()
+        active = sheraf.Index("tenant", "owner", where={"status": "open"})
+
+    m = Model.create(tenant="yaal", owner="george", status="open")
+    Model.create(tenant="yaal", owner="george", status="closed")
+
+    qs = Model.filter(tenant="yaal", owner="george", status="open")
+    assert "active" == qs._indexed_filters()[0][0]
+    assert [m] == qs
+    assert 2 == Model.filter(tenant="yaal", owner="george").count()
+
+    m.status = "closed"
+    assert [] == Model.filter(tenant="yaal", owner="george", status="open")
+
+
+def test_compound_index_rebuild(sheraf_database):
+    class Model(tests.IntAutoModel):
+        tenant = sheraf.SimpleAttribute()
+        status = sheraf.SimpleAttribute()
+
+    with sheraf.connection(commit=True):
+        m = Model.create(tenant="yaal", status="open")
+        Model.create(tenant="yaal", status="closed")
+
+    class Model(tests.IntAutoModel):
+        tenant = sheraf.SimpleAttribute()
+        status = sheraf.SimpleAttribute()
+        tenant_status = sheraf.Index("tenant", "status")
+
+    with sheraf.connection(commit=True):
+        assert not Model.indexes()["tenant_status"].table_initialized()
+        Model.index_table_rebuild(["tenant_status"])
+
+    with sheraf.connection() as conn:
+        assert [m] == Model.filter(tenant="yaal", status="open")
+        assert [("yaal", "closed"), ("yaal", "open")] == list(
+            conn.root()[Model.table]["tenant_status"]
+        )
+
+
+def test_compound_index_invalid():
+    with pytest.raises(ValueError):
+        sheraf.Index("tenant")
@@ -0,0 +1,141 @@
+from unittest.mock import patch
+
+import sheraf
+import tests
+
+
+class Ticket(tests.IntAutoModel):
+    status = sheraf.SimpleAttribute().index()
+    owner = sheraf.SimpleAttribute().index()
+    reference = sheraf.SimpleAttribute().index(unique=True)
+    priority = sheraf.SimpleAttribute()
+
+
+def test_intersection_of_multiple_indexes(sheraf_connection):
+    t0 = Ticket.create(status="open", owner="george", reference="a")
+    t1 = Ticket.create(status="open", owner="peter", reference="b")
+    t2 = Ticket.create(status="closed", owner="george", reference="c")
+    t3 = Ticket.create(status="open", owner="george", reference="d")
+
+    assert [t0, t3] == Ticket.filter(status="open", owner="george")
+    assert [t0, t3] == Ticket.filter(owner="george", status="open")
+    assert [t1] == Ticket.filter(status="open", owner="peter")
+    assert [t2] == Ticket.filter(status="closed").filter(owner="george")
+    assert [] == Ticket.filter(status="closed", owner="peter")
+    assert [] == Ticket.filter(status="unknown", owner="george")
+
+
+def test_intersection_with_unique_index(sheraf_connection):
+    t0 = Ticket.create(status="open", owner="george", reference="a")
+    Ticket.create(status="open", owner="peter", reference="b")
+
+    assert [t0] == Ticket.filter(status="open", reference="a")
+    assert [] == Ticket.filter(status="open", reference="unknown")
+    assert [] == Ticket.filter(owner="peter", reference="a")
+
+
+def test_intersection_with_non_indexed_filter(sheraf_connection):
+    t0 = Ticket.create(status="open", owner="george", priority=1)
+    Ticket.create(status="open", owner="george", priority=2)
+    Ticket.create(status="open", owner="peter", priority=1)
+
+    assert [t0] == Ticket.filter(status="open", owner="george", priority=1)
+
+
+def test_only_intersection_models_are_decorated(sheraf_connection):
+    for i in range(10):
+        Ticket.create(status="open", owner="george" if i == 5 else "peter")
+
+    with patch.object(Ticket, "_decorate", wraps=Ticket._decorate) as decorate:
+        assert 1 == len(list(Ticket.filter(status="open", owner="george")))
+        assert 1 == decorate.call_count
+
+
+def test_count_from_indexes(sheraf_connection):
+    for i in range(10):
+        Ticket.create(
+            status="open" if i % 2 else "closed",
+            owner="george" if i < 3 else "peter",
+            reference=str(i),
+            priority=i,
+        )
+
+    with patch.object(Ticket, "_decorate", wraps=Ticket._decorate) as decorate:
+        assert 10 == Ticket.all().count()
+        assert 5 == Ticket.filter(status="open").count()
+        assert 1 == Ticket.filter(reference="3").count()
+        assert 0 == Ticket.filter(reference="unknown").count()
+        assert 0 == Ticket.filter(status="unknown").count()
+        assert 1 == Ticket.filter(status="open", owner="george").count()
+        assert 4 == Ticket.filter(reference__gte="6").count()
+        assert not decorate.called
+
+        assert 2 == Ticket.filter(status="open", priority__lt=4).count()
+        assert decorate.called
+
+
+def test_count_consumes_the_queryset(sheraf_connection):
+    Ticket.create(status="open")
+    Ticket.create(status="open")
+
+    qs = Ticket.filter(status="open")
+    assert 2 == qs.count()
+    assert 0 == qs.count()
+    assert [] == qs
+
+    qs = Ticket.filter(status="open")
+    next(qs)
+    assert 1 == qs.count()
+
+
+def test_exists_from_indexes(sheraf_connection):
+    assert not Ticket.all().exists()
+    Ticket.create(status="open", owner="george", reference="a")
+    Ticket.create(status="closed", owner="peter", reference="b")
+
+    with patch.object(Ticket, "_decorate", wraps=Ticket._decorate) as decorate:
+        assert Ticket.all().exists()
+        assert Ticket.filter(reference="a").exists()
+        assert not Ticket.filter(reference="c").exists()
+        assert Ticket.filter(status="open", owner="george").exists()
+        assert not Ticket.filter(status="open", owner="peter").exists()
+        assert not decorate.called
+
+        assert Ticket.filter(status="open", priority=None).exists()
+        assert decorate.called
+
+
+def test_first(sheraf_connection):
+    assert Ticket.filter(status="open").first() is None
+
+    t0 = Ticket.create(status="open", owner="george", priority=2)
+    t1 = Ticket.create(status="open", owner="peter", priority=1)
+    Ticket.create(status="closed", owner="peter", priority=3)
+
+    assert t0 == Ticket.filter(status="open").first()
+    assert t1 == Ticket.filter(owner="peter").first()
+    assert t1 == Ticket.filter(status="open").order(priority=sheraf.ASC).first()
+    assert t0 == Ticket.all().order(sheraf.DESC).filter(status="open").first()
+
+
+def test_intersection_does_not_load_mappings(sheraf_database):
+    with sheraf.connection(commit=True):
+        for i in range(20):
+            Ticket.create(
+                status="open" if i % 2 else "closed",
+                owner="george" if i == 5 else "peter",
+                reference=str(i),
+            )
+
+    with sheraf.connection() as conn:
+        conn.cacheMinimize()
+        mappings = list(conn.root()[Ticket.table]["id"].values())
+        assert all(mapping._p_changed is None for mapping in mappings)
+
+        assert [5] == [t.id for t in Ticket.filter(status="open", owner="george")]
+        assert 1 == Ticket.filter(status="open", owner="george").count()
+        assert 10 == Ticket.filter(status="open", reference__gte="0").count()
+        assert 1 == Ticket.filter(status="open", reference="5").count()
+
+        loaded = [mapping for mapping in mappings if mapping._p_changed is not None]
+        assert [mappings[5]] == loaded
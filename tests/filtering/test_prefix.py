@@ -0,0 +1,92 @@
+from unittest.mock import patch
+
+import pytest
+
+import sheraf
+import tests
+from sheraf.queryset import Prefix
+
+
+class Cowboy(tests.IntAutoModel):
+    username = sheraf.StringAttribute().index(values=lambda s: {s.lower()})
+    email = sheraf.StringAttribute().index(unique=True)
+    nickname = sheraf.StringAttribute()
+
+
+def test_prefix_bounds():
+    assert ("geo", "gep", False, True) == Prefix("geo").bounds()
+    assert (chr(0x10FFFF), None, False, False) == Prefix(chr(0x10FFFF)).bounds()
+    assert ("", None, False, False) == Prefix("").bounds()
+    assert "a" + chr(0x10FFFF) + "b" in Prefix("a" + chr(0x10FFFF))
+    assert None not in Prefix("a")
+
+
+def test_startswith_filter(sheraf_connection):
+    george = Cowboy.create(username="George", email="george@abitbol.com")
+    georges = Cowboy.create(username="Georges", email="georges@abitbol.com")
+    peter = Cowboy.create(username="Peter", email="peter@cowboy.com", nickname="Pete")
+
+    assert [george, georges] == Cowboy.filter(username__startswith="geo")
+    assert [] == Cowboy.filter(username__startswith="Geo")
+    assert [georges] == Cowboy.filter(email__startswith="georges")
+    assert [george, georges] == Cowboy.filter(email__startswith="geo")
+    assert [peter] == Cowboy.filter(nickname__startswith="Pe")
+    assert [peter] == Cowboy.filter(
+        username__startswith="pe", email__startswith="peter@"
+    )
+
+
+def test_startswith_unbounded_prefixes(sheraf_connection):
+    greatest = chr(0x10FFFF)
+    cowboys = [
+        Cowboy.create(username="", email="", nickname=""),
+        Cowboy.create(username="abc", email="abc", nickname="abc"),
+        Cowboy.create(username="b", email="b", nickname="b"),
+        Cowboy.create(username=greatest, email=greatest, nickname=greatest),
+    ]
+
+    assert cowboys == Cowboy.filter(username__startswith="")
+    assert cowboys == Cowboy.filter(email__startswith="")
+    assert cowboys == Cowboy.filter(nickname__startswith="")
+    assert [cowboys[3]] == Cowboy.filter(username__startswith=greatest)
+    assert [cowboys[3]] == Cowboy.filter(email__startswith=greatest)
+    assert [cowboys[3]] == Cowboy.filter(nickname__startswith=greatest)
+
+
+def test_startswith_search(sheraf_connection):
+    george = Cowboy.create(username="George", email="george@abitbol.com")
+    georges = Cowboy.create(username="Georges", email="georges@abitbol.com")
+    Cowboy.create(username="Peter", email="peter@cowboy.com")
+
+    assert [george, georges] == Cowboy.search(username__startswith="GEO")
+    assert [georges] == Cowboy.search(username__startswith="GEORGES")
+
+
+def test_startswith_limit_stops_the_scan(sheraf_connection):
+    for i in range(20):
+        Cowboy.create(username="george{:02}".format(i), email=str(i))
+
+    with patch.object(Cowboy, "_decorate", wraps=Cowboy._decorate) as decorate:
+        assert ["george00", "george01", "george02"] == [
+            m.username for m in Cowboy.search(username__startswith="GEORGE")[:3]
+        ]
+        assert 3 == decorate.call_count
+
+
+class AgedCowboy(tests.IntAutoModel):
+    age = sheraf.IntegerAttribute().index()
+
+
+def test_startswith_non_string_value(sheraf_connection):
+    with pytest.raises(TypeError, match="username__startswith"):
+        Cowboy.filter(username__startswith=3)
+
+
+def test_startswith_non_string_index(sheraf_connection):
+    AgedCowboy.create(age=30)
+
+    with pytest.raises(TypeError, match="'age' index"):
+        list(AgedCowboy.filter(age__startswith="3"))
+
+    with pytest.raises(TypeError, match="'age' index"):
+        list(AgedCowboy.filter(age__startswith="3").order(age=sheraf.ASC))
@@ -0,0 +1,75 @@
+import pytest
+
+import sheraf
+import tests
+from sheraf.exceptions import InvalidFilterException
+from sheraf.queryset import Range
+
+
+class Cowboy(tests.IntAutoModel):
+    age = sheraf.IntegerAttribute().index()
+    email = sheraf.SimpleAttribute().index(unique=True)
+    size = sheraf.IntegerAttribute()
+
+
+@pytest.fixture
+def cowboys(sheraf_connection):
+    return [
+        Cowboy.create(age=age, email="{}@cowboy.com".format(age), size=150 + age)
+        for age in (10, 20, 30, 40, 50)
+    ]
+
+
+def test_range_lookups_on_multiple_index(cowboys):
+    m10, m20, m30, m40, m50 = cowboys
+
+    assert [m40, m50] == Cowboy.filter(age__gt=30)
+    assert [m30, m40, m50] == Cowboy.filter(age__gte=30)
+    assert [m10, m20] == Cowboy.filter(age__lt=30)
+    assert [m10, m20, m30] == Cowboy.filter(age__lte=30)
+    assert [m20, m30] == Cowboy.filter(age__gte=20, age__lt=40)
+    assert [m20, m30] == Cowboy.filter(age__gte=20).filter(age__lt=40)
+    assert [] == Cowboy.filter(age__gt=50)
+
+
+def test_range_lookups_on_unique_index(cowboys):
+    m10, m20, m30, m40, m50 = cowboys
+
+    assert [m20, m30] == Cowboy.filter(
+        email__gte="20@cowboy.com", email__lte="30@cowboy.com"
+    )
+
+
+def test_range_lookups_on_non_indexed_attribute(cowboys):
+    m10, m20, m30, m40, m50 = cowboys
+
+    assert [m20, m30] == Cowboy.filter(size__gte=170, size__lt=190)
+    assert [m30] == Cowboy.filter(size__gte=170, age__gte=30, age__lte=30)
+
+
+def test_range_object(cowboys):
+    m10, m20, m30, m40, m50 = cowboys
+
+    assert [m20, m30, m40] == Cowboy.filter(age=Range(20, 40))
+    assert [m30] == Cowboy.filter(age=Range(20, 40, excludemin=True, excludemax=True))
+    assert [m20, m30, m40] == Cowboy.filter(size=Range(170, 190))
+
+
+def test_range_and_order(cowboys):
+    m10, m20, m30, m40, m50 = cowboys
+
+    assert [m40, m30, m20] == Cowboy.filter(age__gte=20, age__lte=40).order(
+        age=sheraf.DESC
+    )
+    assert [m40, m30] == Cowboy.filter(age__lt=50, size__gte=180).order(age=sheraf.DESC)
+
+
+def test_invalid_range_lookups(cowboys):
+    with pytest.raises(InvalidFilterException):
+        Cowboy.filter(age__gte=20).filter(age__gte=30)
+
+    with pytest.raises(InvalidFilterException):
+        Cowboy.filter(age=20).filter(age__gte=30)
+
+    with pytest.raises(InvalidFilterException):
+        Cowboy.filter(age__foobar=20)
@@ -0,0 +1,113 @@
+from unittest.mock import patch
+
+import pytest
+
+import sheraf
+import tests
+
+
+def populate(count):
+    class Ticket(tests.IntAutoModel):
+        status = sheraf.SimpleAttribute()
+        reference = sheraf.SimpleAttribute()
+
+    with sheraf.connection(commit=True):
+        for i in range(count):
+            Ticket.create(status="open" if i % 2 else "closed", reference=str(i))
+
+
+class Ticket(tests.IntAutoModel):
+    status = sheraf.SimpleAttribute().index()
+    reference = sheraf.SimpleAttribute().index(unique=True)
+
+
+def test_backfill(sheraf_database):
+    populate(5)
+
+    with sheraf.connection():
+        assert 5 == Ticket.index_table_backfill(batch_size=2)
+
+    with sheraf.connection() as conn:
+        assert [1, 3] == [t.id for t in Ticket.filter(status="open")]
+        assert 4 == Ticket.read(reference="4").id
+        assert not Ticket.indexes()["status"].building()
+        assert not conn.root()[Ticket.table][Ticket.indexes()["status"].BUILDING_KEY]
+        assert 0 == Ticket.index_table_backfill()
+
+
+def test_backfill_resumes(sheraf_database):
+    populate(5)
+    batch = Ticket._index_table_backfill_batch
+    calls = []
+
+    def interrupted_batch(indexes, batch_size):
+        calls.append(indexes)
+        if len(calls) > 1:
+            raise KeyboardInterrupt()
+        return batch(indexes, batch_size)
+
+    with sheraf.connection():
+        with patch.object(Ticket, "_index_table_backfill_batch", interrupted_batch):
+            with pytest.raises(KeyboardInterrupt):
+                Ticket.index_table_backfill(["status"], batch_size=2)
+
+    with sheraf.connection(commit=True):
+        assert Ticket.indexes()["status"].building()
+        assert 1 == Ticket.indexes()["status"].build_cursor()
+
+        # The index is not used by the QuerySet while it is being built
+        assert [1, 3] == [t.id for t in Ticket.filter(status="open")]
+        assert 2 == Ticket.filter(status="open").count()
+
+        # New and edited models are indexed immediately, but only in the
+        # indexes being built
+        with pytest.warns(sheraf.exceptions.IndexationWarning):
+            t5 = Ticket.create(status="open", reference="5")
+        Ticket.read(2).status = "open"
+        status_table = Ticket.indexes()["status"].table()
+        assert [1, 2, 5] == [Ticket._decorate(m).id for m in status_table["open"]]
+
+    with sheraf.connection():
+        assert 4 == Ticket.index_table_backfill(["status"], batch_size=2)
+
+    with sheraf.connection():
+        assert not Ticket.indexes()["status"].building()
+        assert [1, 2, 3, t5.id] == [t.id for t in Ticket.filter(status="open")]
+        assert [0, 4] == [t.id for t in Ticket.filter(status="closed")]
+
+
+def test_range_filters_on_building_index(sheraf_database):
+    populate(5)
+    batch = Ticket._index_table_backfill_batch
+
+    def interrupted_batch(indexes, batch_size):
+        batch(indexes, batch_size)
+        raise KeyboardInterrupt()
+
+    with sheraf.connection(commit=True):
+        with patch.object(Ticket, "_index_table_backfill_batch", interrupted_batch):
+            with pytest.raises(KeyboardInterrupt):
+                Ticket.index_table_backfill(batch_size=2)
+
+    with sheraf.connection():
+        assert Ticket.indexes()["reference"].building()
+        assert [3, 4] == [t.id for t in Ticket.filter(reference__gte="3")]
+        assert [3, 4] == [t.id for t in Ticket.search(reference__gte="3")]
+        assert [1, 3] == [t.id for t in Ticket.search(status__gt="closed")]
+
+
+def test_backfill_unique_index_edited_during_build(sheraf_database):
+    populate(3)
+
+    with sheraf.connection(commit=True):
+        Ticket.indexes()["reference"].build()
+
+    with sheraf.connection(commit=True):
+        Ticket.read(1).reference = "foo"
+
+    with sheraf.connection():
+        assert 3 == Ticket.index_table_backfill(["reference"])
+
+    with sheraf.connection():
+        assert 1 == Ticket.read(reference="foo").id
+        assert ["0", "2", "foo"] == sorted(Ticket.indexes()["reference"].table())
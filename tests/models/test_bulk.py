@@ -0,0 +1,309 @@
+import warnings
+from unittest.mock import patch
+
+import pytest
+
+import sheraf
+import sheraf.exceptions
+import tests
+
+
+class BulkModel(tests.IntAutoModel):
+    reference = sheraf.SimpleAttribute().index(unique=True)
+    status = sheraf.SimpleAttribute().index()
+    name = sheraf.SimpleAttribute(default="John Doe")
+
+
+def test_bulk_create(sheraf_connection):
+    models = BulkModel.bulk_create(
+        [
+            {"reference": "a", "status": "open"},
+            {"reference": "b", "status": "closed", "name": "George"},
+            {"reference": "c", "status": "open"},
+        ],
+        batch_size=2,
+    )
+    a, b, c = models
+
+    assert [0, 1, 2] == [m.id for m in models]
+    assert "George" == b.name
+    assert "John Doe" == a.name
+    assert 3 == BulkModel.count()
+    assert [a, b, c] == BulkModel.all()
+    assert b == BulkModel.read(reference="b")
+    assert [a, c] == BulkModel.filter(status="open")
+
+    d = BulkModel.create(reference="d", status="open")
+    assert 3 == d.id
+    assert [a, c, d] == BulkModel.filter(status="open")
+
+
+def test_bulk_create_generator(sheraf_connection):
+    models = BulkModel.bulk_create(
+        {"reference": str(i), "status": i % 3} for i in range(10)
+    )
+
+    assert 10 == len(models)
+    assert models == BulkModel.all()
+    assert [models[1], models[4], models[7]] == BulkModel.filter(status=1)
+
+
+def test_bulk_create_same_as_create(sheraf_database):
+    with sheraf.connection(commit=True):
+        BulkModel.create(reference="a", status="open")
+        BulkModel.create(reference="b", status="open")
+
+    with sheraf.connection() as conn:
+        expected = {
+            key: set(conn.root()[BulkModel.table][key]) for key in BulkModel.indexes()
+        }
+
+    with sheraf.connection() as conn:
+        del conn.root()[BulkModel.table]
+        BulkModel.bulk_create(
+            [
+                {"reference": "a", "status": "open"},
+                {"reference": "b", "status": "open"},
+            ]
+        )
+        assert expected == {
+            key: set(conn.root()[BulkModel.table][key]) for key in BulkModel.indexes()
+        }
+        assert 2 == len(conn.root()[BulkModel.table]["status"]["open"])
+
+
+def test_bulk_create_groups_index_writes(sheraf_connection):
+    with patch.object(
+        sheraf.types.LargeSet,
+        "add",
+        autospec=True,
+        side_effect=sheraf.types.LargeSet.add,
+    ) as add, patch.object(
+        sheraf.types.LargeSet,
+        "extend",
+        autospec=True,
+        side_effect=sheraf.types.LargeSet.extend,
+    ) as extend:
+        BulkModel.bulk_create(
+            [{"reference": str(i), "status": "open"} for i in range(10)],
+            batch_size=5,
+        )
+
+    assert not add.called
+    assert 2 == extend.call_count
+    assert 10 == BulkModel.filter(status="open").count()
+    assert 10 == len(sheraf_connection.root()[BulkModel.table]["status"]["open"])
+
+
+def test_bulk_create_unique_in_batch(sheraf_connection):
+    with pytest.raises(sheraf.exceptions.UniqueIndexException):
+        BulkModel.bulk_create([{"reference": "a"}, {"reference": "a"}])
+
+
+def test_bulk_create_unique_with_existing(sheraf_connection):
+    BulkModel.create(reference="a")
+
+    with pytest.raises(sheraf.exceptions.UniqueIndexException):
+        BulkModel.bulk_create([{"reference": "b"}, {"reference": "a"}])
+
+    assert [] == BulkModel.filter(reference="b")
+    assert 1 == BulkModel.count()
+    assert 1 == len(list(BulkModel.all()))
+
+
+def test_bulk_create_unique_in_batch_writes_nothing(sheraf_connection):
+    with pytest.raises(sheraf.exceptions.UniqueIndexException):
+        BulkModel.bulk_create(
+            [
+                {"reference": "a", "status": "open"},
+                {"reference": "b", "status": "open"},
+                {"reference": "a", "status": "open"},
+            ]
+        )
+
+    assert 0 == BulkModel.count()
+    assert [] == BulkModel.all()
+    assert [] == BulkModel.filter(status="open")
+
+
+def test_bulk_create_invalid_attribute_writes_nothing(sheraf_connection):
+    with pytest.raises(TypeError):
+        BulkModel.bulk_create([{"reference": "a"}, {"invalid": "b"}])
+
+    assert 0 == BulkModel.count()
+
+
+def test_bulk_create_invalid_attribute(sheraf_connection):
+    with pytest.raises(TypeError):
+        BulkModel.bulk_create([{"invalid": "a"}])
+
+
+def test_bulk_create_invalid_batch_size(sheraf_connection):
+    with pytest.raises(ValueError):
+        BulkModel.bulk_create([{"reference": "a"}], batch_size=0)
+
+
+def test_bulk_create_commit(sheraf_database):
+    with sheraf.connection():
+        BulkModel.bulk_create(
+            [{"reference": str(i)} for i in range(5)], batch_size=2, commit=True
+        )
+
+    with sheraf.connection():
+        assert ["0", "1", "2", "3"] == [m.reference for m in BulkModel.all()]
+
+
+def test_bulk_create_savepoint(sheraf_database):
+    with sheraf.connection():
+        assert 5 == BulkModel.bulk_create(
+            [{"reference": str(i)} for i in range(5)], batch_size=2, savepoint=True
+        )
+        assert 5 == BulkModel.count()
+
+    with sheraf.connection():
+        assert 0 == BulkModel.count()
+
+
+def test_bulk_create_new_index_warning(sheraf_database):
+    class Model(tests.IntAutoModel):
+        table = "bulk_model_new_index"
+
+    with sheraf.connection(commit=True):
+        Model.create()
+
+    class Model(tests.IntAutoModel):
+        table = "bulk_model_new_index"
+        status = sheraf.SimpleAttribute().index()
+
+    with sheraf.connection():
+        with warnings.catch_warnings(record=True) as warns:
+            warnings.simplefilter("always")
+            Model.bulk_create([{"status": "open"}])
+
+        assert any(
+            issubclass(w.category, sheraf.exceptions.IndexationWarning) for w in warns
+        )
+        assert 2 == Model.count()
+
+
+def test_bulk_delete(sheraf_database):
+    with sheraf.connection(commit=True):
+        a, b, c, d = BulkModel.bulk_create(
+            [
+                {"reference": "a", "status": "open"},
+                {"reference": "b", "status": "closed"},
+                {"reference": "c", "status": "open"},
+                {"reference": "d", "status": "open"},
+            ]
+        )
+
+    with sheraf.connection(commit=True):
+        assert 2 == BulkModel.bulk_delete([a, c])
+
+    with sheraf.connection() as conn:
+        assert [b, d] == BulkModel.all()
+        assert [d] == BulkModel.filter(status="open")
+        assert [] == BulkModel.filter(reference="a")
+        assert {"b", "d"} == set(conn.root()[BulkModel.table]["reference"])
+
+        assert 2 == BulkModel.bulk_delete([b, d, d])
+        assert [] == BulkModel.all()
+        assert not conn.root()[BulkModel.table]["status"]
+
+
+def test_queryset_delete_uses_bulk_delete(sheraf_connection):
+    BulkModel.bulk_create([{"status": "open"} for _ in range(5)])
+
+    with patch.object(
+        sheraf.types.LargeList,
+        "remove",
+        autospec=True,
+        side_effect=sheraf.types.LargeList.remove,
+    ) as remove:
+        assert 4 == BulkModel.filter(id__gte=1).delete()
+
+    assert not remove.called
+    assert 1 == BulkModel.filter(status="open").count()
+
+
+def test_queryset_delete_overriden_delete(sheraf_connection):
+    deleted = []
+
+    class Model(tests.IntAutoModel):
+        status = sheraf.SimpleAttribute().index()
+
+        def delete(self):
+            deleted.append(self.id)
+            super().delete()
+
+    Model.bulk_create([{"status": "open"} for _ in range(3)])
+
+    assert 3 == Model.all().delete()
+    assert [0, 1, 2] == deleted
+    assert [] == Model.filter(status="open")
+
+
+def test_bulk_update(sheraf_connection):
+    a, b, c = BulkModel.bulk_create(
+        [
+            {"reference": "a", "status": "open"},
+            {"reference": "b", "status": "closed"},
+            {"reference": "c"},
+        ]
+    )
+
+    assert 3 == BulkModel.bulk_update([a, b, c], {"status": "archived", "name": "X"})
+    assert [a, b, c] == BulkModel.filter(status="archived")
+    assert [] == BulkModel.filter(status="open")
+    assert ["X", "X", "X"] == [m.name for m in BulkModel.all()]
+    assert ["archived"] * 3 == [m.status for m in BulkModel.all()]
+    assert not sheraf_connection.root()[BulkModel.table]["status"].has_key("open")
+
+
+def test_bulk_update_unique(sheraf_connection):
+    a, b = BulkModel.bulk_create([{"reference": "a"}, {"reference": "b"}])
+
+    assert 1 == BulkModel.bulk_update([a], {"reference": "c"})
+    assert a == BulkModel.read(reference="c")
+    assert [] == BulkModel.filter(reference="a")
+
+    with pytest.raises(sheraf.exceptions.UniqueIndexException):
+        BulkModel.bulk_update([a, b], {"reference": "d"})
+
+
+def test_bulk_update_unique_writes_nothing(sheraf_connection):
+    a, b = BulkModel.bulk_create(
+        [{"reference": "a", "status": "open"}, {"reference": "b", "status": "open"}]
+    )
+
+    with pytest.raises(sheraf.exceptions.UniqueIndexException):
+        BulkModel.filter(status="open").update(status="closed", reference="c")
+
+    assert a == BulkModel.read(reference="a")
+    assert b == BulkModel.read(reference="b")
+    assert [] == BulkModel.filter(reference="c")
+    assert [a, b] == BulkModel.filter(status="open")
+    assert [] == BulkModel.filter(status="closed")
+    assert ["a", "b"] == [m.reference for m in BulkModel.all()]
+
+
+def test_bulk_update_invalid_attribute(sheraf_connection):
+    a = BulkModel.create()
+
+    with pytest.raises(TypeError):
+        BulkModel.bulk_update([a], {"invalid": "a"})
+
+
+def test_queryset_update(sheraf_connection):
+    BulkModel.bulk_create([{"status": "open"} for _ in range(5)])
+    BulkModel.create(status="closed")
+
+    progress = []
+    assert 5 == BulkModel.filter(status="open").update(
+        status="archived", batch_size=2, progress=progress.append
+    )
+    assert [2, 4, 5] == progress
+    assert 5 == BulkModel.filter(status="archived").count()
+    assert 1 == BulkModel.filter(status="closed").count()
+    assert 0 == BulkModel.filter(status="open").count()
+    assert 0 == BulkModel.filter(status="unknown").update(status="open")
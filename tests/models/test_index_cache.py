@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+import transaction
+
+import sheraf
+import sheraf.models.indexmanager
+import tests
+
+
+class Cowboy(tests.UUIDAutoModel):
+    name = sheraf.SimpleAttribute().index()
+    email = sheraf.SimpleAttribute().index(unique=True)
+
+
+def test_edits_use_the_cache(sheraf_connection):
+    Cowboy.create(name="George", email="george@abitbol.com")
+
+    with patch.object(
+        sheraf.models.indexmanager.IndexCache,
+        "__setitem__",
+        autospec=True,
+        side_effect=sheraf.models.indexmanager.IndexCache.__setitem__,
+    ) as setitem:
+        for i in range(10):
+            cowboy = Cowboy.create(name="Peter", email=str(i))
+            cowboy.name = "Steven"
+        assert not setitem.called
+
+    assert 10 == Cowboy.filter(name="Steven").count()
+
+
+def test_cache_is_emptied_after_commit(sheraf_database):
+    with sheraf.connection(commit=True) as conn:
+        Cowboy.create(name="George")
+        cache = sheraf.models.indexmanager.index_cache(conn)
+        assert cache.values
+
+    assert not cache.values
+
+    with sheraf.connection() as conn:
+        Cowboy.create(name="Peter")
+        assert cache is sheraf.models.indexmanager.index_cache(conn)
+        assert cache.values
+
+    assert not cache.values
+
+
+class Horse(tests.UUIDAutoModel):
+    pass
+
+
+def test_cache_after_savepoint_rollback(sheraf_database):
+    with sheraf.connection(commit=True) as conn:
+        Horse.create()
+        savepoint = transaction.savepoint()
+        Cowboy.create(name="George")
+        savepoint.rollback()
+        assert Cowboy.table not in conn.root()
+
+        peter = Cowboy.create(name="Peter")
+        assert Cowboy.table in conn.root()
+
+    with sheraf.connection():
+        assert [peter] == Cowboy.all()
+        assert [peter] == Cowboy.filter(name="Peter")
+
+
+def test_cache_after_index_table_rebuild(sheraf_connection):
+    george = Cowboy.create(name="George")
+    Cowboy.index_table_rebuild(["name"])
+    peter = Cowboy.create(name="Peter")
+
+    assert [george] == Cowboy.filter(name="George")
+    assert [peter] == Cowboy.filter(name="Peter")
@@ -4,6 +4,7 @@ import warnings
 import sheraf
 import sheraf.exceptions
 import tests
+from unittest.mock import patch
 
 
 # ----------------------------------------------------------------------------
@@ -550,3 +551,274 @@ def test_index_table_rebuild(sheraf_database):
         with warnings.catch_warnings(record=True) as warns:
             MyModel.create(foo="foobar", bar="boo")
             assert not warns
+
+
+def test_index_table_rebuild_single_transaction_does_not_read_current(
+    sheraf_database,
+):
+    class MyModel(tests.IntAutoModel):
+        foo = sheraf.SimpleAttribute().index()
+
+    with sheraf.connection(commit=True):
+        for i in range(5):
+            MyModel.create(foo=i % 2)
+
+    with sheraf.connection() as conn:
+        with patch.object(conn, "readCurrent") as read_current:
+            MyModel.index_table_rebuild()
+            assert not read_current.called
+
+        assert [1, 3] == [m.id for m in MyModel.filter(foo=1)]
+
+    with sheraf.connection() as conn:
+        with patch.object(conn, "readCurrent") as read_current:
+            MyModel.index_table_rebuild(batch_size=2)
+            assert read_current.called
+
+
+def test_index_table_rebuild_batches(sheraf_database):
+    class MyModel(tests.IntAutoModel):
+        foo = sheraf.SimpleAttribute()
+
+    with sheraf.connection(commit=True):
+        for i in range(10):
+            MyModel.create(foo=i % 3)
+
+    class MyModel(tests.IntAutoModel):
+        foo = sheraf.SimpleAttribute().index()
+
+    with sheraf.connection() as conn:
+        # A table left by an interrupted rebuild
+        conn.root()["mymodel"]["foo__shadow__"] = BTrees.OOBTree.OOBTree({0: None})
+
+        MyModel.index_table_rebuild(batch_size=3)
+
+    with sheraf.connection() as conn:
+        assert [1, 4, 7] == [m.id for m in MyModel.filter(foo=1)]
+        assert {"id", "foo"} == set(conn.root()["mymodel"]) & {
+            "id",
+            "foo",
+            "foo__shadow__",
+        }
+        assert 3 == conn.root()["mymodel"]["__lengths__"]["foo"]()
+
+
+def test_index_table_rebuild_reads_old_index(sheraf_database):
+    class MyModel(tests.IntAutoModel):
+        foo = sheraf.SimpleAttribute().index()
+
+    with sheraf.connection(commit=True):
+        for i in range(6):
+            MyModel.create(foo=i % 2)
+
+    reads = []
+    rebuild_range = MyModel._index_table_rebuild_range
+
+    def read_and_rebuild(*args, **kwargs):
+        reads.append([m.id for m in MyModel.filter(foo=1)])
+        rebuild_range(*args, **kwargs)
+
+    with sheraf.connection():
+        with patch.object(MyModel, "_index_table_rebuild_range", read_and_rebuild):
+            MyModel.index_table_rebuild(batch_size=2)
+
+    assert [[1, 3, 5]] * 3 == reads
+
+
+def test_index_table_rebuild_concurrent_edits(sheraf_database):
+    class MyModel(tests.IntAutoModel):
+        foo = sheraf.SimpleAttribute().index()
+        bar = sheraf.SimpleAttribute().index(unique=True)
+
+    with sheraf.connection(commit=True):
+        for i in range(6):
+            MyModel.create(foo=i % 2 + 1, bar=str(i))
+
+    ranges = []
+    rebuild_range = MyModel._index_table_rebuild_range
+
+    def edit_and_rebuild(*args, **kwargs):
+        ranges.append(args)
+        # Models of the ranges already walked are edited meanwhile.
+        if len(ranges) == 2:
+            m0 = MyModel.read(0)
+            m0.foo = 3
+            m0.bar = "zero"
+            MyModel.read(1).delete()
+            MyModel.create(foo=3, bar="new")
+        rebuild_range(*args, **kwargs)
+
+    with sheraf.connection():
+        with patch.object(MyModel, "_index_table_rebuild_range", edit_and_rebuild):
+            MyModel.index_table_rebuild(batch_size=2)
+
+    with sheraf.connection():
+        assert [0, 6] == [m.id for m in MyModel.filter(foo=3)]
+        assert [2, 4] == [m.id for m in MyModel.filter(foo=1)]
+        assert [3, 5] == [m.id for m in MyModel.filter(foo=2)]
+        assert 0 == MyModel.read(bar="zero").id
+        assert [] == MyModel.filter(bar="0")
+        assert [] == MyModel.filter(bar="1")
+        assert 6 == MyModel.indexes()["bar"].length()()
+        assert not MyModel.indexes()["foo"].building()
+
+
+@pytest.mark.parametrize(
+    "database",
+    [
+        pytest.lazy_fixture("sheraf_zeo_database"),
+    ],
+)
+def test_index_table_rebuild_processes(database):
+    class MyModel(tests.IntAutoModel):
+        foo = sheraf.SimpleAttribute()
+        bar = sheraf.SimpleAttribute()
+
+    with sheraf.connection(commit=True):
+        for i in range(20):
+            MyModel.create(foo=i % 3, bar=str(i))
+
+    class MyModel(tests.IntAutoModel):
+        foo = sheraf.SimpleAttribute().index()
+        bar = sheraf.SimpleAttribute().index(unique=True)
+
+    with sheraf.connection():
+        MyModel.index_table_rebuild(batch_size=3, processes=2)
+
+    with sheraf.connection():
+        assert list(range(1, 20, 3)) == [m.id for m in MyModel.filter(foo=1)]
+        assert 12 == MyModel.read(bar="12").id
+        assert 3 == MyModel.indexes()["foo"].length()()
+        assert 20 == MyModel.indexes()["bar"].length()()
+
+
+def test_index_table_rebuild_processes_needs_shared_storage(sheraf_temp_dir):
+    class MyModel(tests.IntAutoModel):
+        foo = sheraf.SimpleAttribute().index()
+
+    database = sheraf.Database(uri="file://" + sheraf_temp_dir + "/Data.fs")
+    try:
+        with sheraf.connection(commit=True):
+            MyModel.create(foo="foo")
+
+        with sheraf.connection():
+            with pytest.raises(ValueError):
+                MyModel.index_table_rebuild(batch_size=3, processes=2)
+
+    finally:
+        database.close()
+
+
+def test_index_table_rebuild_processes_init_failure():
+    initargs = ("invalid://", "unused", tests.IntAutoModel, [], [])
+    sheraf.models.indexation._index_table_rebuild_init(*initargs)
+    try:
+        with pytest.raises(KeyError):
+            sheraf.models.indexation._index_table_rebuild_range((None, None))
+    finally:
+        sheraf.models.indexation._index_table_rebuild_error = None
+        sheraf.models.indexation._index_table_rebuild_job = None
+
+
+def test_index_table_rebuild_processes_needs_batch_size(sheraf_connection):
+    with pytest.raises(ValueError):
+        tests.IntAutoModel.index_table_rebuild(processes=2)
+
+
+def test_index_table_migrate(sheraf_database):
+    class MyModel(tests.IntAutoModel):
+        foo = sheraf.SimpleAttribute().index()
+        bar = sheraf.SimpleAttribute().index(unique=True)
+
+    with sheraf.connection(commit=True) as conn:
+        m0 = MyModel.create(foo="foo", bar="a")
+        m1 = MyModel.create(foo="foo", bar="b")
+        m2 = MyModel.create(foo="baz", bar="c")
+
+        # Older versions stored the multiple index entries in LargeLists
+        index_table = conn.root()["mymodel"]["foo"]
+        index_table["foo"] = sheraf.types.LargeList([m0.mapping, m1.mapping])
+        index_table["baz"] = sheraf.types.LargeList([m2.mapping])
+
+    with sheraf.connection(commit=True):
+        assert [m0, m1] == MyModel.filter(foo="foo")
+        m1.delete()
+
+    with sheraf.connection(commit=True) as conn:
+        assert 2 == MyModel.index_table_migrate()
+        assert 0 == MyModel.index_table_migrate()
+
+    with sheraf.connection(commit=True) as conn:
+        index_table = conn.root()["mymodel"]["foo"]
+        assert isinstance(index_table["foo"], sheraf.types.LargeSet)
+        assert isinstance(index_table["baz"], sheraf.types.LargeSet)
+        assert [m0] == MyModel.filter(foo="foo")
+        assert [m2] == MyModel.filter(foo="baz")
+
+        m3 = MyModel.create(id=3, foo="foo", bar="d")
+        assert [m0, m3] == MyModel.filter(foo="foo")
+
+
+def test_index_table_lengths(sheraf_connection):
+    class MyModel(tests.IntAutoModel):
+        foo = sheraf.SimpleAttribute().index()
+        bar = sheraf.SimpleAttribute().index(unique=True)
+
+    m0 = MyModel.create(foo="foo", bar="a")
+    MyModel.create(foo="foo", bar="b")
+    MyModel.bulk_create([{"foo": "baz", "bar": "c"}, {"foo": "qux", "bar": "d"}])
+    lengths = sheraf_connection.root()["mymodel"][MyModel.indexes()["id"].LENGTHS_KEY]
+
+    assert 4 == MyModel.count()
+    assert {"id": 4, "foo": 3, "bar": 4} == {
+        key: length() for key, length in lengths.items()
+    }
+
+    m0.delete()
+    MyModel.filter(foo="qux").delete()
+    assert 2 == MyModel.count()
+    assert {"id": 2, "foo": 2, "bar": 2} == {
+        key: length() for key, length in lengths.items()
+    }
+
+
+def test_index_table_length_rebuild(sheraf_database):
+    class MyModel(tests.IntAutoModel):
+        foo = sheraf.SimpleAttribute().index()
+
+    with sheraf.connection(commit=True) as conn:
+        MyModel.create(foo="foo")
+        MyModel.create(foo="foo")
+        MyModel.create(foo="bar")
+
+        # Older versions did not store the lengths of the tables
+        del conn.root()["mymodel"][MyModel.indexes()["id"].LENGTHS_KEY]
+
+    with sheraf.connection(commit=True):
+        assert 3 == MyModel.count()
+        assert {"id": 3, "foo": 2} == MyModel.index_table_length_rebuild()
+
+    with sheraf.connection() as conn:
+        lengths = conn.root()["mymodel"][MyModel.indexes()["id"].LENGTHS_KEY]
+        assert 3 == lengths["id"]()
+        assert 2 == lengths["foo"]()
+
+
+def test_index_table_length_no_conflict(sheraf_database):
+    sheraf_database.nestable = True
+
+    class MyModel(tests.UUIDAutoModel):
+        foo = sheraf.SimpleAttribute().index()
+
+    with sheraf.connection(commit=True):
+        MyModel.create(foo="foo")
+
+    with sheraf.connection(commit=True):
+        MyModel.create(foo="bar")
+
+        with sheraf.connection(commit=True):
+            MyModel.create(foo="baz")
+
+    with sheraf.connection():
+        assert 3 == MyModel.count()
+        assert 3 == len(list(MyModel.all()))
@@ -1,3 +1,6 @@
+import pytest
+import ZODB.POSException
+
 import sheraf
 
 
@@ -27,3 +30,69 @@ def test_create_ordered_intmodel(sheraf_database):
     with sheraf.connection():
         assert m0 == MyIntModel.read(0)
         assert m1 == MyIntModel.read(1)
+
+
+def test_ordered_intmodel_ids_are_not_reused(sheraf_connection):
+    class MyIntModel(sheraf.models.IntOrderedNamedAttributesModel):
+        table = "my_ordered_int_model_not_reused"
+
+    m0, m1 = MyIntModel.create(), MyIntModel.create()
+    m1.delete()
+
+    assert 2 == MyIntModel.create().id
+    assert [m0.id, 2] == [m.id for m in MyIntModel.all()]
+    assert 0 == m0.id
+
+
+def test_ordered_intmodel_legacy_table(sheraf_connection):
+    class MyIntModel(sheraf.models.IntOrderedNamedAttributesModel):
+        table = "my_ordered_int_model_legacy"
+
+    MyIntModel.create(id=4)
+    MyIntModel.create(id=7)
+    assert MyIntModel.SEQUENCE_KEY not in sheraf_connection.root()[MyIntModel.table]
+
+    assert 8 == MyIntModel.create().id
+
+
+def test_ordered_intmodel_concurrent_creations_conflict(sheraf_database):
+    sheraf_database.nestable = True
+
+    class MyIntModel(sheraf.models.IntOrderedNamedAttributesModel):
+        table = "my_ordered_int_model_concurrent_conflict"
+
+    with sheraf.connection(commit=True):
+        assert 0 == MyIntModel.create().id
+
+    with sheraf.connection() as conn1:
+        assert 1 == MyIntModel.create().id
+
+        with sheraf.connection(commit=True):
+            assert 1 == MyIntModel.create().id
+
+        with pytest.raises(ZODB.POSException.ConflictError):
+            conn1.transaction_manager.commit()
+
+    with sheraf.connection():
+        assert [0, 1] == [m.id for m in MyIntModel.all()]
+        assert 2 == MyIntModel.create().id
+
+
+def test_ordered_intmodel_concurrent_creations(sheraf_database):
+    sheraf_database.nestable = True
+
+    class MyIntModel(sheraf.models.IntOrderedNamedAttributesModel):
+        table = "my_ordered_int_model_concurrent"
+        id_block_size = 10
+
+    with sheraf.connection(commit=True):
+        assert 0 == MyIntModel.create().id
+
+    with sheraf.connection(commit=True):
+        assert [1, 2] == [MyIntModel.create().id for _ in range(2)]
+
+        with sheraf.connection(commit=True):
+            assert [11, 12] == [MyIntModel.create().id for _ in range(2)]
+
+    with sheraf.connection():
+        assert [0, 1, 2, 11, 12] == [m.id for m in MyIntModel.all()]
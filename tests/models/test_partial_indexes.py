@@ -0,0 +1,136 @@
+import warnings
+from unittest.mock import patch
+
+import sheraf
+import tests
+
+
+class Ticket(tests.IntAutoModel):
+    status = sheraf.SimpleAttribute()
+    priority = sheraf.IntegerAttribute(default=0)
+    owner = sheraf.SimpleAttribute().index(where={"status": "open"})
+    label = sheraf.SimpleAttribute().index(
+        where={"priority": sheraf.Range(min=5)}, unique=True
+    )
+
+
+def index_table(connection, index_key):
+    return connection.root()[Ticket.table][index_key]
+
+
+def test_only_matching_models_are_indexed(sheraf_connection):
+    t0 = Ticket.create(owner="george", status="open")
+    Ticket.create(owner="george", status="closed")
+    t2 = Ticket.create(status="open", owner="peter")
+
+    assert {"george", "peter"} == set(index_table(sheraf_connection, "owner"))
+    assert [t0.mapping] == list(index_table(sheraf_connection, "owner")["george"])
+    assert [t2.mapping] == list(index_table(sheraf_connection, "owner")["peter"])
+
+
+def test_condition_change(sheraf_connection):
+    t0 = Ticket.create(owner="george", status="open")
+    t1 = Ticket.create(owner="george", status="closed")
+
+    t0.status = "closed"
+    assert "george" not in index_table(sheraf_connection, "owner")
+
+    t1.status = "open"
+    t1.owner = "peter"
+    assert [t1.mapping] == list(index_table(sheraf_connection, "owner")["peter"])
+
+    t0.owner = "steven"
+    assert "steven" not in index_table(sheraf_connection, "owner")
+
+    t1.delete()
+    t0.delete()
+    assert not index_table(sheraf_connection, "owner")
+
+
+def test_range_condition(sheraf_connection):
+    t0 = Ticket.create(label="a", priority=10)
+    t1 = Ticket.create(label="a", priority=1)
+
+    assert [t0.mapping] == list(index_table(sheraf_connection, "label").values())
+    assert t0 == Ticket.read(label="a")
+
+    t0.priority = 3
+    t1.priority = 7
+    assert t1 == Ticket.read(label="a")
+
+
+def test_filter(sheraf_connection):
+    t0 = Ticket.create(owner="george", status="open")
+    t1 = Ticket.create(owner="george", status="closed")
+    Ticket.create(owner="peter", status="open")
+
+    with patch.object(
+        Ticket.indexes()["owner"],
+        "get_postings",
+        wraps=Ticket.indexes()["owner"].get_postings,
+    ) as get_postings:
+        assert [t1] == Ticket.filter(owner="george", status="closed")
+        assert [t0, t1] == Ticket.filter(owner="george")
+        assert 2 == Ticket.filter(owner="george").count()
+        assert not get_postings.called
+
+        assert [t0] == Ticket.filter(owner="george", status="open")
+        assert 1 == Ticket.filter(owner="george", status="open").count()
+        assert get_postings.called
+
+
+def test_filter_range_condition(sheraf_connection):
+    t0 = Ticket.create(label="a", priority=10)
+    t1 = Ticket.create(label="a", priority=1)
+
+    assert [t0] == Ticket.filter(label="a", priority=10)
+    assert [t0] == Ticket.filter(label="a", priority__gte=5)
+    assert [t1] == Ticket.filter(label="a", priority__lt=5)
+    assert [t0, t1] == Ticket.filter(label="a")
+
+
+def test_bulk_operations(sheraf_connection):
+    t0, t1, t2 = Ticket.bulk_create(
+        [
+            {"owner": "george", "status": "open"},
+            {"owner": "george", "status": "closed"},
+            {"owner": "peter", "status": "open"},
+        ]
+    )
+    assert [t0.mapping] == list(index_table(sheraf_connection, "owner")["george"])
+
+    Ticket.bulk_update([t0, t1], {"status": "closed"})
+    assert {"peter"} == set(index_table(sheraf_connection, "owner"))
+
+    Ticket.bulk_update([t0, t1], {"status": "open"})
+    assert [t0.mapping, t1.mapping] == list(
+        index_table(sheraf_connection, "owner")["george"]
+    )
+
+    Ticket.bulk_update([t1], {"status": "closed"})
+    assert 3 == Ticket.bulk_delete([t0, t1, t2])
+    assert not index_table(sheraf_connection, "owner")
+
+
+def test_rebuild(sheraf_connection):
+    t0 = Ticket.create(owner="george", status="open")
+    Ticket.create(owner="george", status="closed")
+
+    Ticket.index_table_rebuild(["owner"])
+    assert [t0.mapping] == list(index_table(sheraf_connection, "owner")["george"])
+
+
+def test_first_model_does_not_match(sheraf_connection):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", sheraf.exceptions.IndexationWarning)
+        Ticket.create(owner="george", status="closed")
+        t1 = Ticket.create(owner="george", status="open")
+        t2, _ = Ticket.bulk_create(
+            [
+                {"owner": "peter", "status": "open"},
+                {"owner": "peter", "status": "closed"},
+            ]
+        )
+
+    assert [t1] == Ticket.filter(owner="george", status="open")
+    assert [t2] == Ticket.filter(owner="peter", status="open")
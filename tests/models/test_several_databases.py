@@ -128,3 +128,67 @@ def test_make_id(sheraf_database, db2):
 
         assert root1["modelwithproposeid"]["id"][m1.id] is m1.mapping
         assert root2["modelwithproposeid"]["id"][m2.id] is m2.mapping
+
+
+@pytest.fixture
+def same_oids_databases(db2):
+    """A default database and db2, that both allocate the same OIDs."""
+    database = None
+    try:
+        database = sheraf.Database("memory://")
+        yield database, db2
+
+    finally:
+        if database:
+            database.close()
+
+
+def spread_models():
+    """Creates three models in the default database and three in db2."""
+
+    class MyModel(tests.UUIDAutoModel):
+        status = sheraf.SimpleAttribute().index()
+        owner = sheraf.SimpleAttribute().index()
+
+    with sheraf.connection(commit=True):
+        for _ in range(3):
+            MyModel.create(status="open", owner="peter")
+
+    class MyModel(tests.UUIDAutoModel):
+        database_name = "db2"
+        status = sheraf.SimpleAttribute().index()
+        owner = sheraf.SimpleAttribute().index()
+
+    with sheraf.connection(commit=True):
+        for _ in range(3):
+            MyModel.create(status="closed", owner="george")
+
+    return MyModel
+
+
+def test_indexed_filters_several_databases(same_oids_databases):
+    MyModel = spread_models()
+
+    with sheraf.connection():
+        assert [] == list(MyModel.filter(status="open", owner="george"))
+        assert 0 == MyModel.filter(status="open", owner="george").count()
+        assert 3 == len(list(MyModel.filter(status="open", owner="peter")))
+        assert 3 == MyModel.filter(status="open", owner="peter").count()
+
+        assert 6 == len(list(MyModel.filter(status=sheraf.Range())))
+        assert 3 == len(list(MyModel.filter(status=sheraf.Range(), owner="george")))
+        assert 3 == MyModel.filter(status=sheraf.Range(), owner="george").count()
+
+
+def test_combined_querysets_several_databases(same_oids_databases):
+    MyModel = spread_models()
+
+    with sheraf.connection():
+        union = MyModel.filter(status="open") | MyModel.filter(owner="george")
+        assert 6 == len(list(union))
+
+        intersection = MyModel.filter(status="open") & MyModel.filter(owner="george")
+        assert [] == list(intersection)
+
+        difference = MyModel.filter(status="open") ^ MyModel.filter(owner="george")
+        assert 6 == len(list(difference))
@@ -0,0 +1,212 @@
+from unittest.mock import patch
+
+import pytest
+
+import sheraf
+import sheraf.exceptions
+import tests
+from sheraf.queryset import QuerySet
+
+
+class Order(tests.IntAutoModel):
+    status = sheraf.SimpleAttribute().index()
+    customer = sheraf.SimpleAttribute().index()
+    amount = sheraf.IntegerAttribute()
+    discount = sheraf.IntegerAttribute(default=None, lazy=True)
+    label = sheraf.StringAttribute(key=("label", "old_label"))
+
+
+def create_orders():
+    return [
+        Order.create(status="paid", customer="george", amount=10),
+        Order.create(status="paid", customer="peter", amount=20, discount=5),
+        Order.create(status="pending", customer="george", amount=30),
+        Order.create(status="refunded", customer="peter", amount=40, discount=1),
+    ]
+
+
+def test_aggregate(sheraf_connection):
+    create_orders()
+
+    assert {
+        "total": 100,
+        "min": 10,
+        "max": 40,
+        "avg": 25,
+        "count": 4,
+        "discounts": 2,
+    } == Order.all().aggregate(
+        total=sheraf.Sum("amount"),
+        min=sheraf.Min("amount"),
+        max=sheraf.Max("amount"),
+        avg=sheraf.Avg("amount"),
+        count=sheraf.Count(),
+        discounts=sheraf.Count("discount"),
+    )
+
+
+def test_aggregate_empty(sheraf_connection):
+    assert {"total": 0, "max": None, "avg": None, "count": 0} == Order.all().aggregate(
+        total=sheraf.Sum("amount"),
+        max=sheraf.Max("amount"),
+        avg=sheraf.Avg("amount"),
+        count=sheraf.Count(),
+    )
+
+
+def test_aggregate_filtered(sheraf_connection):
+    create_orders()
+
+    assert {"total": 30} == Order.filter(status="paid").aggregate(
+        total=sheraf.Sum("amount")
+    )
+    assert {"total": 10} == Order.filter(status="paid", customer="george").aggregate(
+        total=sheraf.Sum("amount")
+    )
+    assert {"total": 70} == Order.filter(amount__gte=30).aggregate(
+        total=sheraf.Sum("amount")
+    )
+    assert {"total": 20} == Order.filter(status="paid", discount=5).aggregate(
+        total=sheraf.Sum("amount")
+    )
+
+
+def test_aggregate_does_not_build_models(sheraf_connection):
+    create_orders()
+
+    with patch.object(Order, "_decorate", wraps=Order._decorate) as decorate:
+        assert {"total": 100} == Order.all().aggregate(total=sheraf.Sum("amount"))
+        assert {"total": 30} == Order.filter(status="paid").aggregate(
+            total=sheraf.Sum("amount")
+        )
+        assert not decorate.called
+
+
+class Labels(sheraf.Aggregation):
+    def start(self):
+        return []
+
+    def step(self, state, value):
+        return state + [value]
+
+
+def test_aggregate_custom_read(sheraf_connection):
+    orders = create_orders()
+    orders[0].mapping["old_label"] = "first"
+    orders[1].label = "second"
+
+    assert {"labels": ["first", "second", "", ""]} == Order.all().aggregate(
+        labels=Labels("label")
+    )
+
+
+def test_aggregate_iterable(sheraf_connection):
+    orders = create_orders()
+
+    assert {"total": 30} == QuerySet(orders[:2]).aggregate(total=sheraf.Sum("amount"))
+
+
+def test_aggregate_custom_aggregation(sheraf_connection):
+    create_orders()
+
+    assert {
+        "customers": ["george", "peter", "george", "peter"]
+    } == Order.all().aggregate(customers=Labels("customer"))
+
+
+def test_group_by_count_from_index(sheraf_connection):
+    create_orders()
+
+    with patch.object(Order, "_decorate", wraps=Order._decorate) as decorate:
+        assert {"paid": 2, "pending": 1, "refunded": 1} == Order.all().group_by(
+            "status"
+        ).count()
+        assert {"paid": 1, "pending": 1} == Order.filter(customer="george").group_by(
+            "status"
+        ).count()
+        assert {} == Order.filter(customer="unknown").group_by("status").count()
+        assert not decorate.called
+
+
+def test_group_by_count_from_index_with_none_values(sheraf_connection):
+    create_orders()
+    Order.create(customer="george", amount=50)
+    Order.create(customer="steven", amount=60)
+
+    def expected(queryset):
+        return {
+            key: aggregates["count"]
+            for key, aggregates in queryset.group_by("status")
+            .aggregate(count=sheraf.Count())
+            .items()
+        }
+
+    assert {"paid": 2, "pending": 1, "refunded": 1, None: 2} == expected(Order.all())
+    assert expected(Order.all()) == Order.all().group_by("status").count()
+    assert {"paid": 1, "pending": 1, None: 1} == Order.filter(
+        customer="george"
+    ).group_by("status").count()
+    assert (
+        expected(Order.filter(customer="george"))
+        == Order.filter(customer="george").group_by("status").count()
+    )
+
+
+def test_group_by_count_from_index_with_default_and_none_values(sheraf_connection):
+    class Player(tests.IntAutoModel):
+        team = sheraf.SimpleAttribute().index()
+        score = sheraf.IntegerAttribute().index()
+
+    Player.create(team="red", score=None)
+    Player.create(team="red", score=3)
+    Player.create(team="blue", score=0)
+    Player.create(team="red").score = None
+
+    def expected(queryset):
+        return {
+            key: aggregates["count"]
+            for key, aggregates in queryset.group_by("score")
+            .aggregate(count=sheraf.Count())
+            .items()
+        }
+
+    assert {0: 1, 3: 1, None: 2} == expected(Player.all())
+    assert expected(Player.all()) == Player.all().group_by("score").count()
+    assert {3: 1, None: 2} == Player.filter(team="red").group_by("score").count()
+
+
+def test_group_by_count_does_not_load_mappings(sheraf_database):
+    with sheraf.connection(commit=True):
+        create_orders()
+
+    with sheraf.connection() as conn:
+        conn.cacheMinimize()
+        mappings = list(conn.root()[Order.table]["id"].values())
+
+        assert {"george": 2, "peter": 2} == Order.all().group_by("customer").count()
+        assert all(mapping._p_changed is None for mapping in mappings)
+
+
+def test_group_by_count(sheraf_connection):
+    create_orders()
+
+    assert {10: 1, 20: 1, 30: 1, 40: 1} == Order.all().group_by("amount").count()
+    assert {"paid": 1, "pending": 1} == Order.filter(
+        amount__lte=30, customer="george"
+    ).group_by("status").count()
+
+
+def test_group_by_aggregate(sheraf_connection):
+    create_orders()
+
+    assert {
+        "george": {"total": 40, "count": 2},
+        "peter": {"total": 60, "count": 2},
+    } == Order.all().group_by("customer").aggregate(
+        total=sheraf.Sum("amount"), count=sheraf.Count()
+    )
+
+
+def test_group_by_invalid_attribute(sheraf_connection):
+    with pytest.raises(sheraf.exceptions.InvalidFilterException):
+        Order.all().group_by("invalid")
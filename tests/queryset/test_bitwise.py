@@ -1,15 +1,16 @@
-import pytest
+from unittest.mock import patch
+
+import sheraf
+import tests
 from sheraf.queryset import QuerySet
 
 
-@pytest.mark.skip
 def test_and(sheraf_connection, m0, m1, m2):
     assert QuerySet([m1]) == QuerySet([m0, m1]) & QuerySet([m1, m2])
     assert QuerySet([m0, m1, m2]) == QuerySet([m0, m1, m2]) & QuerySet([m2, m1, m0])
     assert QuerySet([m2, m1, m0]) == QuerySet([m2, m1, m0]) & QuerySet([m0, m1, m2])
 
 
-@pytest.mark.skip
 def test_or(sheraf_connection, m0, m1, m2):
     assert QuerySet() == QuerySet() | QuerySet()
     assert QuerySet([m0]) == QuerySet() | QuerySet([m0])
@@ -22,9 +23,90 @@ def test_or(sheraf_connection, m0, m1, m2):
     assert QuerySet([m2, m1, m0]) == QuerySet([m2, m1, m0]) | QuerySet([m0, m1, m2])
 
 
-@pytest.mark.skip
 def test_xor(sheraf_connection, m0, m1, m2):
     assert QuerySet([m0, m2]) == QuerySet([m0, m1]) ^ QuerySet([m1, m2])
     assert QuerySet([m2, m0]) == QuerySet([m1, m2]) ^ QuerySet([m0, m1])
     assert QuerySet() == QuerySet([m0, m1, m2]) ^ QuerySet([m2, m1, m0])
     assert QuerySet() == QuerySet([m2, m1, m0]) ^ QuerySet([m0, m1, m2])
+
+
+class Ticket(tests.IntAutoModel):
+    status = sheraf.SimpleAttribute().index()
+    owner = sheraf.SimpleAttribute().index()
+    priority = sheraf.SimpleAttribute()
+
+
+def test_indexed_operations(sheraf_connection):
+    t0 = Ticket.create(status="open", owner="george")
+    t1 = Ticket.create(status="closed", owner="george")
+    t2 = Ticket.create(status="open", owner="peter")
+    Ticket.create(status="closed", owner="peter")
+
+    qs = Ticket.filter(status="open") & Ticket.filter(owner="george")
+    assert Ticket == qs.model
+    assert [t0] == qs
+    assert [t0, t2, t1] == Ticket.filter(status="open") | Ticket.filter(owner="george")
+    assert [t2, t1] == Ticket.filter(status="open") ^ Ticket.filter(owner="george")
+    assert [] == Ticket.filter(status="unknown") & Ticket.filter(owner="george")
+
+
+def test_operations_consume_the_operands(sheraf_connection):
+    t0 = Ticket.create(status="open", owner="george", priority=1)
+    Ticket.create(status="closed", owner="george", priority=2)
+
+    opened, george = Ticket.filter(status="open"), Ticket.filter(owner="george")
+    assert [t0] == opened & george
+    assert [] == opened
+    assert [] == george
+
+    opened = Ticket.filter(status="open", priority=1)
+    george = Ticket.filter(owner="george")
+    assert [t0] == opened & george
+    assert [] == opened
+    assert [] == george
+
+
+def test_operations_keep_the_model_class(sheraf_connection):
+    t0 = Ticket.create(status="open", owner="george", priority=1)
+    t1 = Ticket.create(status="closed", owner="george", priority=2)
+    t2 = Ticket.create(status="open", owner="peter", priority=3)
+
+    qs = Ticket.filter(status="open") | Ticket.filter(owner="george")
+    assert [t0, t1] == qs.filter(owner="george")
+
+    qs = Ticket.filter(status="open") | Ticket.filter(owner="george")
+    assert [t2, t1, t0] == qs.order(id=sheraf.DESC)
+
+    qs = Ticket.filter(priority=3) | Ticket.filter(owner="george")
+    assert Ticket == qs.model
+    assert [t2, t0, t1] == qs
+
+
+def test_operations_on_different_models(sheraf_connection, m0):
+    t0 = Ticket.create(status="open")
+
+    qs = Ticket.all() | QuerySet([m0])
+    assert qs.model is None
+    assert [t0, m0] == qs
+    assert [] == Ticket.all() & QuerySet([m0])
+
+
+def test_indexed_operations_only_decode_the_results(sheraf_database):
+    with sheraf.connection(commit=True):
+        for i in range(20):
+            Ticket.create(
+                status="open" if i % 2 else "closed",
+                owner="george" if i < 4 else "peter",
+            )
+
+    with sheraf.connection() as conn:
+        conn.cacheMinimize()
+        mappings = list(conn.root()[Ticket.table]["id"].values())
+
+        with patch.object(Ticket, "_decorate", wraps=Ticket._decorate) as decorate:
+            qs = Ticket.filter(status="open") & Ticket.filter(owner="george")
+            assert [1, 3] == [ticket.id for ticket in qs]
+            assert 2 == decorate.call_count
+
+        loaded = [mapping for mapping in mappings if mapping._p_changed is not None]
+        assert [mappings[1], mappings[3]] == loaded
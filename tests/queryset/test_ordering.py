@@ -1,8 +1,10 @@
 import sys
+from unittest import mock
 
 import pytest
 
 import sheraf
+import tests
 from sheraf.exceptions import InvalidOrderException
 from sheraf.queryset import QuerySet
 
@@ -92,3 +94,120 @@ def test_invalid_order_call(sheraf_connection, m0, m1, m2, m3):
 
     with pytest.raises(InvalidOrderException):
         Cowboy.order(sheraf.ASC, sheraf.ASC)
+
+
+class IndexedCowboy(sheraf.models.IntOrderedNamedAttributesModel):
+    table = "my_model_queryset_indexed_order"
+    age = sheraf.IntegerAttribute().index()
+    name = sheraf.SimpleAttribute().index(values=lambda name: {name.lower()})
+    size = sheraf.IntegerAttribute()
+
+
+def test_indexed_attribute_order(sheraf_connection):
+    m0 = IndexedCowboy.create(age=30, name="Peter", size=180)
+    m1 = IndexedCowboy.create(age=50, name="george", size=170)
+    m2 = IndexedCowboy.create(age=30, name="Steven", size=160)
+    m3 = IndexedCowboy.create(age=20, name="Dave", size=170)
+
+    assert [m3, m0, m2, m1] == IndexedCowboy.order(age=sheraf.ASC)
+    assert [m1, m0, m2, m3] == IndexedCowboy.order(age=sheraf.DESC)
+    assert [m3, m2, m0, m1] == IndexedCowboy.order(age=sheraf.ASC, size=sheraf.ASC)
+    assert [m1, m0, m2, m3] == IndexedCowboy.order(age=sheraf.DESC, size=sheraf.DESC)
+    assert [m2] == IndexedCowboy.filter(size=160).order(age=sheraf.DESC)
+
+    # The name index keys are transformed, so the index cannot be used
+    assert [m3, m0, m2, m1] == IndexedCowboy.order(name=sheraf.ASC)
+
+
+def test_indexed_attribute_order_is_lazy(sheraf_connection):
+    for age in range(10):
+        IndexedCowboy.create(age=age, name=str(age))
+
+    with mock.patch.object(
+        IndexedCowboy, "_decorate", wraps=IndexedCowboy._decorate
+    ) as decorate:
+        assert [9, 8] == [m.age for m in IndexedCowboy.order(age=sheraf.DESC)[:2]]
+        assert 2 == decorate.call_count
+
+
+def test_indexed_attribute_order_reads_postings_lazily(sheraf_connection):
+    for i in range(10):
+        IndexedCowboy.create(age=30, name=str(i))
+
+    with mock.patch.object(
+        IndexedCowboy, "_decorate", wraps=IndexedCowboy._decorate
+    ) as decorate:
+        assert 3 == len(list(IndexedCowboy.order(age=sheraf.ASC)[:3]))
+        assert 3 == decorate.call_count
+
+
+class UUIDCowboy(tests.UUIDAutoModel):
+    age = sheraf.IntegerAttribute().index()
+
+
+def test_indexed_attribute_order_ties_in_creation_order(sheraf_connection):
+    cowboys = [UUIDCowboy.create(age=30) for _ in range(10)]
+    young = UUIDCowboy.create(age=20)
+
+    assert [young] + cowboys == UUIDCowboy.order(age=sheraf.ASC)
+    assert cowboys + [young] == UUIDCowboy.order(age=sheraf.DESC)
+
+
+class NoneCowboy(tests.IntAutoModel):
+    age = sheraf.SimpleAttribute().index()
+    size = sheraf.IntegerAttribute()
+
+
+def test_indexed_attribute_order_with_none_values(sheraf_connection):
+    m0 = NoneCowboy.create(age=30, size=180)
+    m1 = NoneCowboy.create(size=170)
+    m2 = NoneCowboy.create(age=20, size=160)
+    m3 = NoneCowboy.create(size=150)
+
+    assert NoneCowboy.count() == len(list(NoneCowboy.order(age=sheraf.ASC)))
+    assert [m2, m0, m1, m3] == NoneCowboy.order(age=sheraf.ASC)
+    assert [m0, m2, m1, m3] == NoneCowboy.order(age=sheraf.DESC)
+    assert [m2, m0] == NoneCowboy.filter(age__gte=10).order(age=sheraf.ASC)
+    assert [m3] == NoneCowboy.filter(size=150).order(age=sheraf.ASC)
+
+
+class TeamCowboy(tests.IntAutoModel):
+    age = sheraf.SimpleAttribute().index()
+    team = sheraf.SimpleAttribute().index()
+    size = sheraf.IntegerAttribute()
+
+
+def test_sorted_order_with_none_values(sheraf_connection):
+    m0 = TeamCowboy.create(age=30, team="red", size=180)
+    m1 = TeamCowboy.create(team="red", size=170)
+    m2 = TeamCowboy.create(age=20, team="red", size=160)
+    m3 = TeamCowboy.create(team="red", size=150)
+    TeamCowboy.create(age=10, team="blue")
+
+    assert [m2, m0, m1, m3] == TeamCowboy.filter(team="red").order(age=sheraf.ASC)
+    assert [m0, m2, m1, m3] == TeamCowboy.filter(team="red").order(age=sheraf.DESC)
+    assert [m2, m0] == TeamCowboy.filter(team="red").order(age=sheraf.ASC)[:2]
+    assert [m0, m2, m1] == TeamCowboy.filter(team="red").order(age=sheraf.DESC)[:3]
+    assert [m2, m0, m3, m1] == TeamCowboy.filter(team="red").order(
+        age=sheraf.ASC, size=sheraf.ASC
+    )[:4]
+    assert [m0, m2, m1, m3] == TeamCowboy.filter(team="red").order(
+        age=sheraf.DESC, size=sheraf.DESC
+    )[:4]
+
+
+class ScoreCowboy(tests.IntAutoModel):
+    score = sheraf.IntegerAttribute().index()
+
+
+def test_indexed_attribute_order_with_default_and_none_values(sheraf_connection):
+    m0 = ScoreCowboy.create(score=None)
+    m1 = ScoreCowboy.create(score=3)
+    m2 = ScoreCowboy.create()
+    m3 = ScoreCowboy.create(score=5)
+    m2.score = None
+    m3.score = 0
+
+    assert [m3, m1, m0, m2] == ScoreCowboy.order(score=sheraf.ASC)
+    assert [m1, m3, m0, m2] == ScoreCowboy.order(score=sheraf.DESC)
+    assert [m3] == ScoreCowboy.filter(score=0)
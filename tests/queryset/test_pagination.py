@@ -0,0 +1,167 @@
+from unittest.mock import patch
+
+import pytest
+
+import sheraf
+import tests
+
+
+class Ticket(tests.IntAutoModel):
+    status = sheraf.SimpleAttribute().index()
+    priority = sheraf.IntegerAttribute().index()
+    owner = sheraf.SimpleAttribute()
+
+
+class UUIDTicket(tests.UUIDAutoModel):
+    status = sheraf.SimpleAttribute()
+
+
+def paginate(qs_factory, limit, backward=False):
+    pages, cursor = [], None
+    while True:
+        qs = qs_factory()
+        page, cursor = (qs.before if backward else qs.after)(cursor, limit)
+        pages.append(list(page))
+        if cursor is None:
+            return pages
+
+
+def test_after(sheraf_connection):
+    t = [Ticket.create() for _ in range(5)]
+
+    page, cursor = Ticket.all().after(None, 2)
+    assert [t[0], t[1]] == page
+    assert t[1].id == cursor
+
+    page, cursor = Ticket.all().after(cursor, 2)
+    assert [t[2], t[3]] == page
+
+    page, cursor = Ticket.all().after(cursor, 2)
+    assert [t[4]] == page
+    assert cursor is None
+
+    assert [[t[0], t[1]], [t[2], t[3]], [t[4]]] == paginate(Ticket.all, 2)
+    assert [[t[0], t[1], t[2], t[3], t[4]]] == paginate(Ticket.all, 5)
+
+
+def test_before(sheraf_connection):
+    t = [Ticket.create() for _ in range(5)]
+
+    page, cursor = Ticket.all().before(None, 2)
+    assert [t[3], t[4]] == page
+    assert t[3].id == cursor
+
+    page, cursor = Ticket.all().before(t[3].id, 2)
+    assert [t[1], t[2]] == page
+
+    assert [[t[3], t[4]], [t[1], t[2]], [t[0]]] == paginate(Ticket.all, 2, True)
+
+
+def test_empty_pages(sheraf_connection):
+    page, cursor = Ticket.all().after(None, 2)
+    assert [] == page
+    assert cursor is None
+
+    t0 = Ticket.create()
+    page, cursor = Ticket.all().after(t0.id, 2)
+    assert [] == page
+    assert cursor is None
+
+
+def test_invalid_limit(sheraf_connection):
+    with pytest.raises(ValueError):
+        Ticket.all().after(None, 0)
+
+
+def test_pagination_reads_from_the_cursor(sheraf_connection):
+    t = [Ticket.create() for _ in range(100)]
+
+    with patch.object(Ticket, "_decorate", wraps=Ticket._decorate) as decorate:
+        page, cursor = Ticket.all().after(t[89].id, 5)
+        assert 6 == decorate.call_count
+
+    assert t[90:95] == page
+
+
+def test_pagination_descending(sheraf_connection):
+    t = [Ticket.create() for _ in range(5)]
+
+    def qs():
+        return Ticket.all().order(sheraf.DESC)
+
+    assert [[t[4], t[3]], [t[2], t[1]], [t[0]]] == paginate(qs, 2)
+    assert [[t[1], t[0]], [t[3], t[2]], [t[4]]] == paginate(qs, 2, True)
+
+
+def test_pagination_with_filters(sheraf_connection):
+    t = [Ticket.create(status="open" if i % 2 else "closed") for i in range(7)]
+
+    def qs():
+        return Ticket.filter(status="open")
+
+    assert [[t[1], t[3]], [t[5]]] == paginate(qs, 2)
+    assert [[t[3], t[5]], [t[1]]] == paginate(qs, 2, True)
+
+
+def test_pagination_ordered_by_index(sheraf_connection):
+    t = [Ticket.create(priority=p) for p in (3, 1, 2, 1, 3, 2)]
+
+    def asc():
+        return Ticket.all().order(priority=sheraf.ASC)
+
+    def desc():
+        return Ticket.all().order(priority=sheraf.DESC)
+
+    assert [[t[1], t[3]], [t[2], t[5]], [t[0], t[4]]] == paginate(asc, 2)
+    assert [[t[2], t[5], t[0], t[4]], [t[1], t[3]]] == paginate(asc, 4, True)
+    assert [[t[0], t[4], t[2]], [t[5], t[1], t[3]]] == paginate(desc, 3)
+    assert [t[4], t[2], t[5]] == desc().after(t[0].id, 3)[0]
+    assert [t[0], t[4]] == desc().before(t[2].id, 3)[0]
+
+
+def test_pagination_sorted(sheraf_connection):
+    t = [Ticket.create(owner=owner) for owner in ("b", "c", "a", "d")]
+
+    def qs():
+        return Ticket.all().order(owner=sheraf.ASC)
+
+    assert [[t[2], t[0]], [t[1], t[3]]] == paginate(qs, 2)
+    assert [[t[1], t[3]], [t[2], t[0]]] == paginate(qs, 2, True)
+
+
+def test_pagination_uuid(sheraf_connection):
+    t = sorted((UUIDTicket.create() for _ in range(5)), key=lambda m: m.id)
+
+    assert [t[:2], t[2:4], t[4:]] == paginate(UUIDTicket.all, 2)
+
+
+def test_pagination_ordered_by_index_deleted_cursor(sheraf_connection):
+    t = [Ticket.create(priority=p) for p in (3, 1, 2, 1, 3, 2)]
+    qs = Ticket.all().order(priority=sheraf.ASC)
+
+    page, cursor = qs.after(None, 3)
+    assert [t[1], t[3], t[2]] == page
+    Ticket.read(t[2].id).delete()
+    page, cursor = qs.after(cursor, 3)
+    assert [t[5], t[0], t[4]] == page
+
+    page, cursor = qs.before(None, 2)
+    assert [t[0], t[4]] == page
+    Ticket.read(t[0].id).delete()
+    page, cursor = qs.before(cursor, 2)
+    assert [t[3], t[5]] == page
+
+
+def test_pagination_ordered_by_index_with_none_values(sheraf_connection):
+    class NoneTicket(tests.IntAutoModel):
+        priority = sheraf.SimpleAttribute().index()
+
+    t = [NoneTicket.create(priority=p) for p in (2, None, 1, None, 3)]
+
+    def qs():
+        return NoneTicket.all().order(priority=sheraf.ASC)
+
+    expected = list(qs())
+    assert [t[2], t[0], t[4], t[1], t[3]] == expected
+    assert [expected[:2], expected[2:4], expected[4:]] == paginate(qs, 2)
+    assert [expected[3:], expected[1:3], expected[:1]] == paginate(qs, 2, True)
@@ -0,0 +1,65 @@
+import datetime
+from unittest.mock import patch
+
+import sheraf
+import sheraf.queryset
+import tests
+from sheraf.queryset import QuerySet
+
+
+class Cowboy(tests.IntAutoModel):
+    name = sheraf.SimpleAttribute()
+    age = sheraf.IntegerAttribute()
+    birth = sheraf.DateAttribute()
+    town = sheraf.SimpleAttribute().index()
+    nick = sheraf.SimpleAttribute().index(
+        values=lambda nick: {nick.lower()} if nick else set()
+    )
+
+
+def test_several_unindexed_filters(sheraf_connection):
+    peter = Cowboy.create(name="Peter", age=30, birth=datetime.date(1990, 1, 1))
+    Cowboy.create(name="Peter", age=50, birth=datetime.date(1970, 1, 1))
+    george = Cowboy.create(name="George", age=30, birth=datetime.date(1990, 1, 1))
+
+    assert [peter] == Cowboy.filter(name="Peter", age=30)
+    assert [peter] == Cowboy.filter(name="Peter", birth=datetime.date(1990, 1, 1))
+    assert [peter, george] == Cowboy.filter(
+        age__lt=40, birth__gte=datetime.date(1980, 1, 1)
+    )
+    assert [] == Cowboy.filter(name="Peter", age=40)
+
+
+def test_unindexed_filters_on_missing_keys(sheraf_connection):
+    peter = Cowboy.create(name="Peter", age=30)
+    del peter.mapping["age"]
+    default = Cowboy.create(name="George").age
+
+    assert [peter] == Cowboy.filter(name="Peter", age=default)
+    assert [] == Cowboy.filter(name="Peter", age=30)
+
+
+def test_index_filters_on_iterables(sheraf_connection):
+    peter = Cowboy.create(name="Peter", town="Paris", nick="Pete")
+    george = Cowboy.create(name="George", town="Lyon", nick="Gege")
+    steven = Cowboy.create(name="Steven")
+
+    models = QuerySet([peter, george, steven])
+    assert [peter] == models.filter(town="Paris")
+    assert [peter] == models.filter(town__gt="Nice")
+    assert [george] == models.filter(nick="gege")
+    assert [peter] == models.filter(nick__startswith="pe")
+    assert [peter] == models.filter(town="Paris", nick="pete")
+
+
+def test_filters_are_compiled_once(sheraf_connection):
+    for i in range(10):
+        Cowboy.create(name="Peter" if i % 2 else "George", age=i)
+
+    with patch.object(
+        sheraf.queryset, "_filter_check", wraps=sheraf.queryset._filter_check
+    ) as filter_check:
+        assert [1, 3] == [
+            cowboy.age for cowboy in Cowboy.filter(name="Peter", age__lt=5)
+        ]
+        assert 2 == filter_check.call_count
@@ -1,3 +1,4 @@
+import array
 import itertools
 
 import pytest
@@ -88,7 +89,7 @@ def test_delete(sheraf_database):
         Cowboy.create(age=30, name="Steven", size=160)
 
     with sheraf.connection(commit=True):
-        Cowboy.filter(age=30).delete()
+        assert 2 == Cowboy.filter(age=30).delete()
 
     with sheraf.connection():
         assert [m1] == Cowboy.all()
@@ -101,10 +102,11 @@ def test_delete_all(sheraf_database):
         Cowboy.create(age=30, name="Steven", size=160)
 
     with sheraf.connection(commit=True):
-        Cowboy.all().delete()
+        assert 3 == Cowboy.all().delete()
 
     with sheraf.connection():
         assert [] == Cowboy.all()
+        assert 0 == Cowboy.all().delete()
 
 
 def test_chained_filters(sheraf_connection, m0, m1, m2):
@@ -185,3 +187,77 @@ def test_get(sheraf_connection, m0, m1):
 
     with pytest.raises(sheraf.exceptions.QuerySetUnpackException):
         Cowboy.get(name="NONAME")
+
+
+def test_cache(sheraf_connection, m0, m1, m2):
+    qs = Cowboy.all().cache()
+
+    assert 3 == qs.count()
+    assert 3 == len(qs)
+    assert qs
+    assert [m0, m1, m2] == qs
+    assert [m0, m1, m2] == list(qs)
+    assert [m1] == qs[1]
+    assert [m2] == qs[-1]
+    assert [m1, m2] == qs[1:]
+    assert 2 == qs[1:].count()
+    assert str(qs).startswith("<CachedQuerySet model=")
+
+
+def test_cache_identifiers_are_compact(sheraf_connection, m0, m1, m2):
+    qs = Cowboy.filter(age=30).cache()
+
+    assert isinstance(qs._identifiers, array.array)
+    assert [m0.id, m2.id] == list(qs._identifiers)
+
+
+def test_cache_empty(sheraf_connection, m0):
+    qs = Cowboy.filter(age=1000).cache()
+
+    assert not qs
+    assert 0 == len(qs)
+    assert [] == qs
+
+
+def test_cache_refinement(sheraf_connection, m0, m1, m2):
+    qs = Cowboy.all().cache()
+
+    assert [m0, m2] == qs.filter(age=30)
+    assert [m2, m1, m0] == qs.order(sheraf.DESC)
+    assert [m0, m1, m2] == qs
+
+    with pytest.raises(InvalidFilterException):
+        qs.filter(foobar=3)
+
+
+def test_cache_successive_refinements(sheraf_connection, m0, m1, m2):
+    qs = Cowboy.all().cache()
+
+    assert [m2, m0] == qs.filter(age=30).order(sheraf.DESC)
+    assert [m0, m2] == qs.filter(age=30).filter(size__lte=180)
+
+    with pytest.raises(InvalidFilterException):
+        qs.filter(age=30).filter(foobar=3)
+
+
+def test_cache_deleted_models(sheraf_connection, m0, m1, m2):
+    qs = Cowboy.all().cache()
+    m1.delete()
+
+    assert [m0, m2] == qs
+
+
+def test_cache_without_model(sheraf_connection, m0, m1, m2):
+    qs = QuerySet([m0, m1, m2]).cache()
+
+    assert 3 == len(qs)
+    assert [m0, m1, m2] == qs
+    assert [m1] == qs[1]
+
+
+def test_cache_exists_and_first(sheraf_connection, m0, m1):
+    qs = Cowboy.all().cache()
+
+    assert qs.exists()
+    assert m0 == qs.first()
+    assert not Cowboy.filter(age=1000).cache().exists()
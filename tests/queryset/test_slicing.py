@@ -1,5 +1,6 @@
 import pytest
 
+import sheraf
 import tests
 from sheraf.queryset import QuerySet
 
@@ -114,3 +115,36 @@ def test_slicing_iterator(sheraf_connection, m0, m1, m2):
 
     with pytest.raises(ValueError):
         assert [m1, m2] == QuerySet(iter([m0, m1, m2]))[-2:]
+
+
+def test_slicing_filtered_models(sheraf_connection, m0, m1, m2, m3):
+    assert [m2] == Cowboy.filter(age=30)[1]
+    assert [m0, m2] == Cowboy.filter(age=30)[0:2]
+    assert [m2, m3] == Cowboy.filter(age=30)[1:]
+
+
+def test_slicing_ordered_models(sheraf_connection, m0, m1, m2, m3):
+    assert [m0] == Cowboy.order(size=sheraf.DESC)[0]
+    assert [m1, m3] == Cowboy.order(size=sheraf.DESC)[1:3]
+    assert [m2, m1] == Cowboy.order(size=sheraf.ASC)[0:2]
+    assert [m0, m3] == Cowboy.order(age=sheraf.ASC, size=sheraf.DESC)[0:2]
+    assert [m1, m2, m3] == Cowboy.order(age=sheraf.DESC, size=sheraf.ASC)[0:3]
+    assert [m0, m3, m2, m1] == Cowboy.order(age=sheraf.ASC, size=sheraf.DESC)[:10]
+    assert [m3, m2] == Cowboy.filter(age=30).order(size=sheraf.DESC)[1:3]
+    assert [] == Cowboy.order(size=sheraf.DESC)[0:0]
+
+
+def test_slicing_ordered_models_keeps_ties_order(sheraf_connection, m0, m1, m2, m3):
+    assert [m0, m2, m3] == Cowboy.order(age=sheraf.ASC)[0:3]
+    assert [m1, m0, m2] == Cowboy.order(age=sheraf.DESC)[0:3]
+
+
+def test_slicing_ordered_models_checks_models_once(sheraf_connection, m0, m1, m2, m3):
+    checked = []
+
+    def predicate(model):
+        checked.append(model)
+        return model.age == 30
+
+    assert [m3, m2] == Cowboy.filter(predicate).order(size=sheraf.DESC)[1:3]
+    assert 4 == len(checked)
@@ -0,0 +1,100 @@
+import datetime
+from unittest.mock import patch
+
+import pytest
+
+import sheraf
+import sheraf.exceptions
+import tests
+from sheraf.queryset import QuerySet
+
+
+class Cowboy(tests.IntAutoModel):
+    name = sheraf.SimpleAttribute()
+    age = sheraf.IntegerAttribute()
+    town = sheraf.SimpleAttribute().index()
+    birth = sheraf.DateAttribute()
+
+
+def test_values(sheraf_connection):
+    Cowboy.create(name="Peter", age=30, town="Paris")
+    Cowboy.create(name="George", age=50, town="Lyon")
+
+    assert [
+        {"id": 0, "name": "Peter"},
+        {"id": 1, "name": "George"},
+    ] == list(Cowboy.all().values("id", "name"))
+
+    assert [
+        {"id": 0, "name": "Peter", "age": 30, "town": "Paris", "birth": None},
+    ] == list(Cowboy.filter(town="Paris").values())
+
+
+def test_values_list(sheraf_connection):
+    Cowboy.create(name="Peter", age=30)
+    Cowboy.create(name="George", age=50)
+
+    assert [("Peter", 30), ("George", 50)] == list(
+        Cowboy.all().values_list("name", "age")
+    )
+    assert [30, 50] == list(Cowboy.all().values_list("age", flat=True))
+
+    with pytest.raises(TypeError):
+        Cowboy.all().values_list("name", "age", flat=True)
+
+
+def test_values_deserialize(sheraf_connection):
+    Cowboy.create(name="Peter", birth=datetime.date(1990, 1, 2))
+
+    assert [datetime.date(1990, 1, 2)] == list(
+        Cowboy.all().values_list("birth", flat=True)
+    )
+
+
+def test_values_order_and_filters(sheraf_connection):
+    Cowboy.create(name="Peter", age=30, town="Paris")
+    Cowboy.create(name="George", age=50, town="Paris")
+    Cowboy.create(name="Steven", age=40, town="Lyon")
+
+    assert ["George", "Steven", "Peter"] == list(
+        Cowboy.all().order(age=sheraf.DESC).values_list("name", flat=True)
+    )
+    assert ["Peter", "George"] == list(
+        Cowboy.filter(town="Paris").values_list("name", flat=True)
+    )
+    assert ["George", "Steven"] == list(
+        Cowboy.filter(age__gte=40).values_list("name", flat=True)
+    )
+
+
+def test_values_do_not_build_models(sheraf_connection):
+    Cowboy.create(name="Peter", town="Paris")
+    Cowboy.create(name="George", town="Paris")
+
+    with patch.object(Cowboy, "_decorate", wraps=Cowboy._decorate) as decorate:
+        assert ["Peter", "George"] == list(
+            Cowboy.filter(town="Paris").values_list("name", flat=True)
+        )
+        assert [{"name": "Peter"}, {"name": "George"}] == list(
+            Cowboy.all().values("name")
+        )
+        assert not decorate.called
+
+
+def test_values_consume_the_queryset(sheraf_connection):
+    Cowboy.create(name="Peter")
+
+    qs = Cowboy.all()
+    assert ["Peter"] == list(qs.values_list("name", flat=True))
+    assert [] == list(qs.values_list("name", flat=True))
+
+
+def test_values_invalid_attribute(sheraf_connection):
+    with pytest.raises(sheraf.exceptions.InvalidFilterException):
+        Cowboy.all().values("invalid")
+
+
+def test_values_iterable(sheraf_connection):
+    peter = Cowboy.create(name="Peter")
+
+    assert [{"name": "Peter"}] == list(QuerySet([peter]).values("name"))
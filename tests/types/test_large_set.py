@@ -0,0 +1,77 @@
+import pytest
+
+import sheraf
+import tests
+
+
+class Cowboy(tests.IntAutoModel):
+    pass
+
+
+def test_large_set(sheraf_database):
+    with sheraf.connection(commit=True) as c:
+        cowboys = [Cowboy.create() for _ in range(100)]
+        c.root.set = sheraf.types.LargeSet(cowboy.mapping for cowboy in cowboys)
+
+    with sheraf.connection(commit=True) as c:
+        assert 100 == len(c.root.set)
+        assert [cowboy.mapping for cowboy in cowboys] == list(c.root.set)
+        assert Cowboy.read(50).mapping in c.root.set
+
+        c.root.set.remove(Cowboy.read(50).mapping)
+        c.root.set.discard(Cowboy.read(50).mapping)
+
+    with sheraf.connection() as c:
+        assert 99 == len(c.root.set)
+        assert Cowboy.read(50).mapping not in c.root.set
+        assert Cowboy.read(51).mapping in c.root.set
+
+        with pytest.raises(ValueError):
+            c.root.set.remove(Cowboy.read(50).mapping)
+
+
+def test_add_twice(sheraf_connection):
+    cowboy = Cowboy.create()
+    cowboys = sheraf.types.LargeSet()
+    assert not cowboys
+
+    cowboys.add(cowboy.mapping)
+    cowboys.add(cowboy.mapping)
+    assert cowboys
+    assert 1 == len(cowboys)
+    assert [cowboy.mapping] == list(cowboys)
+
+
+def test_new_objects_are_added_to_the_connection(sheraf_connection):
+    mapping = sheraf.types.SmallDict()
+    assert mapping._p_oid is None
+
+    cowboys = sheraf.types.LargeSet([mapping])
+    assert mapping._p_oid is not None
+    assert mapping in cowboys
+    assert sheraf.types.SmallDict() not in cowboys
+
+
+@pytest.mark.parametrize(
+    "database",
+    [
+        pytest.lazy_fixture("sheraf_database"),
+        pytest.lazy_fixture("sheraf_zeo_database"),
+    ],
+)
+def test_no_conflict_on_different_items(database):
+    database.nestable = True
+
+    with sheraf.connection(commit=True) as c:
+        george, peter, steven = Cowboy.create(), Cowboy.create(), Cowboy.create()
+        c.root.set = sheraf.types.LargeSet([george.mapping])
+
+    with sheraf.connection(commit=True) as c1:
+        c1.root.set.add(Cowboy.read(peter.id).mapping)
+
+        with sheraf.connection(commit=True) as c2:
+            c2.root.set.add(Cowboy.read(steven.id).mapping)
+
+    with sheraf.connection() as c:
+        assert 3 == len(c.root.set)
+        assert [george.mapping, peter.mapping, steven.mapping] == list(c.root.set)
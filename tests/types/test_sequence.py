@@ -0,0 +1,56 @@
+import pytest
+import ZODB
+
+import sheraf
+
+
+@pytest.mark.parametrize(
+    "database",
+    [
+        pytest.lazy_fixture("sheraf_database"),
+        pytest.lazy_fixture("sheraf_zeo_database"),
+    ],
+)
+def test_next_conflict(database):
+    database.nestable = True
+
+    with sheraf.connection(commit=True) as conn:
+        conn.root()["sequence"] = sheraf.types.Sequence()
+
+    with sheraf.connection() as conn1:
+        assert 0 == conn1.root()["sequence"].next()
+
+        with sheraf.connection(commit=True) as conn2:
+            assert 0 == conn2.root()["sequence"].next(2)
+
+        with pytest.raises(ZODB.POSException.ConflictError):
+            conn1.transaction_manager.commit()
+
+    with sheraf.connection() as conn:
+        assert 2 == conn.root()["sequence"].value
+
+
+@pytest.mark.parametrize(
+    "database",
+    [
+        pytest.lazy_fixture("sheraf_database"),
+        pytest.lazy_fixture("sheraf_zeo_database"),
+    ],
+)
+def test_reserve_conflict(database):
+    database.nestable = True
+
+    with sheraf.connection(commit=True) as conn:
+        conn.root()["sequence"] = sheraf.types.Sequence()
+
+    with sheraf.connection() as conn1:
+        assert 0 == conn1.root()["sequence"].next()
+
+        with sheraf.connection(commit=True) as conn2:
+            assert 0 == conn2.root()["sequence"].reserve(10)
+
+        with pytest.raises(ZODB.POSException.ConflictError):
+            conn1.transaction_manager.commit()
+
+    with sheraf.connection() as conn:
+        assert 10 == conn.root()["sequence"].value